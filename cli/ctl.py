@@ -8,6 +8,7 @@ offering commands to start, stop, check status, and monitor logs.
 
 import os
 import sys
+import json
 import argparse
 import signal
 import time
@@ -34,6 +35,9 @@ logger = logging.getLogger("synapstor-ctl")
 DEFAULT_DIR = os.path.expanduser("~/.synapstor")
 PID_FILE = os.path.join(DEFAULT_DIR, "synapstor.pid")
 LOG_FILE = os.path.join(DEFAULT_DIR, "synapstor.log")
+STATUS_FILE = os.path.join(DEFAULT_DIR, "synapstor.status")
+# Environment variable the server uses to report its readiness
+STATUS_FILE_ENV = "SYNAPSTOR_STATUS_FILE"
 
 
 def ensure_dir_exists():
@@ -60,6 +64,34 @@ def is_running():
         return False
 
 
+def read_model_status(pid):
+    """
+    Reads the readiness of the embedding model reported by the server, with the
+    error of the model and the metrics of the embedding provider
+    """
+    try:
+        with open(STATUS_FILE, "r") as f:
+            status = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return "Unknown", None, {}
+
+    # The file may have been left by a previous server
+    if status.get("pid") != pid:
+        return "Unknown", None, {}
+
+    labels = {
+        "loading": "🟡 Loading",
+        "ready": "🟢 Ready",
+        "failed": "🔴 Failed",
+    }
+    model_status = status.get("model")
+    return (
+        labels.get(model_status, model_status or "Unknown"),
+        status.get("error"),
+        status.get("metrics") or {},
+    )
+
+
 def start_server(args):
     """Starts the server in the background"""
     if is_running():
@@ -97,6 +129,10 @@ def start_server(args):
         server_cmd.extend(["--env-file", args.env_file])
 
     try:
+        # Remove the status reported by a previous server
+        if os.path.exists(STATUS_FILE):
+            os.remove(STATUS_FILE)
+
         # Redirect output to the log file
         with open(LOG_FILE, "a") as log_file:
             process = subprocess.Popen(
@@ -104,6 +140,7 @@ def start_server(args):
                 stdout=log_file,
                 stderr=log_file,
                 start_new_session=True,  # Detach from parent process
+                env={**os.environ, STATUS_FILE_ENV: STATUS_FILE},
             )
 
         # Save the PID to a file
@@ -163,8 +200,10 @@ def stop_server():
             except OSError:
                 pass
 
-        # Remove the PID file
+        # Remove the PID and status files
         os.remove(PID_FILE)
+        if os.path.exists(STATUS_FILE):
+            os.remove(STATUS_FILE)
 
         logger.info("✅ Server stopped successfully")
         return 0
@@ -225,17 +264,26 @@ def status_server():
         if env_file and not os.path.exists(env_file):
             env_file = "Not found"
 
+        model_status, model_error, metrics = read_model_status(pid)
+
         # Detailed status
         print("\n" + "=" * 30)
         print(" SYNAPSTOR - SERVER STATUS ")
         print("=" * 30)
         print("Status:         🟢 Running")
+        print(f"Model:          {model_status}")
+        if model_error:
+            print(f"Model error:    {model_error}")
         print(f"PID:            {pid}")
         print(f"Uptime:         {uptime_str}")
         print(f"Memory:         {memory_mb:.2f} MB")
         print(f"CPU:            {cpu_percent:.1f}%")
         print(f".env file:      {env_file}")
         print(f"Log file:       {LOG_FILE}")
+        if metrics:
+            print("-" * 30)
+            for name, value in metrics.items():
+                print(f"{name}: {value}")
         print("=" * 30)
 
         return 0
@@ -325,6 +373,8 @@ def reindex_project(args):
         reindex_cmd.extend(["--env-file", args.env_file])
     if args.force:
         reindex_cmd.append("--force")
+    if args.bulk:
+        reindex_cmd.append("--bulk")
 
     try:
         logger.info("🔄 Starting reindexing...")
@@ -397,6 +447,42 @@ def run_indexer(args):
         return 1
 
 
+def watch_project(args):
+    """Runs the indexer in watch mode, keeping the project indexed as files change"""
+    indexer_cmd = [
+        "synapstor-indexer",
+        "--project",
+        args.project,
+        "--path",
+        args.path,
+        "--watch",
+        "--debounce",
+        str(args.debounce),
+    ]
+    if args.collection:
+        indexer_cmd.extend(["--collection", args.collection])
+    if args.poll:
+        indexer_cmd.append("--poll")
+    if args.verbose:
+        indexer_cmd.append("--verbose")
+
+    try:
+        logger.info("👀 Starting the indexer in watch mode (Ctrl+C to stop)...")
+        process = subprocess.Popen(indexer_cmd)
+        try:
+            process.wait()
+        except KeyboardInterrupt:
+            # The indexer got the interrupt too and saves its manifest
+            process.wait()
+
+        if process.returncode != 0:
+            logger.error("❌ Watch mode failed")
+        return process.returncode
+    except Exception as e:
+        logger.error(f"❌ Error executing indexer: {e}")
+        return 1
+
+
 def main():
     """
     Main function for managing the Synapstor service
@@ -454,6 +540,11 @@ def main():
         action="store_true",
         help="Force reindexing even if there are no changes",
     )
+    reindex_parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Pauses the HNSW indexing of the collection while loading",
+    )
 
     # Subcommand to setup
     subparsers.add_parser("setup", help="Executes initial setup of Synapstor")
@@ -484,6 +575,37 @@ def main():
         help="Simulates indexing without sending to Qdrant",
     )
 
+    # Subcommand to keep a project indexed
+    watch_parser = subparsers.add_parser(
+        "watch", help="Keeps a project indexed, indexing files as they change"
+    )
+    watch_parser.add_argument(
+        "--project", required=True, help="Name of the project to be indexed"
+    )
+    watch_parser.add_argument(
+        "--path", required=True, help="Path of the project to be indexed"
+    )
+    watch_parser.add_argument(
+        "--collection",
+        help="Name of the collection to store (optional, uses the default from .env if not specified)",
+    )
+    watch_parser.add_argument(
+        "--debounce",
+        type=float,
+        default=1.0,
+        help="Seconds without changes before indexing them (default: 1.0)",
+    )
+    watch_parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="Scans for changes instead of using inotify",
+    )
+    watch_parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Shows detailed information during indexing",
+    )
+
     args = parser.parse_args()
 
     # Execute the appropriate command
@@ -501,6 +623,8 @@ def main():
         return setup_client(args)
     elif args.command == "indexer":
         return run_indexer(args)
+    elif args.command == "watch":
+        return watch_project(args)
     else:
         parser.print_help()
         return 1
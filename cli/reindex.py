@@ -9,6 +9,7 @@ reindexed without creating duplications.
 """
 
 import argparse
+import contextlib
 import hashlib
 import importlib.util
 import os
@@ -20,6 +21,9 @@ from dotenv import load_dotenv
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
 
+from synapstor.bulk import bulk_load
+from synapstor.settings import QdrantSettings
+
 # Check dependencies
 required_dependencies = {
     "dotenv": "python-dotenv",
@@ -308,6 +312,12 @@ def main():
         help="Executes without sending data to Qdrant (only simulates)",
     )
 
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Pauses the HNSW indexing of the collection while loading, for large loads",
+    )
+
     args = parser.parse_args()
 
     # Load environment variables
@@ -333,6 +343,9 @@ def main():
         if args.api_key:
             client_params["api_key"] = args.api_key
 
+        # gRPC, timeout and connection pool from the environment
+        client_params.update(QdrantSettings().get_client_transport().client_kwargs())
+
         client = QdrantClient(**client_params)
 
         # Check if the client is connected
@@ -402,14 +415,21 @@ def main():
             if args.verbose:
                 print(f"Processing directory: {args.path}")
 
-            results = process_directory(
-                directory=args.path,
-                project_name=args.project,
-                client=client,
-                collection_name=args.collection,
-                verbose=args.verbose,
-                dry_run=args.dry_run,
-            )
+            # The index is built once at the end instead of during the load
+            loading = contextlib.nullcontext()
+            if args.bulk and not args.dry_run:
+                print("Bulk mode: indexing paused until all files are loaded.")
+                loading = bulk_load(client, args.collection)
+
+            with loading:
+                results = process_directory(
+                    directory=args.path,
+                    project_name=args.project,
+                    client=client,
+                    collection_name=args.collection,
+                    verbose=args.verbose,
+                    dry_run=args.dry_run,
+                )
 
             # Count successful results
             success = [r for r in results if r is not None]
@@ -0,0 +1,96 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from qdrant_client import QdrantClient, models
+
+logger = logging.getLogger(__name__)
+
+# Indexing threshold of Qdrant, in kilobytes, used when a collection reports none
+DEFAULT_INDEXING_THRESHOLD = 20000
+
+
+@contextmanager
+def bulk_load(
+    client: QdrantClient,
+    collection_name: str,
+    wait: bool = True,
+    timeout: Optional[float] = 3600.0,
+    poll_interval: float = 1.0,
+) -> Iterator[None]:
+    """
+    Pauses the HNSW indexing of a collection while a large number of points is loaded.
+
+    With an indexing threshold of 0, Qdrant stores the points without building the
+    HNSW graph of every segment while the writes arrive. On exit, even if the load
+    failed, the previous threshold is restored and the optimizer builds the index
+    once, and the context manager waits for it to finish.
+    :param client: The Qdrant client.
+    :param collection_name: The name of the collection being loaded.
+    :param wait: Whether to wait for the optimizer on exit. If not, the caller can
+                 use `wait_for_optimizer` itself.
+    :param timeout: The maximum seconds to wait for the optimizer, or None to wait forever.
+    :param poll_interval: The seconds between two checks of the collection status.
+    """
+    info = client.get_collection(collection_name)
+    threshold = info.config.optimizer_config.indexing_threshold
+    if threshold is None or threshold == 0:
+        # A previous bulk load may have been killed before restoring it
+        threshold = DEFAULT_INDEXING_THRESHOLD
+
+    client.update_collection(
+        collection_name=collection_name,
+        optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0),
+    )
+    logger.info(f"Indexing of collection {collection_name} paused for a bulk load")
+    try:
+        yield
+    finally:
+        client.update_collection(
+            collection_name=collection_name,
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=threshold),
+        )
+        logger.info(
+            f"Indexing of collection {collection_name} restored, threshold {threshold}"
+        )
+        if wait:
+            wait_for_optimizer(client, collection_name, timeout, poll_interval)
+
+
+def wait_for_optimizer(
+    client: QdrantClient,
+    collection_name: str,
+    timeout: Optional[float] = 3600.0,
+    poll_interval: float = 1.0,
+) -> bool:
+    """
+    Waits until the optimizer of a collection finishes, so searches use a full index.
+    Returns False if it didn't finish within the timeout.
+    :param client: The Qdrant client.
+    :param collection_name: The name of the collection.
+    :param timeout: The maximum seconds to wait, or None to wait forever.
+    :param poll_interval: The seconds between two checks of the collection status.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    triggered = False
+    while True:
+        status = client.get_collection(collection_name).status
+        if status == models.CollectionStatus.GREEN:
+            return True
+        if status == models.CollectionStatus.GREY and not triggered:
+            # Pending optimizations only start after an update of the collection
+            client.update_collection(
+                collection_name=collection_name,
+                optimizers_config=models.OptimizersConfigDiff(),
+            )
+            triggered = True
+        if status == models.CollectionStatus.RED:
+            raise RuntimeError(f"The optimizer of collection {collection_name} failed")
+        if deadline is not None and time.monotonic() >= deadline:
+            logger.warning(
+                f"The optimizer of collection {collection_name} didn't finish "
+                f"in {timeout} seconds"
+            )
+            return False
+        time.sleep(poll_interval)
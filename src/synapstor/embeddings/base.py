@@ -1,20 +1,79 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List, Union
+
+import numpy as np
+
+# A single vector, either a list of floats or a 1-D float32 array
+Vector = Union[List[float], np.ndarray]
+# Several vectors, either a list of vectors or a 2-D float32 array with one row per text
+Vectors = Union[List[Vector], np.ndarray]
+
+
+def vectors_to_lists(vectors: Vectors) -> List[List[float]]:
+    """
+    Converts vectors to lists of floats, in a single C-level pass for NumPy arrays.
+    Only meant for the boundary with code that needs plain Python lists.
+    """
+    if isinstance(vectors, np.ndarray):
+        return vectors.tolist()
+    return [
+        vector.tolist() if isinstance(vector, np.ndarray) else vector
+        for vector in vectors
+    ]
+
+
+def fastembed_vector_name(model_name: str) -> str:
+    """
+    Gets the vector name of a FastEmbed model in the Qdrant collection, shared by the
+    providers that run the model, so they all read and write the same vectors.
+    Important: This is compatible with the FastEmbed logic used before version 0.6.0.
+    """
+    return f"fast-{model_name.split('/')[-1].lower()}"
 
 
 class EmbeddingProvider(ABC):
-    """Abstract base class for embedding providers."""
+    """
+    Abstract base class for embedding providers.
+
+    Providers may return float32 NumPy arrays instead of lists of floats, so vectors
+    can travel to the Qdrant client without being converted float by float.
+    """
 
     @abstractmethod
-    async def embed_documents(self, documents: List[str]) -> List[List[float]]:
+    async def embed_documents(self, documents: List[str]) -> Vectors:
         """Converts a list of documents into vectors."""
         pass
 
     @abstractmethod
-    async def embed_query(self, query: str) -> List[float]:
+    async def embed_query(self, query: str) -> Vector:
         """Converts a query into a vector."""
         pass
 
+    async def embed_queries(self, queries: List[str]) -> Vectors:
+        """
+        Converts several queries into vectors.
+        Providers that can run one inference over many queries should override it.
+        """
+        return [await self.embed_query(query) for query in queries]
+
+    def warm_up(self):
+        """
+        Loads the model and runs a dummy inference. Blocking, meant to run in a
+        background thread. Providers without a slow start don't need to override it.
+        """
+        pass
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Gets runtime metrics of the provider, such as queue depths or cache hits."""
+        return {}
+
+    def close(self):
+        """
+        Releases the threads, processes or files of the provider. Providers without
+        any don't need to override it.
+        """
+        pass
+
     @abstractmethod
     def get_vector_name(self) -> str:
         """Gets the vector name for the Qdrant collection."""
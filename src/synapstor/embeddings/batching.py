@@ -0,0 +1,118 @@
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from synapstor.embeddings.base import EmbeddingProvider, Vector, Vectors
+
+
+class MicroBatchingEmbeddingProvider(EmbeddingProvider):
+    """
+    Wraps an embedding provider so concurrent queries are embedded together.
+
+    Queries are queued and a single worker task embeds them with one call to
+    `embed_queries`. Queries that arrive while an inference is running are sent
+    together in the next one. With a positive window, the worker also waits up
+    to `window_ms` for more queries before starting an inference, unless the
+    batch is already full.
+    :param provider: The embedding provider to wrap.
+    :param max_batch_size: The maximum number of queries embedded in one inference.
+    :param window_ms: The time in milliseconds to wait for a batch to fill up.
+    """
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        max_batch_size: int = 32,
+        window_ms: float = 0.0,
+    ):
+        self.provider = provider
+        self.model_name = getattr(provider, "model_name", provider.get_vector_name())
+        self.max_batch_size = max(1, max_batch_size)
+        self.window = max(0.0, window_ms) / 1000
+        self.batches = 0
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._batch_full: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def embed_documents(self, documents: List[str]) -> Vectors:
+        """Converts a list of documents into vectors."""
+        return await self.provider.embed_documents(documents)
+
+    async def embed_query(self, query: str) -> Vector:
+        """Converts a query into a vector, sharing the inference with concurrent queries."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((query, future))
+
+        if self._worker is None or self._worker.done():
+            self._batch_full = asyncio.Event()
+            self._worker = loop.create_task(self._run())
+        elif len(self._pending) >= self.max_batch_size and self._batch_full:
+            self._batch_full.set()
+
+        return await future
+
+    async def embed_queries(self, queries: List[str]) -> Vectors:
+        """Converts several queries into vectors."""
+        return await self.provider.embed_queries(queries)
+
+    def warm_up(self):
+        """Warms up the wrapped provider."""
+        self.provider.warm_up()
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Gets runtime metrics of the wrapped provider and of the batcher."""
+        return {
+            **self.provider.get_metrics(),
+            "query_batches": self.batches,
+            "query_batch_pending": len(self._pending),
+        }
+
+    def get_vector_name(self) -> str:
+        """Gets the vector name for the Qdrant collection."""
+        return self.provider.get_vector_name()
+
+    def get_vector_size(self) -> int:
+        """Gets the vector size for the Qdrant collection."""
+        return self.provider.get_vector_size()
+
+    def close(self):
+        """Closes the wrapped provider."""
+        self.provider.close()
+
+    async def _run(self):
+        """Embeds the queued queries until the queue is empty."""
+        while self._pending:
+            if self.window > 0 and len(self._pending) < self.max_batch_size:
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), self.window)
+                except asyncio.TimeoutError:
+                    pass
+            self._batch_full.clear()
+
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            # Callers that gave up don't need a vector
+            batch = [(query, future) for query, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            # Identical queries in the same batch are embedded only once
+            queries = list(dict.fromkeys(query for query, _ in batch))
+            try:
+                vectors = await self.provider.embed_queries(queries)
+            except asyncio.CancelledError:
+                for _, future in batch + self._pending:
+                    future.cancel()
+                self._pending.clear()
+                raise
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            vectors_by_query = dict(zip(queries, vectors))
+            for query, future in batch:
+                if not future.done():
+                    future.set_result(vectors_by_query[query])
@@ -0,0 +1,129 @@
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from synapstor.embeddings.base import EmbeddingProvider, Vector, Vectors
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    entries: int
+    max_entries: int
+    size_bytes: int
+    max_bytes: int
+
+
+class CachedEmbeddingProvider(EmbeddingProvider):
+    """
+    Wraps an embedding provider with an in-memory LRU cache of query embeddings.
+    Documents are always embedded by the wrapped provider.
+    :param provider: The embedding provider to wrap.
+    :param max_entries: The maximum number of cached queries.
+    :param max_bytes: The approximate maximum memory used by the cached vectors.
+    """
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+    ):
+        self.provider = provider
+        self.model_name = getattr(provider, "model_name", provider.get_vector_name())
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size_bytes = 0
+        self._cache: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+
+    async def embed_documents(self, documents: List[str]) -> Vectors:
+        """Converts a list of documents into vectors."""
+        return await self.provider.embed_documents(documents)
+
+    async def embed_query(self, query: str) -> Vector:
+        """Converts a query into a vector, reusing the vector of a previous identical query."""
+        key = (self.model_name, self._normalize(query))
+        vector = self._cache.get(key)
+        if vector is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return vector.copy()
+
+        self.misses += 1
+        vector = np.array(await self.provider.embed_query(query), dtype=np.float32)
+        self._put(key, vector)
+        return vector.copy()
+
+    def warm_up(self):
+        """Warms up the wrapped provider."""
+        self.provider.warm_up()
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Gets runtime metrics of the wrapped provider and of the cache."""
+        return {
+            **self.provider.get_metrics(),
+            "query_cache_hits": self.hits,
+            "query_cache_misses": self.misses,
+            "query_cache_entries": len(self._cache),
+        }
+
+    def get_vector_name(self) -> str:
+        """Gets the vector name for the Qdrant collection."""
+        return self.provider.get_vector_name()
+
+    def get_vector_size(self) -> int:
+        """Gets the vector size for the Qdrant collection."""
+        return self.provider.get_vector_size()
+
+    def close(self):
+        """Closes the wrapped provider."""
+        self.provider.close()
+
+    def cache_info(self) -> CacheInfo:
+        """Returns the hit/miss counters and the current size of the cache."""
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            entries=len(self._cache),
+            max_entries=self.max_entries,
+            size_bytes=self._size_bytes,
+            max_bytes=self.max_bytes,
+        )
+
+    def cache_clear(self):
+        """Removes all cached vectors and resets the counters."""
+        self._cache.clear()
+        self._size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(query: str) -> str:
+        """Normalizes the query so trivially different spellings share one entry."""
+        return " ".join(unicodedata.normalize("NFC", query).split())
+
+    @staticmethod
+    def _entry_size(key: Tuple[str, str], vector: np.ndarray) -> int:
+        """Estimates the memory used by a cache entry."""
+        return len(key[1]) + vector.nbytes
+
+    def _put(self, key: Tuple[str, str], vector: np.ndarray):
+        """Adds a vector to the cache, evicting the least recently used ones if needed."""
+        size = self._entry_size(key, vector)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+
+        previous = self._cache.pop(key, None)
+        if previous is not None:
+            self._size_bytes -= self._entry_size(key, previous)
+
+        self._cache[key] = vector
+        self._size_bytes += size
+
+        while len(self._cache) > self.max_entries or self._size_bytes > self.max_bytes:
+            old_key, old_vector = self._cache.popitem(last=False)
+            self._size_bytes -= self._entry_size(old_key, old_vector)
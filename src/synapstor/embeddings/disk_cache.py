@@ -0,0 +1,294 @@
+import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from synapstor.embeddings.base import EmbeddingProvider, Vector, Vectors
+
+# Rows added to the matrix file at once when it is full
+GROWTH_ROWS = 1024
+
+
+class DiskEmbeddingCache:
+    """
+    Content-addressed store of the document embeddings of one model on local disk.
+
+    The vectors are the rows of a float32 matrix in a memory-mapped file, and an
+    SQLite index maps the sha256 of each text to its row and to when it was last
+    used. When the matrix reaches its size limit, the least recently used rows are
+    reused. Several processes can share the same directory.
+    :param directory: The root directory of the cache.
+    :param model_name: The name of the model that computed the vectors.
+    :param vector_size: The size of the vectors of the model.
+    :param max_bytes: The maximum size of the matrix file.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        model_name: str,
+        vector_size: int,
+        max_bytes: int = 1024 * 1024 * 1024,
+    ):
+        self.model_name = model_name
+        self.vector_size = vector_size
+        self.max_rows = max(1, max_bytes // (vector_size * 4))
+
+        # One subdirectory per model, the same text has other vectors in other models
+        name = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        suffix = hashlib.md5(f"{model_name}:{vector_size}".encode()).hexdigest()[:8]
+        self.path = Path(os.path.expanduser(directory)) / f"{name}-{suffix}"
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.path / "index.sqlite", timeout=30, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, row INTEGER NOT NULL UNIQUE, last_used REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)"
+        )
+        self._connection.commit()
+
+        self._matrix_path = self.path / "vectors.f32"
+        self._matrix_path.touch(exist_ok=True)
+        self._matrix: Optional[np.memmap] = None
+
+    @staticmethod
+    def key(text: str) -> str:
+        """Gets the key of a text, the sha256 of its UTF-8 bytes."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Gets the cached vectors of the keys found, marking them as recently used."""
+        if not keys:
+            return {}
+        with self._lock:
+            # Another process can only evict and overwrite the rows once the vectors
+            # are copied, so a row never holds the vector of another text meanwhile
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                rows: Dict[str, int] = {}
+                # SQLite limits the number of parameters of a query
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start : start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows.update(
+                        self._connection.execute(
+                            f"SELECT key, row FROM entries WHERE key IN ({placeholders})",
+                            chunk,
+                        ).fetchall()
+                    )
+                found: Dict[str, np.ndarray] = {}
+                if rows:
+                    self._connection.executemany(
+                        "UPDATE entries SET last_used = ? WHERE key = ?",
+                        [(time.time(), key) for key in rows],
+                    )
+                    matrix = self._open_matrix(max(rows.values()) + 1)
+                    found = {key: np.array(matrix[row]) for key, row in rows.items()}
+                self._connection.commit()
+                return found
+            except BaseException:
+                self._connection.rollback()
+                raise
+
+    def put_many(self, vectors: Dict[str, Vector]):
+        """Stores vectors, evicting the least recently used ones if the cache is full."""
+        if not vectors:
+            return
+        with self._lock:
+            # The write transaction also keeps other processes from taking the same rows
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                keys = list(vectors)[-self.max_rows :]
+                rows = self._allocate_rows(keys)
+                matrix = self._open_matrix(max(rows) + 1)
+                for key, row in zip(keys, rows):
+                    matrix[row] = vectors[key]
+                matrix.flush()
+                now = time.time()
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO entries (key, row, last_used) VALUES (?, ?, ?)",
+                    [(key, row, now) for key, row in zip(keys, rows)],
+                )
+                self._connection.commit()
+            except BaseException:
+                self._connection.rollback()
+                raise
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM entries"
+            ).fetchone()
+            return count
+
+    def close(self):
+        """Closes the index and the matrix file."""
+        with self._lock:
+            self._matrix = None
+            self._connection.close()
+
+    def _allocate_rows(self, keys: List[str]) -> List[int]:
+        """Picks a row for each key: its current one, a free one or an evicted one."""
+        existing = dict(
+            self._connection.execute(
+                f"SELECT key, row FROM entries WHERE key IN ({','.join('?' * len(keys))})",
+                keys,
+            ).fetchall()
+        )
+        missing = len(keys) - len(existing)
+        count, end = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(MAX(row) + 1, 0) FROM entries"
+        ).fetchone()
+
+        # Rows freed by evictions are reused before the matrix grows
+        free: List[int] = []
+        if count < end and missing:
+            used = {
+                row for (row,) in self._connection.execute("SELECT row FROM entries")
+            }
+            free = [row for row in range(end) if row not in used][:missing]
+        new_rows = list(range(end, min(end + missing - len(free), self.max_rows)))
+        free += new_rows
+
+        evict = missing - len(free)
+        if evict > 0:
+            evicted = self._connection.execute(
+                "SELECT key, row FROM entries WHERE key NOT IN "
+                f"({','.join('?' * len(keys))}) ORDER BY last_used LIMIT ?",
+                keys + [evict],
+            ).fetchall()
+            self._connection.executemany(
+                "DELETE FROM entries WHERE key = ?", [(key,) for key, _ in evicted]
+            )
+            free += [row for _, row in evicted]
+
+        free_rows = iter(free)
+        return [existing[key] if key in existing else next(free_rows) for key in keys]
+
+    def _open_matrix(self, rows: int) -> np.memmap:
+        """Maps the matrix file, growing it first if it has fewer rows than needed."""
+        row_bytes = self.vector_size * 4
+        size = self._matrix_path.stat().st_size
+        if size < rows * row_bytes:
+            size = max(rows, min(rows + GROWTH_ROWS, self.max_rows)) * row_bytes
+            with open(self._matrix_path, "r+b") as f:
+                f.truncate(size)
+            self._matrix = None
+        if self._matrix is None or self._matrix.shape[0] * row_bytes != size:
+            self._matrix = np.memmap(
+                self._matrix_path,
+                dtype=np.float32,
+                mode="r+",
+                shape=(size // row_bytes, self.vector_size),
+            )
+        return self._matrix
+
+
+class DiskCachedEmbeddingProvider(EmbeddingProvider):
+    """
+    Wraps an embedding provider with a persistent cache of document embeddings,
+    keyed by the model name and the sha256 of each document. Only the documents not
+    found are embedded by the wrapped provider. Queries are not cached here.
+    :param provider: The embedding provider to wrap.
+    :param directory: The root directory of the cache.
+    :param max_bytes: The maximum disk space used by the vectors of the model.
+    """
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        directory: str,
+        max_bytes: int = 1024 * 1024 * 1024,
+    ):
+        self.provider = provider
+        self.model_name = getattr(provider, "model_name", provider.get_vector_name())
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Opened on first use, so creating the provider doesn't touch the disk
+        self._cache: Optional[DiskEmbeddingCache] = None
+        self._cache_lock = threading.Lock()
+
+    @property
+    def cache(self) -> DiskEmbeddingCache:
+        """The cache of the model, opened on first access."""
+        if self._cache is None:
+            with self._cache_lock:
+                if self._cache is None:
+                    self._cache = DiskEmbeddingCache(
+                        self.directory,
+                        self.model_name,
+                        self.provider.get_vector_size(),
+                        max_bytes=self.max_bytes,
+                    )
+        return self._cache
+
+    async def embed_documents(self, documents: List[str]) -> np.ndarray:
+        """Converts a list of documents into a float32 matrix, embedding only new texts."""
+        keys = [DiskEmbeddingCache.key(document) for document in documents]
+        cached = await asyncio.to_thread(self.cache.get_many, list(set(keys)))
+
+        # Repeated documents are embedded only once
+        missing = {
+            key: document for key, document in zip(keys, documents) if key not in cached
+        }
+        self.hits += len(documents) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            embeddings = await self.provider.embed_documents(list(missing.values()))
+            computed = dict(zip(missing, np.asarray(embeddings, dtype=np.float32)))
+            await asyncio.to_thread(self.cache.put_many, computed)
+            cached.update(computed)
+
+        if not documents:
+            return np.empty((0, self.get_vector_size()), dtype=np.float32)
+        return np.stack([cached[key] for key in keys])
+
+    async def embed_query(self, query: str) -> Vector:
+        """Converts a query into a vector."""
+        return await self.provider.embed_query(query)
+
+    async def embed_queries(self, queries: List[str]) -> Vectors:
+        """Converts several queries into vectors."""
+        return await self.provider.embed_queries(queries)
+
+    def warm_up(self):
+        """Warms up the wrapped provider."""
+        self.provider.warm_up()
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Gets runtime metrics of the wrapped provider and of the cache."""
+        return {
+            **self.provider.get_metrics(),
+            "document_cache_hits": self.hits,
+            "document_cache_misses": self.misses,
+        }
+
+    def get_vector_name(self) -> str:
+        """Gets the vector name for the Qdrant collection."""
+        return self.provider.get_vector_name()
+
+    def get_vector_size(self) -> int:
+        """Gets the vector size for the Qdrant collection."""
+        return self.provider.get_vector_size()
+
+    def close(self):
+        """Closes the cache and the wrapped provider."""
+        if self._cache is not None:
+            self._cache.close()
+        self.provider.close()
@@ -9,9 +9,61 @@ def create_embedding_provider(settings: EmbeddingProviderSettings) -> EmbeddingP
     :param settings: The settings for the embedding provider.
     :return: An instance of the specified embedding provider.
     """
-    if settings.provider_type == EmbeddingProviderType.FASTEMBED:
+    provider: EmbeddingProvider
+    if settings.provider_type == EmbeddingProviderType.QDRANT:
+        from synapstor.embeddings.server import ServerInferenceProvider
+
+        # Qdrant embeds the texts, so there is nothing to cache or batch here
+        return ServerInferenceProvider(
+            settings.model_name, vector_size=settings.vector_size
+        )
+    elif settings.provider_type == EmbeddingProviderType.FASTEMBED:
         from synapstor.embeddings.fastembed import FastEmbedProvider
 
-        return FastEmbedProvider(settings.model_name)
+        provider = FastEmbedProvider(
+            settings.model_name,
+            threads=settings.threads,
+            intra_op_threads=settings.intra_op_threads,
+        )
+    elif settings.provider_type == EmbeddingProviderType.FASTEMBED_PROCESS:
+        from synapstor.embeddings.process_pool import ProcessPoolEmbeddingProvider
+
+        provider = ProcessPoolEmbeddingProvider(
+            settings.model_name,
+            processes=settings.processes,
+            intra_op_threads=settings.intra_op_threads,
+        )
     else:
         raise ValueError(f"Unsupported embedding provider: {settings.provider_type}")
+
+    # Documents embedded before, by any process, are read from disk
+    if settings.document_cache_enabled and settings.document_cache_max_mb > 0:
+        from synapstor.embeddings.disk_cache import DiskCachedEmbeddingProvider
+
+        provider = DiskCachedEmbeddingProvider(
+            provider,
+            directory=settings.document_cache_dir,
+            max_bytes=int(settings.document_cache_max_mb * 1024 * 1024),
+        )
+
+    # Concurrent queries are embedded together; a batch size of 1 disables it
+    if settings.query_batch_size > 1:
+        from synapstor.embeddings.batching import MicroBatchingEmbeddingProvider
+
+        provider = MicroBatchingEmbeddingProvider(
+            provider,
+            max_batch_size=settings.query_batch_size,
+            window_ms=settings.query_batch_window_ms,
+        )
+
+    # The cache wraps the batcher, so cached queries never wait for a batch
+    if settings.query_cache_enabled and settings.query_cache_size > 0:
+        from synapstor.embeddings.cache import CachedEmbeddingProvider
+
+        provider = CachedEmbeddingProvider(
+            provider,
+            max_entries=settings.query_cache_size,
+            max_bytes=int(settings.query_cache_max_mb * 1024 * 1024),
+        )
+
+    return provider
@@ -1,51 +1,126 @@
 import asyncio
-from typing import List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, TypeVar
+
+import numpy as np
 
 from fastembed import TextEmbedding
 from fastembed.common.model_description import DenseModelDescription
 
-from synapstor.embeddings.base import EmbeddingProvider
+from synapstor.embeddings.base import EmbeddingProvider, Vector, fastembed_vector_name
+
+T = TypeVar("T")
 
 
 class FastEmbedProvider(EmbeddingProvider):
     """
     Implementation of the embedding provider using FastEmbed.
     :param model_name: The name of the FastEmbed model to use.
+    :param threads: The number of threads running inferences concurrently.
+    :param intra_op_threads: The number of threads ONNX Runtime uses inside one inference,
+                             optional. If not provided, ONNX Runtime decides.
     """
 
-    def __init__(self, model_name: str):
+    def __init__(
+        self,
+        model_name: str,
+        threads: int = 1,
+        intra_op_threads: Optional[int] = None,
+    ):
         self.model_name = model_name
-        self.embedding_model = TextEmbedding(model_name)
-
-    async def embed_documents(self, documents: List[str]) -> List[List[float]]:
-        """Converts a list of documents into vectors."""
-        # Runs in a thread pool since FastEmbed is synchronous
-        loop = asyncio.get_event_loop()
-        embeddings = await loop.run_in_executor(
-            None, lambda: list(self.embedding_model.passage_embed(documents))
+        self.threads = max(1, threads)
+        self.intra_op_threads = intra_op_threads
+        # The model is only loaded on first use or by `warm_up`, since downloading
+        # and loading it can take a long time
+        self._embedding_model: Optional[TextEmbedding] = None
+        self._model_lock = threading.Lock()
+        # A dedicated pool, so inference doesn't compete with other blocking calls
+        # in the default executor and the number of concurrent inferences is bounded
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.threads, thread_name_prefix="synapstor-embedding"
+        )
+        self._queue_depth = 0
+
+    @property
+    def embedding_model(self) -> TextEmbedding:
+        """The FastEmbed model, loaded on first access. Blocks while loading."""
+        if self._embedding_model is None:
+            with self._model_lock:
+                if self._embedding_model is None:
+                    self._embedding_model = TextEmbedding(
+                        self.model_name, threads=self.intra_op_threads
+                    )
+        return self._embedding_model
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the model has already been loaded."""
+        return self._embedding_model is not None
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of inferences submitted to the executor and not finished yet."""
+        return self._queue_depth
+
+    async def embed_documents(self, documents: List[str]) -> np.ndarray:
+        """Converts a list of documents into a float32 matrix, one row per document."""
+        return await self._run_in_executor(
+            lambda: self._to_matrix(self.embedding_model.passage_embed(documents))
         )
-        return [embedding.tolist() for embedding in embeddings]
-
-    async def embed_query(self, query: str) -> List[float]:
-        """Converts a query into a vector."""
-        # Runs in a thread pool since FastEmbed is synchronous
-        loop = asyncio.get_event_loop()
-        embeddings = await loop.run_in_executor(
-            None, lambda: list(self.embedding_model.query_embed([query]))
+
+    async def embed_query(self, query: str) -> Vector:
+        """Converts a query into a float32 vector."""
+        embeddings = await self._run_in_executor(
+            lambda: self._to_matrix(self.embedding_model.query_embed([query]))
         )
-        return embeddings[0].tolist()
+        return embeddings[0]
+
+    async def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """Converts several queries into a float32 matrix with a single inference."""
+        return await self._run_in_executor(
+            lambda: self._to_matrix(self.embedding_model.query_embed(queries))
+        )
+
+    def warm_up(self):
+        """Loads the model and runs a dummy inference, so the first real one is fast."""
+        list(self.embedding_model.query_embed(["warm up"]))
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Gets runtime metrics of the provider."""
+        return {
+            "embedding_queue_depth": self._queue_depth,
+            "embedding_threads": self.threads,
+        }
+
+    def _to_matrix(self, embeddings) -> np.ndarray:
+        """Stacks the vectors produced by FastEmbed into a float32 matrix."""
+        rows = list(embeddings)
+        if not rows:
+            return np.empty((0, self.get_vector_size()), dtype=np.float32)
+        return np.stack(rows).astype(np.float32, copy=False)
+
+    def close(self):
+        """Shuts down the inference executor."""
+        self._executor.shutdown(wait=False)
+
+    async def _run_in_executor(self, function: Callable[[], T]) -> T:
+        """Runs a blocking call in the inference executor, since FastEmbed is synchronous."""
+        loop = asyncio.get_running_loop()
+        # Only changed from the event loop thread, so no lock is needed
+        self._queue_depth += 1
+        try:
+            return await loop.run_in_executor(self._executor, function)
+        finally:
+            self._queue_depth -= 1
 
     def get_vector_name(self) -> str:
-        """
-        Returns the vector name for the Qdrant collection.
-        Important: This is compatible with the FastEmbed logic used before version 0.6.0.
-        """
-        model_name = self.embedding_model.model_name.split("/")[-1].lower()
-        return f"fast-{model_name}"
+        """Gets the vector name for the Qdrant collection."""
+        return fastembed_vector_name(self.model_name)
 
     def get_vector_size(self) -> int:
         """Gets the vector size for the Qdrant collection."""
-        model_description: DenseModelDescription = (
-            self.embedding_model._get_model_description(self.model_name)
+        model_description: DenseModelDescription = TextEmbedding._get_model_description(
+            self.model_name
         )
         return model_description.dim
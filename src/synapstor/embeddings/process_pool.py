@@ -0,0 +1,313 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional
+
+import numpy as np
+from fastembed import TextEmbedding
+from fastembed.common.model_description import DenseModelDescription
+
+from synapstor.embeddings.base import EmbeddingProvider, Vector, fastembed_vector_name
+
+logger = logging.getLogger(__name__)
+
+# Kinds of requests understood by the workers
+PASSAGE = "passage"
+QUERY = "query"
+
+
+def _worker_main(
+    connection: Connection,
+    model_name: str,
+    intra_op_threads: Optional[int],
+    shared_memory_name: str,
+    max_rows: int,
+    vector_size: int,
+):
+    """
+    Entry point of a worker process. Loads its own model instance, then embeds the
+    texts received through the pipe and writes the vectors to its shared memory block.
+    """
+    shared_memory = SharedMemory(name=shared_memory_name)
+    output = np.ndarray(
+        (max_rows, vector_size), dtype=np.float32, buffer=shared_memory.buf
+    )
+    try:
+        try:
+            model = TextEmbedding(model_name, threads=intra_op_threads)
+            # A dummy inference, so the first real one doesn't pay for the warm-up
+            list(model.query_embed(["warm up"]))
+        except Exception as e:
+            connection.send(("error", f"Could not load model {model_name}: {e}"))
+            return
+        connection.send(("ready", 0))
+
+        while True:
+            try:
+                request = connection.recv()
+            except EOFError:
+                break
+            if request is None:
+                break
+
+            kind, texts = request
+            try:
+                if kind == QUERY:
+                    embeddings = model.query_embed(texts)
+                else:
+                    embeddings = model.passage_embed(texts)
+                count = 0
+                for count, embedding in enumerate(embeddings, start=1):
+                    output[count - 1] = embedding
+                connection.send(("ok", count))
+            except Exception as e:
+                connection.send(("error", str(e)))
+    finally:
+        # The parent owns the block, the worker only detaches from it
+        del output
+        shared_memory.close()
+
+
+class _Worker:
+    """Handle of a worker process, owned by the parent."""
+
+    def __init__(
+        self,
+        context,
+        model_name: str,
+        intra_op_threads: Optional[int],
+        max_rows: int,
+        vector_size: int,
+    ):
+        self.max_rows = max_rows
+        self.shared_memory = SharedMemory(
+            create=True, size=max_rows * vector_size * np.dtype(np.float32).itemsize
+        )
+        self.output = np.ndarray(
+            (max_rows, vector_size), dtype=np.float32, buffer=self.shared_memory.buf
+        )
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(
+                child_connection,
+                model_name,
+                intra_op_threads,
+                self.shared_memory.name,
+                max_rows,
+                vector_size,
+            ),
+            daemon=True,
+        )
+        self.process.start()
+        child_connection.close()
+        self.ready = False
+        # Both the warm-up thread and an embedding call may wait for the worker
+        self._ready_lock = threading.Lock()
+
+    def wait_ready(self):
+        """Blocks until the worker has loaded its model."""
+        with self._ready_lock:
+            if self.ready:
+                return
+            status, detail = self._receive()
+            if status != "ready":
+                raise RuntimeError(detail)
+            self.ready = True
+
+    def embed(self, kind: str, texts: List[str]) -> np.ndarray:
+        """Sends texts to the worker and returns a copy of the vectors it computed."""
+        self.wait_ready()
+        try:
+            self.connection.send((kind, texts))
+        except OSError:
+            raise self._exited()
+        status, detail = self._receive()
+        if status != "ok":
+            raise RuntimeError(f"Embedding worker failed: {detail}")
+        return self.output[:detail].copy()
+
+    def _receive(self):
+        """Receives the next message from the worker."""
+        try:
+            return self.connection.recv()
+        except EOFError:
+            raise self._exited()
+
+    def _exited(self) -> RuntimeError:
+        """The error of a call to a worker whose process is gone."""
+        self.process.join(timeout=1)
+        return RuntimeError(
+            f"Embedding worker exited with code {self.process.exitcode}"
+        )
+
+    def close(self):
+        """Stops the worker process and releases its shared memory block."""
+        try:
+            self.connection.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.connection.close()
+        del self.output
+        self.shared_memory.close()
+        self.shared_memory.unlink()
+
+
+class ProcessPoolEmbeddingProvider(EmbeddingProvider):
+    """
+    Embedding provider that runs FastEmbed in worker processes, outside the GIL of the
+    server process. Each worker loads its own model instance. Texts are sent to the
+    workers through pipes and the vectors come back through shared memory.
+    :param model_name: The name of the FastEmbed model to use.
+    :param processes: The number of worker processes.
+    :param intra_op_threads: The number of threads ONNX Runtime uses inside each worker,
+                             optional. If not provided, the cores are split between workers.
+    :param max_batch_size: The maximum number of texts sent to a worker in one request.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        processes: int = 2,
+        intra_op_threads: Optional[int] = None,
+        max_batch_size: int = 256,
+    ):
+        self.model_name = model_name
+        self.processes = max(1, processes)
+        self.max_batch_size = max(1, max_batch_size)
+        if intra_op_threads is None:
+            intra_op_threads = max(1, (os.cpu_count() or 1) // self.processes)
+        self._intra_op_threads = intra_op_threads
+
+        model_description: DenseModelDescription = TextEmbedding._get_model_description(
+            model_name
+        )
+        self._vector_size = model_description.dim
+
+        # Spawned workers don't inherit the threads of ONNX Runtime or of the event loop
+        self._context = multiprocessing.get_context("spawn")
+        self._workers = [self._start_worker() for _ in range(self.processes)]
+        # One thread per worker waits on its pipe, so the event loop is never blocked
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.processes, thread_name_prefix="synapstor-embedding-ipc"
+        )
+        self._idle_workers: Optional[asyncio.Queue] = None
+        self._queue_depth = 0
+        self._closed = False
+
+    async def embed_documents(self, documents: List[str]) -> np.ndarray:
+        """Converts a list of documents into a float32 matrix, one row per document."""
+        return await self._embed(PASSAGE, documents)
+
+    async def embed_query(self, query: str) -> Vector:
+        """Converts a query into a float32 vector."""
+        embeddings = await self._embed(QUERY, [query])
+        return embeddings[0]
+
+    async def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """Converts several queries into a float32 matrix."""
+        return await self._embed(QUERY, queries)
+
+    def warm_up(self):
+        """Waits until every worker has loaded and warmed up its model."""
+        for worker in self._workers:
+            worker.wait_ready()
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Gets runtime metrics of the provider."""
+        idle = self._idle_workers.qsize() if self._idle_workers else self.processes
+        return {
+            "embedding_queue_depth": self._queue_depth,
+            "embedding_processes": self.processes,
+            "embedding_idle_processes": idle,
+        }
+
+    def get_vector_name(self) -> str:
+        """Gets the vector name for the Qdrant collection."""
+        return fastembed_vector_name(self.model_name)
+
+    def get_vector_size(self) -> int:
+        """Gets the vector size for the Qdrant collection."""
+        return self._vector_size
+
+    def close(self):
+        """Stops the worker processes."""
+        self._closed = True
+        for worker in self._workers:
+            try:
+                worker.close()
+            except Exception as e:
+                logger.warning(f"Error stopping embedding worker: {e}")
+        self._executor.shutdown(wait=False)
+
+    def _start_worker(self) -> _Worker:
+        """Starts a worker process, which loads its model in the background."""
+        return _Worker(
+            self._context,
+            self.model_name,
+            self._intra_op_threads,
+            self.max_batch_size,
+            self._vector_size,
+        )
+
+    def _release_worker(self, worker: _Worker, idle_workers: asyncio.Queue):
+        """
+        Puts a worker back in the idle queue once its request is done. A worker whose
+        process died is replaced by a new one, so the pool keeps its size.
+        """
+        if not self._closed and not worker.process.is_alive():
+            logger.warning(
+                f"Embedding worker exited with code {worker.process.exitcode}, "
+                "starting a new one"
+            )
+            try:
+                # Releases the shared memory block of the dead worker
+                worker.close()
+            except Exception as e:
+                logger.warning(f"Error stopping embedding worker: {e}")
+            replacement = self._start_worker()
+            self._workers[self._workers.index(worker)] = replacement
+            worker = replacement
+        idle_workers.put_nowait(worker)
+
+    async def _embed(self, kind: str, texts: List[str]) -> np.ndarray:
+        """Splits the texts in batches and embeds them in parallel in the workers."""
+        if not texts:
+            return np.empty((0, self._vector_size), dtype=np.float32)
+        batches = [
+            texts[start : start + self.max_batch_size]
+            for start in range(0, len(texts), self.max_batch_size)
+        ]
+        results = await asyncio.gather(
+            *[self._embed_batch(kind, batch) for batch in batches]
+        )
+        return np.concatenate(results)
+
+    async def _embed_batch(self, kind: str, texts: List[str]) -> np.ndarray:
+        """Embeds a batch of texts in the first idle worker."""
+        if self._idle_workers is None:
+            self._idle_workers = asyncio.Queue()
+            for worker in self._workers:
+                self._idle_workers.put_nowait(worker)
+
+        loop = asyncio.get_running_loop()
+        idle_workers = self._idle_workers
+        self._queue_depth += 1
+        try:
+            worker = await idle_workers.get()
+            future = loop.run_in_executor(self._executor, worker.embed, kind, texts)
+            # The worker is only reused once its pipe is free, even if the caller gives up
+            future.add_done_callback(
+                lambda _: self._release_worker(worker, idle_workers)
+            )
+            return await asyncio.shield(future)
+        finally:
+            self._queue_depth -= 1
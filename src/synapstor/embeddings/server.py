@@ -0,0 +1,140 @@
+from typing import Any, List, Optional
+
+from qdrant_client import AsyncQdrantClient, models
+
+from synapstor.embeddings.base import (
+    EmbeddingProvider,
+    Vector,
+    fastembed_vector_name,
+    vectors_to_lists,
+)
+
+
+class ServerInferenceError(RuntimeError):
+    """
+    Raised when vectors are asked from a provider whose model only runs on the
+    Qdrant server. The texts have to reach the server as documents instead.
+    """
+
+
+class ServerInferenceProvider(EmbeddingProvider):
+    """
+    Leaves the embedding of the texts to the Qdrant server, so no model is loaded in
+    this process. The connector sends each text as a `models.Document` of the model.
+    :param model_name: The name of the model the server embeds the texts with.
+    :param vector_size: The size of the vectors of the model, optional. If not provided,
+                        it is looked up in the FastEmbed model list, without loading the model.
+    """
+
+    def __init__(self, model_name: str, vector_size: Optional[int] = None):
+        self.model_name = model_name
+        self._vector_size = vector_size
+
+    def document(self, text: str) -> models.Document:
+        """Wraps a text, so the server embeds it with the model."""
+        return models.Document(text=text, model=self.model_name)
+
+    async def embed_documents(self, documents: List[str]) -> List[Vector]:
+        """Texts are embedded by the server, see `document`."""
+        raise self._no_local_vectors()
+
+    async def embed_query(self, query: str) -> Vector:
+        """Texts are embedded by the server, see `document`."""
+        raise self._no_local_vectors()
+
+    def _no_local_vectors(self) -> ServerInferenceError:
+        return ServerInferenceError(
+            f"The model {self.model_name} runs on the Qdrant server "
+            "(EMBEDDING_PROVIDER=qdrant), so there are no local vectors. "
+            "Send the texts through the QdrantConnector, or wrap them with "
+            "`document()` in the points and queries sent to Qdrant"
+        )
+
+    def get_vector_name(self) -> str:
+        """Gets the vector name for the Qdrant collection."""
+        return fastembed_vector_name(self.model_name)
+
+    def get_vector_size(self) -> int:
+        """Gets the vector size for the Qdrant collection."""
+        if self._vector_size is None:
+            try:
+                from fastembed import TextEmbedding
+            except ImportError:
+                raise ValueError(
+                    f"The vector size of model {self.model_name} is unknown, "
+                    "set EMBEDDING_VECTOR_SIZE"
+                )
+            self._vector_size = TextEmbedding._get_model_description(
+                self.model_name
+            ).dim
+        return self._vector_size
+
+
+class LocalInferenceClient:
+    """
+    Stand-in for the inference of a Qdrant server, in front of a client in local mode,
+    which can't embed documents itself. The documents of the points and queries are
+    embedded by a local provider before they reach the client, like the server would
+    do, and every other call goes straight to the client.
+    :param client: The client in local mode.
+    :param embedding_provider: The provider that embeds the documents, with the model of the server.
+    """
+
+    def __init__(
+        self, client: AsyncQdrantClient, embedding_provider: EmbeddingProvider
+    ):
+        self.client = client
+        self.embedding_provider = embedding_provider
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    async def upsert(
+        self, collection_name: str, points: List[models.PointStruct], **kwargs
+    ):
+        """Embeds the documents of the points and upserts them."""
+        return await self.client.upsert(
+            collection_name=collection_name,
+            points=await self._embed_points(points),
+            **kwargs,
+        )
+
+    async def query_points(self, collection_name: str, query: Any = None, **kwargs):
+        """Embeds the document of the query and runs it."""
+        if isinstance(query, models.Document):
+            query = await self.embedding_provider.embed_query(query.text)
+        return await self.client.query_points(
+            collection_name=collection_name, query=query, **kwargs
+        )
+
+    async def _embed_points(
+        self, points: List[models.PointStruct]
+    ) -> List[models.PointStruct]:
+        """Replaces the named vectors given as documents with their embeddings."""
+        documents = [
+            (index, name, vector.text)
+            for index, point in enumerate(points)
+            if isinstance(point.vector, dict)
+            for name, vector in point.vector.items()
+            if isinstance(vector, models.Document)
+        ]
+        if not documents:
+            return points
+
+        # All the documents of the request are embedded with a single call
+        embeddings = vectors_to_lists(
+            await self.embedding_provider.embed_documents(
+                [text for _, _, text in documents]
+            )
+        )
+        vectors = {index: dict(points[index].vector) for index, _, _ in documents}
+        for (index, name, _), embedding in zip(documents, embeddings):
+            vectors[index][name] = embedding
+        return [
+            (
+                point.model_copy(update={"vector": vectors[index]})
+                if index in vectors
+                else point
+            )
+            for index, point in enumerate(points)
+        ]
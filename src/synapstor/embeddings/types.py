@@ -3,3 +3,5 @@ from enum import Enum
 
 class EmbeddingProviderType(Enum):
     FASTEMBED = "fastembed"
+    FASTEMBED_PROCESS = "fastembed-process"
+    QDRANT = "qdrant"
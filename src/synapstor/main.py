@@ -1,4 +1,5 @@
 import argparse
+import signal
 import sys
 
 from synapstor.env_loader import setup_environment
@@ -28,9 +29,15 @@ def main():
     print("Starting MCP server...")
     try:
         from synapstor.server import mcp
-
-        print(f"Starting MCP server with transport: {args.transport}")
-        mcp.run(transport=args.transport)
     except ImportError as e:
         print(f"❌ Error starting the server: {e}")
         sys.exit(1)
+
+    # `synapstor-ctl stop` sends SIGTERM, which would skip the cleanup below
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    print(f"Starting MCP server with transport: {args.transport}")
+    try:
+        mcp.run(transport=args.transport)
+    finally:
+        mcp.close()
@@ -1,11 +1,16 @@
+import asyncio
 import json
 import logging
-from typing import List, Any
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Any, Optional
 
 from mcp.server.fastmcp import Context, FastMCP
 
 from synapstor.embeddings.factory import create_embedding_provider
 from synapstor.qdrant import Entry, Metadata, QdrantConnector
+from synapstor.search_profiles import SearchProfile
 from synapstor.settings import (
     EmbeddingProviderSettings,
     QdrantSettings,
@@ -14,6 +19,12 @@ from synapstor.settings import (
 
 logger = logging.getLogger(__name__)
 
+# Environment variable with the path of the file where the server reports its
+# readiness, set by `synapstor-ctl start` and read by `synapstor-ctl status`
+STATUS_FILE_ENV = "SYNAPSTOR_STATUS_FILE"
+# Seconds between the updates of the metrics of the embedding provider in the status file
+STATUS_REPORT_INTERVAL = 30.0
+
 
 # FastMCP is an alternative interface for declaring the capabilities
 # of the server. Its API is based on FastAPI.
@@ -42,12 +53,108 @@ class QdrantMCPServer(FastMCP):
             qdrant_settings.collection_name,
             self.embedding_provider,
             qdrant_settings.local_path,
+            search_cache_size=qdrant_settings.search_cache_size,
+            search_cache_ttl=qdrant_settings.search_cache_ttl,
+            quantization=qdrant_settings.quantization,
+            search_oversampling=qdrant_settings.search_oversampling,
+            search_rescore=qdrant_settings.search_rescore,
+            storage=qdrant_settings.get_collection_storage(),
+            search_profile=qdrant_settings.search_profile,
+            score_threshold=qdrant_settings.score_threshold,
+            transport=qdrant_settings.get_client_transport(),
         )
 
         super().__init__(name=name, instructions=instructions, **settings)
 
         self.setup_tools()
 
+        # The model is loaded in the background, so the server answers the MCP
+        # handshake right away. Tool calls wait for `model_ready`.
+        self._warm_up_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="synapstor-warm-up"
+        )
+        self._model_status = "loading"
+        self._model_error: Optional[str] = None
+        self._status_lock = threading.Lock()
+        self._report_status()
+        self.model_ready: Future = self._warm_up_executor.submit(
+            self.embedding_provider.warm_up
+        )
+        self.model_ready.add_done_callback(self._on_model_ready)
+        self._warm_up_executor.shutdown(wait=False)
+
+        # The queue depths and cache hits of the provider change while the server
+        # runs, so they are written again periodically
+        self._stop_reporting = threading.Event()
+        if os.environ.get(STATUS_FILE_ENV):
+            threading.Thread(
+                target=self._report_metrics, name="synapstor-status", daemon=True
+            ).start()
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the embedding model has finished loading."""
+        return self.model_ready.done()
+
+    async def wait_until_ready(self):
+        """
+        Waits until the embedding model has finished loading. If the warm-up failed,
+        the call goes on and the provider reports the error when it is used.
+        """
+        if self.model_ready.done():
+            return
+        try:
+            await asyncio.wrap_future(self.model_ready)
+        except Exception:
+            pass
+
+    def close(self):
+        """
+        Stops the status updates and releases the embedding provider, so its worker
+        processes and shared memory are gone before the interpreter exits.
+        """
+        self._stop_reporting.set()
+        self.embedding_provider.close()
+
+    def _on_model_ready(self, future: Future):
+        """Logs and reports the end of the model warm-up."""
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Error loading the embedding model: {error}")
+            self._model_status, self._model_error = "failed", str(error)
+        else:
+            logger.info("Embedding model loaded")
+            self._model_status = "ready"
+        self._report_status()
+
+    def _report_metrics(self):
+        """Rewrites the status file every `STATUS_REPORT_INTERVAL` seconds."""
+        while not self._stop_reporting.wait(STATUS_REPORT_INTERVAL):
+            self._report_status()
+
+    def _report_status(self):
+        """
+        Writes the readiness of the server and the metrics of the embedding provider
+        to the status file, if one was given.
+        """
+        status_file = os.environ.get(STATUS_FILE_ENV)
+        if not status_file:
+            return
+        with self._status_lock:
+            status = {
+                "pid": os.getpid(),
+                "model": self._model_status,
+                "error": self._model_error,
+                "metrics": self.embedding_provider.get_metrics(),
+            }
+            try:
+                # Replaced at once, so `synapstor-ctl status` never reads half a file
+                with open(f"{status_file}.tmp", "w") as f:
+                    json.dump(status, f)
+                os.replace(f"{status_file}.tmp", status_file)
+            except OSError as e:
+                logger.warning(f"Could not write the status file {status_file}: {e}")
+
     def format_entry(self, entry: Entry) -> str:
         """
         Feel free to override this method in your subclass to customize the entry format.
@@ -75,6 +182,7 @@ class QdrantMCPServer(FastMCP):
             :return: A message indicating that the information has been stored.
             """
             await ctx.debug(f"Storing information {information} in Qdrant")
+            await self.wait_until_ready()
 
             entry = Entry(content=information, metadata=metadata)
 
@@ -96,6 +204,10 @@ class QdrantMCPServer(FastMCP):
             ctx: Context,
             query: str,
             collection_name: str,
+            oversampling: Optional[float] = None,
+            rescore: Optional[bool] = None,
+            profile: Optional[SearchProfile] = None,
+            score_threshold: Optional[float] = None,
         ) -> List[str]:
             """
             Find memories in Qdrant.
@@ -104,9 +216,18 @@ class QdrantMCPServer(FastMCP):
             :param collection_name: The collection name to search in, optional. If not provided,
                                     the default collection is used.
             :param limit: The maximum number of entries to return, optional. Default is 10.
+            :param oversampling: How many candidates are fetched per result on a quantized collection,
+                                 optional. Default comes from the profile, or QDRANT_SEARCH_OVERSAMPLING.
+            :param rescore: Whether to rescore the candidates with the original vectors, optional.
+                            Default comes from the profile, or QDRANT_SEARCH_RESCORE.
+            :param profile: The tradeoff of the search, optional: "fast" for interactive loops,
+                            "balanced", or "exact" for audits. Default is QDRANT_SEARCH_PROFILE.
+            :param score_threshold: The minimum score of the entries returned, optional.
+                                    Default is QDRANT_SEARCH_SCORE_THRESHOLD.
             :return: A list of found entries.
             """
             await ctx.debug(f"Finding results for query {query}")
+            await self.wait_until_ready()
             if collection_name:
                 await ctx.debug(f"Replacing collection name with {collection_name}")
 
@@ -114,6 +235,10 @@ class QdrantMCPServer(FastMCP):
                 query,
                 collection_name=collection_name,
                 limit=self.qdrant_settings.search_limit,
+                oversampling=oversampling,
+                rescore=rescore,
+                profile=profile,
+                score_threshold=score_threshold,
             )
             if not entries:
                 return [f"No information found for query '{query}'"]
@@ -127,8 +252,20 @@ class QdrantMCPServer(FastMCP):
         async def find_with_default_collection(
             ctx: Context,
             query: str,
+            oversampling: Optional[float] = None,
+            rescore: Optional[bool] = None,
+            profile: Optional[SearchProfile] = None,
+            score_threshold: Optional[float] = None,
         ) -> List[str]:
-            return await find(ctx, query, self.qdrant_settings.collection_name)
+            return await find(
+                ctx,
+                query,
+                self.qdrant_settings.collection_name,
+                oversampling=oversampling,
+                rescore=rescore,
+                profile=profile,
+                score_threshold=score_threshold,
+            )
 
         # Register the tools depending on the configuration
 
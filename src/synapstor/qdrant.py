@@ -1,11 +1,23 @@
+import asyncio
 import logging
 import uuid
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, Union, cast
 
 from pydantic import BaseModel
 from qdrant_client import AsyncQdrantClient, models
+from qdrant_client.http.exceptions import UnexpectedResponse
 
-from synapstor.embeddings.base import EmbeddingProvider
+from synapstor.embeddings.base import EmbeddingProvider, vectors_to_lists
+from synapstor.embeddings.server import LocalInferenceClient, ServerInferenceProvider
+from synapstor.quantization import (
+    QuantizationType,
+    create_quantization_config,
+    is_quantized,
+)
+from synapstor.search_cache import SearchResultCache
+from synapstor.search_profiles import SEARCH_PROFILES, SearchOptions, SearchProfile
+from synapstor.storage import CollectionStorage
+from synapstor.transport import ClientTransport
 
 # Import the deterministic ID generator
 try:
@@ -49,6 +61,16 @@ class Entry(BaseModel):
     metadata: Optional[Metadata] = None
 
 
+class CollectionSchema(BaseModel):
+    """
+    The cached description of an existing Qdrant collection.
+    """
+
+    vector_name: Optional[str] = None
+    vector_size: Optional[int] = None
+    quantized: bool = False
+
+
 class QdrantConnector:
     """
     Encapsulates the connection to a Qdrant server and all methods to interact with it.
@@ -57,6 +79,22 @@ class QdrantConnector:
     :param collection_name: The name of the collection to use.
     :param embedding_provider: The embedding provider to use.
     :param qdrant_local_path: The path to the Qdrant client storage directory, if local mode is used.
+    :param search_cache_size: The maximum number of search results kept in memory, 0 disables the cache.
+    :param search_cache_ttl: The time in seconds a cached search result stays valid.
+    :param quantization: The quantization of the vectors of the collections created by the connector.
+    :param search_oversampling: The default oversampling of the searches on quantized collections.
+    :param search_rescore: Whether searches on quantized collections rescore the candidates
+                           with the original vectors by default.
+    :param storage: Where Qdrant keeps the vectors, payload and HNSW graph of the collections
+                    created by the connector, optional. If not provided, the defaults of Qdrant are used.
+    :param search_profile: The default tradeoff between latency and accuracy of the searches, optional.
+                           If not provided, the collections are searched with their own defaults.
+    :param score_threshold: The default minimum score of the entries returned by a search, optional.
+    :param transport: The protocol, timeout and connection pool of the client, optional. If not provided,
+                      the defaults of the Qdrant client are used.
+    :param inference_stand_in: The provider that embeds the documents in local mode, when the embedding
+                               provider leaves the embedding to the server, optional. If not provided,
+                               the model of the server is loaded with FastEmbed.
     """
 
     def __init__(
@@ -66,14 +104,60 @@ class QdrantConnector:
         collection_name: str,
         embedding_provider: EmbeddingProvider,
         qdrant_local_path: Optional[str] = None,
+        search_cache_size: int = 0,
+        search_cache_ttl: float = 30.0,
+        quantization: QuantizationType = QuantizationType.NONE,
+        search_oversampling: Optional[float] = None,
+        search_rescore: Optional[bool] = None,
+        storage: Optional[CollectionStorage] = None,
+        search_profile: Optional[SearchProfile] = None,
+        score_threshold: Optional[float] = None,
+        transport: Optional[ClientTransport] = None,
+        inference_stand_in: Optional[EmbeddingProvider] = None,
     ):
         self._qdrant_url = qdrant_url.rstrip("/") if qdrant_url else None
         self._qdrant_api_key = qdrant_api_key
         self._default_collection_name = collection_name
         self._embedding_provider = embedding_provider
+        self._quantization = quantization
+        self._search_oversampling = search_oversampling
+        self._search_rescore = search_rescore
+        self._storage = storage or CollectionStorage()
+        self._search_profile = search_profile
+        self._score_threshold = score_threshold
+        # With server-side inference, texts are sent to Qdrant as `models.Document`
+        self._server_provider: Optional[ServerInferenceProvider] = None
+        if isinstance(embedding_provider, ServerInferenceProvider):
+            self._server_provider = embedding_provider
+        local_mode = qdrant_local_path is not None or qdrant_url == ":memory:"
+        client_kwargs = (transport or ClientTransport()).client_kwargs()
+        if self._server_provider is not None and not local_mode:
+            client_kwargs["cloud_inference"] = True
         self._client = AsyncQdrantClient(
-            location=qdrant_url, api_key=qdrant_api_key, path=qdrant_local_path
+            location=qdrant_url,
+            api_key=qdrant_api_key,
+            path=qdrant_local_path,
+            **client_kwargs,
         )
+        if self._server_provider is not None and local_mode:
+            # There is no server to embed the documents, they are embedded in front of the client
+            if inference_stand_in is None:
+                from synapstor.embeddings.fastembed import FastEmbedProvider
+
+                inference_stand_in = FastEmbedProvider(self._server_provider.model_name)
+            # It answers the calls of the connector like the client it wraps
+            self._client = cast(
+                AsyncQdrantClient,
+                LocalInferenceClient(self._client, inference_stand_in),
+            )
+        # Collections known to exist, filled on first use
+        self._collection_schemas: Dict[str, CollectionSchema] = {}
+        self._collection_lock = asyncio.Lock()
+        self._search_cache: Optional[SearchResultCache] = None
+        if search_cache_size > 0:
+            self._search_cache = SearchResultCache(
+                max_entries=search_cache_size, ttl=search_cache_ttl
+            )
 
     async def get_collection_names(self) -> list[str]:
         """
@@ -94,38 +178,116 @@ class QdrantConnector:
         await self._ensure_collection_exists(collection_name)
 
         # Embed the document
-        # ToDo: instead of embedding text explicitly, use `models.Document`,
-        # it should unlock usage of server-side inference.
-        embeddings = await self._embedding_provider.embed_documents([entry.content])
+        vectors = await self._embed_documents([entry.content])
 
         # Add to Qdrant
         vector_name = self._embedding_provider.get_vector_name()
-        payload = {"document": entry.content, "metadata": entry.metadata}
+        await self._upsert(
+            collection_name, [self._build_point(entry, vectors[0], vector_name)]
+        )
 
-        # Generate a deterministic ID if there's enough metadata
-        if entry.metadata:
-            # Use the deterministic ID generator
-            document_id = generate_deterministic_id(entry.metadata)
-        else:
-            # Fallback to UUID if no metadata
-            document_id = uuid.uuid4().hex
+    async def store_many(
+        self,
+        entries: List[Entry],
+        *,
+        collection_name: Optional[str] = None,
+        batch_size: int = 64,
+        max_parallel_upserts: int = 4,
+    ):
+        """
+        Stores several entries in the Qdrant collection at once. Entries are embedded
+        in batches with a single call to the embedding provider per batch, and each
+        batch is sent as one upsert. Up to `max_parallel_upserts` upserts are in flight
+        at the same time, so the next batch is embedded while the previous ones are sent.
+        :param entries: The entries to store in the Qdrant collection.
+        :param collection_name: The name of the collection to store the information in, optional. If not provided,
+                                the default collection is used.
+        :param batch_size: The number of entries embedded and sent to Qdrant per request.
+        :param max_parallel_upserts: The maximum number of concurrent upsert requests.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        if not entries:
+            return
 
-        # Informative log
-        logger.debug(f"Storing document with ID: {document_id}")
+        collection_name = collection_name or self._default_collection_name
+        await self._ensure_collection_exists(collection_name)
 
-        await self._client.upsert(
-            collection_name=collection_name,
-            points=[
-                models.PointStruct(
-                    id=document_id,  # Use deterministic ID or UUID
-                    vector={vector_name: embeddings[0]},
-                    payload=payload,
+        vector_name = self._embedding_provider.get_vector_name()
+        # The semaphore is acquired before a batch is scheduled, so at most
+        # `max_parallel_upserts` batches of points are kept in memory
+        semaphore = asyncio.Semaphore(max(1, max_parallel_upserts))
+        pending: List[asyncio.Task] = []
+
+        async def upsert_batch(points: List[models.PointStruct]):
+            try:
+                await self._upsert(collection_name, points)
+            finally:
+                semaphore.release()
+
+        try:
+            for start in range(0, len(entries), batch_size):
+                batch = entries[start : start + batch_size]
+                vectors = await self._embed_documents(
+                    [entry.content for entry in batch]
                 )
-            ],
+                points = [
+                    self._build_point(entry, vector, vector_name)
+                    for entry, vector in zip(batch, vectors)
+                ]
+
+                await semaphore.acquire()
+                pending.append(asyncio.create_task(upsert_batch(points)))
+
+            await asyncio.gather(*pending)
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            raise
+
+        logger.debug(
+            f"Stored {len(entries)} entries in collection '{collection_name}' "
+            f"using {len(pending)} upsert requests"
         )
 
+    async def delete(
+        self,
+        point_ids: List[models.ExtendedPointId],
+        *,
+        collection_name: Optional[str] = None,
+    ):
+        """
+        Deletes points from the Qdrant collection.
+        :param point_ids: The IDs of the points to delete.
+        :param collection_name: The name of the collection to delete the points from, optional. If not provided,
+                                the default collection is used.
+        """
+        collection_name = collection_name or self._default_collection_name
+        if not point_ids:
+            return
+        try:
+            await self._client.delete(
+                collection_name=collection_name,
+                points_selector=models.PointIdsList(points=point_ids),
+            )
+        except Exception as e:
+            if not self._is_not_found_error(e):
+                raise
+            self.invalidate_collection_cache(collection_name)
+        finally:
+            self._invalidate_search_cache(collection_name)
+
     async def search(
-        self, query: str, *, collection_name: Optional[str] = None, limit: int = 10
+        self,
+        query: str,
+        *,
+        collection_name: Optional[str] = None,
+        limit: int = 10,
+        query_filter: Optional[models.Filter] = None,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
+        profile: Optional[SearchProfile] = None,
+        score_threshold: Optional[float] = None,
     ) -> list[Entry]:
         """
         Finds points in the Qdrant collection. If no entries are found, an empty list is returned.
@@ -133,27 +295,121 @@ class QdrantConnector:
         :param collection_name: The name of the collection to search in, optional. If not provided,
                                 the default collection is used.
         :param limit: The maximum number of entries to return.
+        :param query_filter: A filter on the payload of the points, optional.
+        :param oversampling: How many candidates are fetched per result on a quantized collection,
+                             optional. If not provided, the one of the profile is used.
+        :param rescore: Whether to rescore the candidates with the original vectors, optional.
+                        If not provided, the one of the profile is used.
+        :param profile: The tradeoff between latency and accuracy of the search, optional.
+                        If not provided, the default profile of the connector is used.
+        :param score_threshold: The minimum score of the entries returned, optional. If not provided,
+                                the default threshold of the connector is used.
         :return: A list of found entries.
         """
         collection_name = collection_name or self._default_collection_name
-        collection_exists = await self._client.collection_exists(collection_name)
-        if not collection_exists:
+        options = self._search_options(profile, oversampling, rescore)
+        if score_threshold is None:
+            score_threshold = self._score_threshold
+        if self._search_cache is None:
+            return await self._search(
+                query, collection_name, limit, query_filter, options, score_threshold
+            )
+
+        key = (
+            query,
+            limit,
+            query_filter.model_dump_json() if query_filter is not None else None,
+            options,
+            score_threshold,
+        )
+        entries = await self._search_cache.get_or_fetch(
+            collection_name,
+            key,
+            lambda: self._search(
+                query, collection_name, limit, query_filter, options, score_threshold
+            ),
+        )
+        return list(entries)
+
+    def _search_options(
+        self,
+        profile: Optional[SearchProfile],
+        oversampling: Optional[float],
+        rescore: Optional[bool],
+    ) -> SearchOptions:
+        """
+        Resolves the options of a search: the values given for the request, then the ones
+        of the profile, then the defaults of the connector.
+        :param profile: The profile of the request, optional.
+        :param oversampling: The oversampling of the request, optional.
+        :param rescore: Whether the request rescores the candidates, optional.
+        :return: The options of the search.
+        """
+        profile = profile or self._search_profile
+        if profile is not None:
+            options = SEARCH_PROFILES[profile]
+        else:
+            options = SearchOptions(
+                oversampling=self._search_oversampling, rescore=self._search_rescore
+            )
+        if oversampling is not None:
+            options = options._replace(oversampling=oversampling)
+        if rescore is not None:
+            options = options._replace(rescore=rescore)
+        return options
+
+    async def _search(
+        self,
+        query: str,
+        collection_name: str,
+        limit: int,
+        query_filter: Optional[models.Filter],
+        options: SearchOptions = SearchOptions(),
+        score_threshold: Optional[float] = None,
+    ) -> list[Entry]:
+        """
+        Runs the search against Qdrant, bypassing the search result cache.
+        :param query: The query to use for the search.
+        :param collection_name: The name of the collection to search in.
+        :param limit: The maximum number of entries to return.
+        :param query_filter: A filter on the payload of the points, optional.
+        :param options: How Qdrant looks for the nearest vectors.
+        :param score_threshold: The minimum score of the entries returned, optional.
+        :return: A list of found entries.
+        """
+        schema = await self._get_collection_schema(collection_name)
+        if schema is None:
             return []
 
-        # Embed the query
-        # ToDo: instead of embedding text explicitly, use `models.Document`,
-        # it should unlock usage of server-side inference.
+        # The quantization parameters are ignored by collections that aren't quantized
+        search_params = options.to_search_params(schema.quantized)
 
-        query_vector = await self._embedding_provider.embed_query(query)
+        # Embed the query, unless the server does it
+        query_vector: Any
+        if self._server_provider is not None:
+            query_vector = self._server_provider.document(query)
+        else:
+            # NumPy vectors are passed as they are, the client converts them
+            query_vector = await self._embedding_provider.embed_query(query)
         vector_name = self._embedding_provider.get_vector_name()
 
         # Search in Qdrant
-        search_results = await self._client.query_points(
-            collection_name=collection_name,
-            query=query_vector,
-            using=vector_name,
-            limit=limit,
-        )
+        try:
+            search_results = await self._client.query_points(
+                collection_name=collection_name,
+                query=query_vector,
+                using=vector_name,
+                limit=limit,
+                query_filter=query_filter,
+                search_params=search_params,
+                score_threshold=score_threshold,
+            )
+        except Exception as e:
+            if not self._is_not_found_error(e):
+                raise
+            # The collection was removed behind our back
+            self.invalidate_collection_cache(collection_name)
+            return []
 
         return [
             Entry(
@@ -163,24 +419,221 @@ class QdrantConnector:
             for result in search_results.points
         ]
 
+    async def _embed_documents(
+        self, documents: List[str]
+    ) -> Sequence[Union[List[float], models.Document]]:
+        """
+        Embeds documents with a single call to the embedding provider. With server-side
+        inference, the documents are only wrapped, and Qdrant embeds them.
+        :param documents: The texts to embed.
+        :return: The vector of each document, or the document to send to Qdrant.
+        """
+        if self._server_provider is not None:
+            return [self._server_provider.document(text) for text in documents]
+        embeddings = await self._embedding_provider.embed_documents(documents)
+        # One C-level conversion per batch, instead of one per vector
+        return vectors_to_lists(embeddings)
+
+    def _build_point(
+        self,
+        entry: Entry,
+        vector: Union[List[float], models.Document],
+        vector_name: str,
+    ) -> models.PointStruct:
+        """
+        Builds the Qdrant point for an entry and its embedding.
+        :param entry: The entry to convert.
+        :param vector: The vector computed for the entry content, or the document Qdrant embeds.
+        :param vector_name: The name of the vector in the collection.
+        :return: The point to be upserted.
+        """
+        payload = {"document": entry.content, "metadata": entry.metadata}
+
+        # Generate a deterministic ID if there's enough metadata
+        if entry.metadata:
+            # Use the deterministic ID generator
+            document_id = generate_deterministic_id(entry.metadata)
+        else:
+            # Fallback to UUID if no metadata
+            document_id = uuid.uuid4().hex
+
+        # Informative log
+        logger.debug(f"Storing document with ID: {document_id}")
+
+        # The fields are built here, so pydantic doesn't need to validate every float
+        return models.PointStruct.model_construct(
+            id=document_id,  # Use deterministic ID or UUID
+            vector={vector_name: vector},
+            payload=payload,
+        )
+
+    def invalidate_collection_cache(self, collection_name: Optional[str] = None):
+        """
+        Forgets what is known about a collection, so it is looked up again on next use.
+        :param collection_name: The name of the collection to forget, optional. If not provided,
+                                the whole cache is cleared.
+        """
+        if collection_name is None:
+            self._collection_schemas.clear()
+            if self._search_cache is not None:
+                self._search_cache.clear()
+        else:
+            self._collection_schemas.pop(collection_name, None)
+            self._invalidate_search_cache(collection_name)
+
+    def _invalidate_search_cache(self, collection_name: str):
+        """
+        Bumps the write generation of a collection, so no cached search result survives a write.
+        :param collection_name: The name of the collection that was written to.
+        """
+        if self._search_cache is not None:
+            self._search_cache.invalidate(collection_name)
+
+    async def refresh_collection_cache(
+        self, collection_name: Optional[str] = None
+    ) -> Optional[CollectionSchema]:
+        """
+        Reloads the cached schema of a collection from Qdrant.
+        :param collection_name: The name of the collection to refresh, optional. If not provided,
+                                the default collection is used.
+        :return: The schema of the collection, or None if it doesn't exist.
+        """
+        collection_name = collection_name or self._default_collection_name
+        self.invalidate_collection_cache(collection_name)
+        return await self._get_collection_schema(collection_name)
+
+    async def _get_collection_schema(
+        self, collection_name: str, create: bool = False
+    ) -> Optional[CollectionSchema]:
+        """
+        Gets the schema of a collection, asking Qdrant only if it's not cached yet.
+        :param collection_name: The name of the collection.
+        :param create: Whether to create the collection if it doesn't exist.
+        :return: The schema of the collection, or None if it doesn't exist and wasn't created.
+        """
+        schema = self._collection_schemas.get(collection_name)
+        if schema is not None:
+            return schema
+
+        async with self._collection_lock:
+            # Another task may have filled the cache while we were waiting
+            schema = self._collection_schemas.get(collection_name)
+            if schema is not None:
+                return schema
+
+            try:
+                collection_info = await self._client.get_collection(collection_name)
+                schema = self._schema_from_collection_info(
+                    collection_name, collection_info
+                )
+            except Exception as e:
+                if not self._is_not_found_error(e):
+                    raise
+                if not create:
+                    return None
+                schema = await self._create_collection(collection_name)
+
+            self._collection_schemas[collection_name] = schema
+            return schema
+
+    def _schema_from_collection_info(
+        self, collection_name: str, collection_info: models.CollectionInfo
+    ) -> CollectionSchema:
+        """
+        Extracts the vector name and size, and whether the vectors are quantized, from the
+        collection configuration.
+        :param collection_name: The name of the collection.
+        :param collection_info: The collection information returned by Qdrant.
+        :return: The schema of the collection.
+        """
+        vectors_config = collection_info.config.params.vectors
+        if isinstance(vectors_config, dict):
+            if not vectors_config:
+                return CollectionSchema()
+            # Prefer the vector of the current embedding provider, if present
+            vector_name = self._embedding_provider.get_vector_name()
+            if vector_name not in vectors_config:
+                vector_name = next(iter(vectors_config.keys()))
+                logger.warning(
+                    f"Collection '{collection_name}' has no vector named "
+                    f"'{self._embedding_provider.get_vector_name()}'"
+                )
+            return CollectionSchema(
+                vector_name=vector_name,
+                vector_size=vectors_config[vector_name].size,
+                quantized=is_quantized(collection_info, vector_name),
+            )
+        if vectors_config is not None:
+            return CollectionSchema(
+                vector_size=vectors_config.size,
+                quantized=is_quantized(collection_info),
+            )
+        return CollectionSchema()
+
+    @staticmethod
+    def _is_not_found_error(error: Exception) -> bool:
+        """
+        Checks if an error raised by the Qdrant client means that a collection doesn't exist.
+        :param error: The error raised by the client.
+        :return: True if the error is a "not found" error.
+        """
+        if isinstance(error, UnexpectedResponse):
+            return error.status_code == 404
+        # gRPC errors expose the status through `code()`
+        code = getattr(error, "code", None)
+        if callable(code):
+            try:
+                return getattr(code(), "name", None) == "NOT_FOUND"
+            except Exception:
+                return False
+        # Local mode raises a ValueError
+        return isinstance(error, ValueError) and "not found" in str(error).lower()
+
+    async def _upsert(self, collection_name: str, points: List[models.PointStruct]):
+        """
+        Upserts points, recreating the collection once if it was removed behind our back.
+        :param collection_name: The name of the collection.
+        :param points: The points to upsert.
+        """
+        try:
+            await self._client.upsert(collection_name=collection_name, points=points)
+        except Exception as e:
+            if not self._is_not_found_error(e):
+                raise
+            self.invalidate_collection_cache(collection_name)
+            await self._ensure_collection_exists(collection_name)
+            await self._client.upsert(collection_name=collection_name, points=points)
+        finally:
+            # Even a failed upsert may have partially changed the collection
+            self._invalidate_search_cache(collection_name)
+
     async def _ensure_collection_exists(self, collection_name: str):
         """
         Ensures that the collection exists, creating it if necessary.
         :param collection_name: The name of the collection to ensure exists.
         """
-        collection_exists = await self._client.collection_exists(collection_name)
-        if not collection_exists:
-            # Create the collection with the appropriate vector size
-            vector_size = self._embedding_provider.get_vector_size()
+        await self._get_collection_schema(collection_name, create=True)
 
-            # Use the vector name as defined in the embedding provider
-            vector_name = self._embedding_provider.get_vector_name()
-            await self._client.create_collection(
-                collection_name=collection_name,
-                vectors_config={
-                    vector_name: models.VectorParams(
-                        size=vector_size,
-                        distance=models.Distance.COSINE,
-                    )
-                },
-            )
+    async def _create_collection(self, collection_name: str) -> CollectionSchema:
+        """
+        Creates the collection with the vector configuration of the embedding provider
+        and the quantization and storage of the connector.
+        :param collection_name: The name of the collection to create.
+        :return: The schema of the created collection.
+        """
+        # Create the collection with the appropriate vector size
+        vector_size = self._embedding_provider.get_vector_size()
+
+        # Use the vector name as defined in the embedding provider
+        vector_name = self._embedding_provider.get_vector_name()
+        await self._client.create_collection(
+            collection_name=collection_name,
+            vectors_config={vector_name: self._storage.vector_params(vector_size)},
+            quantization_config=create_quantization_config(self._quantization),
+            **self._storage.collection_kwargs(),
+        )
+        return CollectionSchema(
+            vector_name=vector_name,
+            vector_size=vector_size,
+            quantized=self._quantization != QuantizationType.NONE,
+        )
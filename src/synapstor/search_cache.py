@@ -0,0 +1,128 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Tuple
+
+
+class SearchCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    shared: int
+    entries: int
+    max_entries: int
+
+
+class _CachedResult(NamedTuple):
+    expires_at: float
+    generation: int
+    value: Any
+
+
+class SearchResultCache:
+    """
+    A TTL/LRU cache of search results, invalidated per collection by write generations.
+
+    Every write to a collection bumps its generation, and a cached result is only valid
+    for the generation it was computed in. Concurrent lookups of the same key share a
+    single in-flight fetch.
+    :param max_entries: The maximum number of cached results.
+    :param ttl: The time in seconds a result stays valid, to bound staleness caused by
+                writes that don't go through this process.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self._entries: "OrderedDict[Tuple[str, Hashable], _CachedResult]" = (
+            OrderedDict()
+        )
+        self._generations: Dict[str, int] = {}
+        self._in_flight: Dict[Tuple[str, Hashable, int], asyncio.Task] = {}
+
+    def generation(self, collection_name: str) -> int:
+        """Gets the current write generation of a collection."""
+        return self._generations.get(collection_name, 0)
+
+    def invalidate(self, collection_name: str):
+        """Marks all cached results of a collection as stale."""
+        self._generations[collection_name] = self.generation(collection_name) + 1
+
+    async def get_or_fetch(
+        self,
+        collection_name: str,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Returns the cached result for a key, or fetches it.
+        :param collection_name: The collection the result belongs to.
+        :param key: The key identifying the search within the collection.
+        :param fetch: The coroutine function that computes the result on a miss.
+        :return: The search result.
+        """
+        cache_key = (collection_name, key)
+        generation = self.generation(collection_name)
+
+        cached = self._entries.get(cache_key)
+        if cached is not None:
+            if cached.generation == generation and cached.expires_at > time.monotonic():
+                self.hits += 1
+                self._entries.move_to_end(cache_key)
+                return cached.value
+            del self._entries[cache_key]
+
+        flight_key = (collection_name, key, generation)
+        task = self._in_flight.get(flight_key)
+        if task is not None:
+            self.shared += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(fetch())
+            self._in_flight[flight_key] = task
+            task.add_done_callback(
+                lambda done: self._on_fetched(flight_key, cache_key, done)
+            )
+
+        # Shielded, so a cancelled caller doesn't cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    def cache_info(self) -> SearchCacheInfo:
+        """Returns the counters and the current size of the cache."""
+        return SearchCacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            shared=self.shared,
+            entries=len(self._entries),
+            max_entries=self.max_entries,
+        )
+
+    def clear(self):
+        """Removes all cached results."""
+        self._entries.clear()
+
+    def _on_fetched(
+        self,
+        flight_key: Tuple[str, Hashable, int],
+        cache_key: Tuple[str, Hashable],
+        task: asyncio.Task,
+    ):
+        """Stores the result of a finished fetch, unless the collection changed meanwhile."""
+        self._in_flight.pop(flight_key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        collection_name, _, generation = flight_key
+        if generation != self.generation(collection_name) or self.max_entries <= 0:
+            return
+
+        self._entries[cache_key] = _CachedResult(
+            expires_at=time.monotonic() + self.ttl,
+            generation=generation,
+            value=task.result(),
+        )
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
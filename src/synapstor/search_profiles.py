@@ -0,0 +1,63 @@
+from enum import Enum
+from typing import Dict, NamedTuple, Optional
+
+from qdrant_client import models
+
+from synapstor.quantization import DEFAULT_OVERSAMPLING, create_search_params
+
+
+class SearchProfile(Enum):
+    """
+    Named tradeoffs between the latency and the accuracy of a search.
+    """
+
+    FAST = "fast"
+    BALANCED = "balanced"
+    EXACT = "exact"
+
+
+class SearchOptions(NamedTuple):
+    """
+    How Qdrant looks for the nearest vectors of a query.
+    :param hnsw_ef: The size of the candidate list of the HNSW search, None uses the default of the collection.
+    :param exact: Whether to compare the query with every vector instead of using the HNSW index.
+    :param oversampling: How many candidates are fetched per result on a quantized collection.
+    :param rescore: Whether the candidates of a quantized collection are rescored with the original vectors.
+    """
+
+    hnsw_ef: Optional[int] = None
+    exact: bool = False
+    oversampling: Optional[float] = None
+    rescore: Optional[bool] = None
+
+    def to_search_params(self, quantized: bool) -> Optional[models.SearchParams]:
+        """
+        Builds the search parameters sent to Qdrant.
+        :param quantized: Whether the vectors of the collection are quantized.
+        :return: The search parameters, or None if the defaults of the collection are used.
+        """
+        quantization = None
+        if quantized and self.exact:
+            # An exact search compares the original vectors
+            quantization = models.QuantizationSearchParams(ignore=True)
+        elif quantized and (self.oversampling is not None or self.rescore is not None):
+            quantization = create_search_params(
+                self.oversampling, self.rescore
+            ).quantization
+
+        if self.hnsw_ef is None and not self.exact and quantization is None:
+            return None
+        return models.SearchParams(
+            hnsw_ef=self.hnsw_ef, exact=self.exact, quantization=quantization
+        )
+
+
+# A small candidate list and no rescoring for interactive loops, a larger list and
+# rescoring by default, and a full scan of the original vectors for audits
+SEARCH_PROFILES: Dict[SearchProfile, SearchOptions] = {
+    SearchProfile.FAST: SearchOptions(hnsw_ef=32, oversampling=1.0, rescore=False),
+    SearchProfile.BALANCED: SearchOptions(
+        hnsw_ef=128, oversampling=DEFAULT_OVERSAMPLING, rescore=True
+    ),
+    SearchProfile.EXACT: SearchOptions(exact=True),
+}
@@ -4,6 +4,10 @@ from pydantic import Field
 from pydantic_settings import BaseSettings
 
 from synapstor.embeddings.types import EmbeddingProviderType
+from synapstor.quantization import DEFAULT_OVERSAMPLING, QuantizationType
+from synapstor.search_profiles import SearchProfile
+from synapstor.storage import CollectionStorage
+from synapstor.transport import ClientTransport
 
 DEFAULT_TOOL_STORE_DESCRIPTION = (
     "Store memory for later use, when you are asked to remember something."
@@ -44,6 +48,39 @@ class EmbeddingProviderSettings(BaseSettings):
         default="sentence-transformers/all-MiniLM-L6-v2",
         validation_alias="EMBEDDING_MODEL",
     )
+    vector_size: Optional[int] = Field(
+        default=None, validation_alias="EMBEDDING_VECTOR_SIZE"
+    )
+    threads: int = Field(default=1, validation_alias="EMBEDDING_THREADS")
+    intra_op_threads: Optional[int] = Field(
+        default=None, validation_alias="EMBEDDING_INTRA_OP_THREADS"
+    )
+    processes: int = Field(default=2, validation_alias="EMBEDDING_PROCESSES")
+    query_cache_enabled: bool = Field(
+        default=True, validation_alias="EMBEDDING_QUERY_CACHE"
+    )
+    query_cache_size: int = Field(
+        default=1024, validation_alias="EMBEDDING_QUERY_CACHE_SIZE"
+    )
+    query_cache_max_mb: float = Field(
+        default=16.0, validation_alias="EMBEDDING_QUERY_CACHE_MAX_MB"
+    )
+    query_batch_size: int = Field(
+        default=32, validation_alias="EMBEDDING_QUERY_BATCH_SIZE"
+    )
+    query_batch_window_ms: float = Field(
+        default=0.0, validation_alias="EMBEDDING_QUERY_BATCH_WINDOW_MS"
+    )
+    document_cache_enabled: bool = Field(
+        default=True, validation_alias="EMBEDDING_DOCUMENT_CACHE"
+    )
+    document_cache_dir: str = Field(
+        default="~/.synapstor/embeddings",
+        validation_alias="EMBEDDING_DOCUMENT_CACHE_DIR",
+    )
+    document_cache_max_mb: float = Field(
+        default=1024.0, validation_alias="EMBEDDING_DOCUMENT_CACHE_MAX_MB"
+    )
 
 
 class QdrantSettings(BaseSettings):
@@ -63,6 +100,65 @@ class QdrantSettings(BaseSettings):
         default=None, validation_alias="QDRANT_SEARCH_LIMIT"
     )
     read_only: bool = Field(default=False, validation_alias="QDRANT_READ_ONLY")
+    prefer_grpc: bool = Field(default=False, validation_alias="QDRANT_PREFER_GRPC")
+    grpc_port: int = Field(default=6334, validation_alias="QDRANT_GRPC_PORT")
+    timeout: Optional[int] = Field(default=None, validation_alias="QDRANT_TIMEOUT")
+    pool_size: Optional[int] = Field(default=None, validation_alias="QDRANT_POOL_SIZE")
+    keepalive_connections: Optional[int] = Field(
+        default=None, validation_alias="QDRANT_KEEPALIVE_CONNECTIONS"
+    )
+    keepalive_expiry: Optional[float] = Field(
+        default=None, validation_alias="QDRANT_KEEPALIVE_EXPIRY"
+    )
+    search_cache_size: int = Field(
+        default=256, validation_alias="QDRANT_SEARCH_CACHE_SIZE"
+    )
+    search_cache_ttl: float = Field(
+        default=10.0, validation_alias="QDRANT_SEARCH_CACHE_TTL"
+    )
+    quantization: QuantizationType = Field(
+        default=QuantizationType.NONE, validation_alias="QDRANT_QUANTIZATION"
+    )
+    search_oversampling: float = Field(
+        default=DEFAULT_OVERSAMPLING, validation_alias="QDRANT_SEARCH_OVERSAMPLING"
+    )
+    search_rescore: bool = Field(default=True, validation_alias="QDRANT_SEARCH_RESCORE")
+    search_profile: Optional[SearchProfile] = Field(
+        default=None, validation_alias="QDRANT_SEARCH_PROFILE"
+    )
+    score_threshold: Optional[float] = Field(
+        default=None, validation_alias="QDRANT_SEARCH_SCORE_THRESHOLD"
+    )
+    vectors_on_disk: bool = Field(
+        default=False, validation_alias="QDRANT_VECTORS_ON_DISK"
+    )
+    payload_on_disk: bool = Field(
+        default=False, validation_alias="QDRANT_PAYLOAD_ON_DISK"
+    )
+    hnsw_on_disk: bool = Field(default=False, validation_alias="QDRANT_HNSW_ON_DISK")
+
+    def get_client_transport(self) -> ClientTransport:
+        """
+        Gets how the Qdrant clients talk to a remote server.
+        """
+        return ClientTransport(
+            prefer_grpc=self.prefer_grpc,
+            grpc_port=self.grpc_port,
+            timeout=self.timeout,
+            pool_size=self.pool_size,
+            keepalive_connections=self.keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def get_collection_storage(self) -> CollectionStorage:
+        """
+        Gets where Qdrant keeps the data of the collections created by synapstor.
+        """
+        return CollectionStorage(
+            vectors_on_disk=self.vectors_on_disk,
+            payload_on_disk=self.payload_on_disk,
+            hnsw_on_disk=self.hnsw_on_disk,
+        )
 
     def get_qdrant_location(self) -> Optional[str]:
         """
@@ -0,0 +1,45 @@
+from typing import Any, Dict
+
+from pydantic import BaseModel
+from qdrant_client import models
+
+
+class CollectionStorage(BaseModel):
+    """
+    Where Qdrant keeps the data of the collections created by synapstor.
+
+    Data on disk is memory-mapped, so it only takes RAM while the pages are cached,
+    and searches on a cold collection read it from disk. Options that are not set
+    keep the defaults of the Qdrant server.
+    :param vectors_on_disk: Whether the original vectors are stored on disk.
+    :param payload_on_disk: Whether the payload, the documents and their metadata, is stored on disk.
+    :param hnsw_on_disk: Whether the HNSW graph is stored on disk.
+    """
+
+    vectors_on_disk: bool = False
+    payload_on_disk: bool = False
+    hnsw_on_disk: bool = False
+
+    def vector_params(self, size: int) -> models.VectorParams:
+        """
+        Builds the parameters of a cosine vector of the collection.
+        :param size: The size of the vector.
+        :return: The vector parameters.
+        """
+        return models.VectorParams(
+            size=size,
+            distance=models.Distance.COSINE,
+            on_disk=True if self.vectors_on_disk else None,
+        )
+
+    def collection_kwargs(self) -> Dict[str, Any]:
+        """
+        Gets the storage arguments of `create_collection`, besides the vectors.
+        :return: The keyword arguments.
+        """
+        return {
+            "on_disk_payload": True if self.payload_on_disk else None,
+            "hnsw_config": (
+                models.HnswConfigDiff(on_disk=True) if self.hnsw_on_disk else None
+            ),
+        }
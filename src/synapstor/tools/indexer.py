@@ -13,15 +13,34 @@ Example:
 """
 
 import argparse
+import asyncio
+import contextlib
 import os
 import sys
 from pathlib import Path
 import time
-from typing import Dict, List, Any, Optional
-import concurrent.futures
+from typing import Dict, Iterable, Iterator, List, Any, NamedTuple, Optional, Set, Tuple
 import logging
+import threading
 from tqdm import tqdm
 import hashlib
+import json
+import queue
+import re
+import stat
+
+from synapstor.embeddings.base import EmbeddingProvider, vectors_to_lists
+from synapstor.embeddings.factory import create_embedding_provider
+from synapstor.embeddings.types import EmbeddingProviderType
+from synapstor.quantization import (
+    QuantizationType,
+    create_quantization_config,
+    create_search_params,
+    is_quantized,
+)
+from synapstor.settings import EmbeddingProviderSettings, QdrantSettings
+from synapstor.storage import CollectionStorage
+from synapstor.tools.observador import criar_observador
 
 # Logging configuration - DISABLES LOGS by default
 # This prevents messages from appearing during normal execution
@@ -106,7 +125,7 @@ def verificar_dependencias():
     """Checks necessary dependencies and installs them if not present"""
     deps = {
         "qdrant-client": "qdrant_client",
-        "sentence-transformers": "sentence_transformers",
+        "fastembed": "fastembed",
         "pathspec": "pathspec",
         "tqdm": "tqdm",
     }
@@ -139,9 +158,8 @@ def verificar_dependencias():
 # Silently imports libraries
 def importar_bibliotecas():
     try:
-        global QdrantClient, models, SentenceTransformer, pathspec
+        global QdrantClient, models, pathspec
         from qdrant_client import QdrantClient, models
-        from sentence_transformers import SentenceTransformer
         import pathspec
 
         return True
@@ -237,7 +255,13 @@ BINARY_EXTENSIONS = {
 
 
 class GitIgnoreFilter:
-    """Filters files based on .gitignore rules"""
+    """
+    Filters files based on .gitignore rules
+
+    The patterns of each .gitignore are compiled once and cached per directory.
+    Nested .gitignore files are honored: their patterns are relative to their
+    directory and take precedence over the ones of the parent directories.
+    """
 
     def __init__(self, projeto_path: Path):
         """Initializes the filter with the project path"""
@@ -246,6 +270,11 @@ class GitIgnoreFilter:
         # Load patterns from .gitignore if available
         self.patterns = self._carregar_gitignore(projeto_path)
 
+        # Compiled patterns by directory, None for directories without .gitignore
+        self._padroes_por_diretorio: Dict[Path, Optional[List[Any]]] = {
+            projeto_path: self._compilar(self.patterns)
+        }
+
     def _carregar_gitignore(self, projeto_path: Path) -> List[str]:
         """Loads the .gitignore file using pathspec"""
         gitignore_path = projeto_path / ".gitignore"
@@ -257,34 +286,92 @@ class GitIgnoreFilter:
         # Add patterns from local .gitignore, if it exists
         if gitignore_path.exists():
             print(f"✅ Using configurations from .gitignore file: {gitignore_path}")
-            try:
-                with open(gitignore_path, "r", encoding="utf-8") as f:
-                    gitignore_content = f.read()
-
-                # Add each non-empty line that isn't a comment
-                for line in gitignore_content.splitlines():
-                    line = line.strip()
-                    if line and not line.startswith("#"):
-                        patterns.append(line)
-            except Exception as e:
-                print(f"⚠️ Error reading .gitignore: {e}")
+            patterns.extend(self._ler_padroes(gitignore_path))
         else:
             print("ℹ️ .gitignore file not found, using default patterns.")
 
         return patterns
 
-    def deve_ignorar(self, path: Path) -> bool:
-        """Checks if a path should be ignored according to the rules"""
+    @staticmethod
+    def _ler_padroes(gitignore_path: Path) -> List[str]:
+        """Reads the non-empty lines that aren't comments of a .gitignore file"""
+        patterns = []
+        try:
+            with open(gitignore_path, "r", encoding="utf-8") as f:
+                gitignore_content = f.read()
+
+            for line in gitignore_content.splitlines():
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    patterns.append(line)
+        except Exception as e:
+            print(f"⚠️ Error reading {gitignore_path}: {e}")
+        return patterns
+
+    @staticmethod
+    def _compilar(patterns: List[str]) -> List[Any]:
+        """Compiles the patterns once, keeping only the ones that can match"""
+        spec = pathspec.PathSpec.from_lines(
+            pathspec.patterns.GitWildMatchPattern, patterns
+        )
+        return [pattern for pattern in spec.patterns if pattern.include is not None]
+
+    def _padroes_do_diretorio(self, diretorio: Path) -> Optional[List[Any]]:
+        """Gets the compiled patterns of the .gitignore of a directory, if any"""
+        try:
+            return self._padroes_por_diretorio[diretorio]
+        except KeyError:
+            pass
+
+        padroes = None
+        gitignore_path = diretorio / ".gitignore"
+        if gitignore_path.is_file():
+            console.print(f"✅ Using nested .gitignore file: {gitignore_path}")
+            padroes = self._compilar(self._ler_padroes(gitignore_path)) or None
+        self._padroes_por_diretorio[diretorio] = padroes
+        return padroes
+
+    def deve_ignorar_com_diretorios(self, path: Path) -> bool:
+        """Checks if a file or any of its parent directories should be ignored"""
+        try:
+            partes = path.relative_to(self.projeto_path).parts
+        except ValueError:
+            return False
+        diretorio = self.projeto_path
+        for parte in partes[:-1]:
+            diretorio = diretorio / parte
+            if self.deve_ignorar(diretorio, eh_diretorio=True):
+                return True
+        return self.deve_ignorar(path)
+
+    def deve_ignorar(self, path: Path, eh_diretorio: bool = False) -> bool:
+        """
+        Checks if a path should be ignored according to the rules
+
+        :param path: The path of the file or directory.
+        :param eh_diretorio: Whether the path is a directory, so patterns ending
+                             with a slash also match it.
+        """
         try:
             # Convert to a path relative to the project
-            rel_path = path.relative_to(self.projeto_path)
-            str_path = str(rel_path).replace(os.sep, "/")
+            partes = path.relative_to(self.projeto_path).parts
+            if not partes:
+                return False
 
-            # Use pathspec to check if the file should be ignored
-            spec = pathspec.PathSpec.from_lines(
-                pathspec.patterns.GitWildMatchPattern, self.patterns
-            )
-            return spec.match_file(str_path)
+            # The deepest .gitignore with a matching pattern decides
+            diretorio = path.parent
+            for nivel in range(len(partes) - 1, -1, -1):
+                padroes = self._padroes_do_diretorio(diretorio)
+                if padroes:
+                    str_path = "/".join(partes[nivel:])
+                    if eh_diretorio:
+                        str_path += "/"
+                    # Like in git, the last matching pattern wins
+                    for pattern in reversed(padroes):
+                        if pattern.match_file(str_path):
+                            return pattern.include
+                diretorio = diretorio.parent
+            return False
         except ValueError:
             # If the path is not relative to the project, don't ignore
             return False
@@ -293,6 +380,230 @@ class GitIgnoreFilter:
             return True  # For safety, ignore in case of error
 
 
+# Default directory of the manifests of incremental indexing
+DEFAULT_MANIFEST_DIR = os.path.expanduser("~/.synapstor/manifests")
+
+# Bytes at the beginning of a file checked to detect binaries
+TAMANHO_AMOSTRA_BINARIO = 4096
+
+# Printable ASCII bytes and tab, the rest count as non-text when detecting binaries
+BYTES_DE_TEXTO = bytes(range(9, 127))
+
+# Conservative number of characters per token, to estimate the size of a batch and of
+# a chunk. Code has many short tokens (symbols, indentation, identifiers split in
+# pieces), so chunks estimated with the ~4 of English prose overflow the model window
+CARACTERES_POR_TOKEN = 2.5
+
+# The embedding models truncate longer documents, so they cost no more than this
+MAX_TOKENS_POR_DOCUMENTO = 512
+
+# Default size of the chunks of a file and of the overlap between them, in tokens.
+# The default model only reads the first 256 tokens of a document
+TOKENS_POR_TRECHO = 256
+SOBREPOSICAO_TRECHO = 32
+
+# Whitespace, where a chunk preferably starts
+PADRAO_ESPACO = re.compile(r"\s")
+
+
+def dividir_em_trechos(
+    texto: str, tamanho: int, sobreposicao: int
+) -> List[Tuple[int, int]]:
+    """
+    Splits a text in overlapping windows and returns their start and end offsets.
+
+    A window ends at a line break, or else at a space, in its second half when there
+    is one, and the next window starts up to `sobreposicao` characters before that,
+    at the beginning of a word.
+
+    :param texto: The text to split.
+    :param tamanho: The maximum number of characters of a window.
+    :param sobreposicao: The number of characters repeated between two windows.
+    """
+    tamanho = max(1, tamanho)
+    trechos = []
+    inicio = 0
+    while True:
+        fim = min(inicio + tamanho, len(texto))
+        if fim < len(texto):
+            metade = inicio + tamanho // 2
+            corte = texto.rfind("\n", metade, fim)
+            if corte < 0:
+                corte = texto.rfind(" ", metade, fim)
+            if corte >= 0:
+                fim = corte + 1
+        trechos.append((inicio, fim))
+        if fim >= len(texto):
+            return trechos
+
+        proximo = max(fim - sobreposicao, inicio + 1)
+        if proximo < fim:
+            espaco = PADRAO_ESPACO.search(texto, proximo - 1, fim)
+            if espaco:
+                proximo = min(espaco.end(), fim)
+        inicio = proximo
+
+
+def gerar_id_trecho(id_arquivo: str, indice: int) -> str:
+    """
+    Generates the deterministic ID of a chunk from the ID of its file, which comes
+    from the project and the path, and the index of the chunk. The first chunk keeps
+    the ID of the file, so the points indexed before chunking are replaced in place.
+    """
+    if indice == 0:
+        return id_arquivo
+    return hashlib.md5(f"{id_arquivo}#{indice}".encode("utf-8")).hexdigest()
+
+
+class DocumentoPreparado(NamedTuple):
+    """A file read and ready to be embedded"""
+
+    caminho_relativo: str
+    conteudo: str
+    metadados: Dict[str, Any]
+    point_id: str
+    tamanho: int
+    mtime_ns: int
+    hash_conteudo: str
+    # ID of the point of the previous version of the file, if it was indexed
+    id_anterior: Optional[str]
+    # Start and end offsets of the chunks of the content
+    trechos: List[Tuple[int, int]]
+    # Number of chunks of the previous version of the file, if known
+    trechos_anteriores: Optional[int]
+
+    def texto_trecho(self, indice: int) -> str:
+        """Gets the text of a chunk"""
+        inicio, fim = self.trechos[indice]
+        return self.conteudo[inicio:fim]
+
+
+# Maximum number of embedded batches waiting to be sent to Qdrant
+TAMANHO_FILA_ENVIO = 2
+
+# Marks the end of the items of a pipeline queue
+FIM_DA_FILA = object()
+
+# Path used to derive the ID of the point that records the last indexed commit
+MARCADOR_COMMIT_GIT = "synapstor:ultimo-commit-git"
+
+# Maximum number of point IDs sent in a single delete request
+TAMANHO_LOTE_REMOCAO = 1000
+
+
+class ManifestoIndexacao:
+    """
+    Local record of the files indexed for a project in a collection
+
+    For each file, keyed by its path relative to the project, it stores the size,
+    the modification time, the hash of the indexed content, the file ID and the
+    number of chunks, so a new run only embeds new or changed files and can delete
+    the points of removed files and the chunks left over when a file shrinks.
+    """
+
+    VERSAO = 1
+
+    def __init__(self, caminho: Path, projeto: str, colecao: str):
+        self.caminho = caminho
+        self.projeto = projeto
+        self.colecao = colecao
+        self.arquivos: Dict[str, Dict[str, Any]] = {}
+        # Files are registered by the indexing threads
+        self._lock = threading.Lock()
+
+    @classmethod
+    def para(
+        cls, diretorio: Path, projeto: str, colecao: str, qdrant_url: str
+    ) -> "ManifestoIndexacao":
+        """Creates the manifest of a project in a collection of a Qdrant server"""
+        nome = re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{projeto}-{colecao}")
+        # The server is part of the key, the same collection may exist in several
+        sufixo = hashlib.md5(
+            f"{qdrant_url}:{projeto}:{colecao}".encode("utf-8")
+        ).hexdigest()[:8]
+        return cls(diretorio / f"{nome}-{sufixo}.json", projeto, colecao)
+
+    def carregar(self):
+        """Loads the manifest from disk, starting empty if it doesn't exist"""
+        self.arquivos = {}
+        try:
+            with open(self.caminho, "r", encoding="utf-8") as f:
+                dados = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Error reading the manifest {self.caminho}, ignoring it: {e}")
+            return
+
+        if dados.get("versao") == self.VERSAO:
+            self.arquivos = dados.get("arquivos", {})
+
+    def salvar(self):
+        """Writes the manifest to disk atomically"""
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        temporario = self.caminho.with_suffix(".tmp")
+        with self._lock:
+            dados = {
+                "versao": self.VERSAO,
+                "projeto": self.projeto,
+                "colecao": self.colecao,
+                "arquivos": self.arquivos,
+            }
+            with open(temporario, "w", encoding="utf-8") as f:
+                json.dump(dados, f)
+        os.replace(temporario, self.caminho)
+
+    def limpar(self):
+        """Forgets all the files, so the next run indexes everything"""
+        with self._lock:
+            self.arquivos = {}
+
+    def obter(self, caminho_relativo: str) -> Optional[Dict[str, Any]]:
+        """Gets the record of a file, if it was indexed"""
+        return self.arquivos.get(caminho_relativo)
+
+    def esta_atualizado(
+        self, caminho_relativo: str, tamanho: int, mtime_ns: int
+    ) -> bool:
+        """Checks if a file is unchanged since it was indexed, by size and mtime"""
+        registro = self.arquivos.get(caminho_relativo)
+        return (
+            registro is not None
+            and registro["tamanho"] == tamanho
+            and registro["mtime_ns"] == mtime_ns
+        )
+
+    def registrar(
+        self,
+        caminho_relativo: str,
+        tamanho: int,
+        mtime_ns: int,
+        hash_conteudo: str,
+        point_id: str,
+        trechos: int = 1,
+    ):
+        """Records an indexed file"""
+        with self._lock:
+            self.arquivos[caminho_relativo] = {
+                "tamanho": tamanho,
+                "mtime_ns": mtime_ns,
+                "hash": hash_conteudo,
+                "id": point_id,
+                "trechos": trechos,
+            }
+
+    def caminhos(self) -> List[str]:
+        """Gets the paths of all the indexed files"""
+        with self._lock:
+            return list(self.arquivos)
+
+    def remover(self, caminhos_relativos: List[str]):
+        """Removes the records of files"""
+        with self._lock:
+            for caminho_relativo in caminhos_relativos:
+                self.arquivos.pop(caminho_relativo, None)
+
+
 class IndexadorDireto:
     """Class for directly indexing projects in Qdrant Cloud"""
 
@@ -303,20 +614,53 @@ class IndexadorDireto:
         collection_name: str = "synapstor",
         qdrant_url: Optional[str] = None,
         qdrant_api_key: Optional[str] = None,
-        embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+        embedding_model: Optional[str] = None,
         max_workers: int = 4,
-        tamanho_lote: int = 10,
+        tamanho_lote: int = 32,
+        tokens_por_lote: int = 16384,
+        tokens_por_trecho: int = TOKENS_POR_TRECHO,
+        sobreposicao_trecho: int = SOBREPOSICAO_TRECHO,
         tamanho_maximo_arquivo: int = 5 * 1024 * 1024,  # 5MB by default
-        vector_name: str = "fast-all-MiniLM-L6-v2",  # Default vector name
+        vector_name: Optional[str] = None,  # By default, the provider's vector name
+        incremental: bool = True,
+        diretorio_manifesto: Optional[str] = None,
+        reindexar_tudo: bool = False,
+        carga_em_massa: bool = False,
+        quantizacao: Optional[str] = None,
+        armazenamento: Optional[CollectionStorage] = None,
     ):
         # Validate and configure paths
         self.nome_projeto = nome_projeto
         self.caminho_projeto = Path(caminho_projeto)
         self.collection_name = collection_name
         self.max_workers = max_workers
-        self.tamanho_lote = tamanho_lote
+        # Maximum number of documents and of estimated tokens per embedding batch
+        self.tamanho_lote = max(1, tamanho_lote)
+        self.tokens_por_lote = max(1, tokens_por_lote)
+        # Size of the chunks of a file and of the overlap between them, in characters
+        self.tamanho_trecho = int(max(1, tokens_por_trecho) * CARACTERES_POR_TOKEN)
+        self.sobreposicao_trecho = min(
+            int(max(0, sobreposicao_trecho) * CARACTERES_POR_TOKEN),
+            self.tamanho_trecho // 2,
+        )
         self.tamanho_maximo_arquivo = tamanho_maximo_arquivo
-        self.vector_name = vector_name
+        # Index every file again, but still keep the manifest up to date
+        self.reindexar_tudo = reindexar_tudo
+        # Pause the HNSW indexing of the collection while indexing
+        self.carga_em_massa = carga_em_massa
+        # Quantization of the vectors, if the collection is created by the indexer,
+        # and how searches use it
+        self.qdrant_settings = QdrantSettings()
+        self.quantizacao = (
+            QuantizationType(quantizacao)
+            if quantizacao
+            else self.qdrant_settings.quantization
+        )
+        self.colecao_quantizada = False
+        # Where Qdrant keeps the vectors, documents and HNSW graph of a new collection
+        self.armazenamento = (
+            armazenamento or self.qdrant_settings.get_collection_storage()
+        )
         self.verbose = console.verbose  # Add the verbose attribute
 
         # Initialize Qdrant client
@@ -330,30 +674,38 @@ class IndexadorDireto:
             if not qdrant_api_key:
                 qdrant_api_key = os.environ.get("QDRANT_API_KEY", None)
 
-            # Initialize the client
+            # Initialize the client, with the protocol and pool of the environment
+            transporte = self.qdrant_settings.get_client_transport()
             if qdrant_api_key:
                 self.qdrant_client = QdrantClient(
-                    url=qdrant_url, api_key=qdrant_api_key
+                    url=qdrant_url, api_key=qdrant_api_key, **transporte.client_kwargs()
                 )
             else:
-                self.qdrant_client = QdrantClient(url=qdrant_url)
+                self.qdrant_client = QdrantClient(
+                    url=qdrant_url, **transporte.client_kwargs()
+                )
 
             print(f"✅ Connected to Qdrant server: {qdrant_url}")
+            if transporte.prefer_grpc:
+                print(f"📡 Using gRPC on port {transporte.grpc_port}")
         except Exception as e:
             print(f"❌ Failed to connect to Qdrant: {e}")
             raise ValueError(f"Could not connect to Qdrant server: {e}")
 
-        # Initialize the embeddings model
+        # Initialize the embedding provider, the same one used by the MCP server,
+        # so the vectors match what the server expects when searching
         try:
-            from sentence_transformers import SentenceTransformer
-
-            print(f"🧠 Loading embeddings model: {embedding_model}")
-            self.embedding_model = SentenceTransformer(embedding_model)
+            self.embedding_provider = self._criar_provedor_embeddings(embedding_model)
+            print(f"🧠 Loading embeddings model: {self.embedding_settings.model_name}")
+            self.embedding_provider.warm_up()
             print("✅ Embeddings model successfully loaded")
         except Exception as e:
             print(f"❌ Failed to load embeddings model: {e}")
             raise ValueError(f"Could not load the embeddings model: {e}")
 
+        # Use the provider's vector name unless another one was given
+        self.vector_name = vector_name or self.embedding_provider.get_vector_name()
+
         # Initialize the file filter based on .gitignore
         self.gitignore_filter = GitIgnoreFilter(self.caminho_projeto)
 
@@ -362,6 +714,13 @@ class IndexadorDireto:
         self.arquivos_ignorados = 0
         self.arquivos_com_erro = 0
         self.total_tamanho = 0
+        self.arquivos_inalterados = 0
+        self.arquivos_removidos = 0
+        self._lock_estatisticas = threading.Lock()
+        # Points of files indexed before under another ID, deleted after indexing
+        self._ids_obsoletos: List[str] = []
+        # Files with a chunk that couldn't be stored, not recorded as indexed
+        self._arquivos_com_falha: Set[str] = set()
 
         # Check if the directory exists
         if not self.caminho_projeto.exists() or not self.caminho_projeto.is_dir():
@@ -370,8 +729,63 @@ class IndexadorDireto:
             )
 
         # Ensure the collection exists
+        self.colecao_criada = False
         self._garantir_colecao()
 
+        # Manifest of the files already indexed, to only index what changed
+        self.manifesto: Optional[ManifestoIndexacao] = None
+        if incremental:
+            self.manifesto = ManifestoIndexacao.para(
+                Path(diretorio_manifesto or DEFAULT_MANIFEST_DIR),
+                nome_projeto,
+                collection_name,
+                qdrant_url,
+            )
+            self.manifesto.carregar()
+            # The points of a new collection don't exist, whatever the manifest says
+            if self.colecao_criada:
+                self.manifesto.limpar()
+
+    def _criar_provedor_embeddings(
+        self, embedding_model: Optional[str]
+    ) -> EmbeddingProvider:
+        """Creates the embedding provider from the environment settings"""
+        settings = EmbeddingProviderSettings()
+        # The query cache and batching only help a long-running server
+        overrides: Dict[str, Any] = {
+            "query_cache_enabled": False,
+            "query_batch_size": 1,
+        }
+        if embedding_model:
+            overrides["model_name"] = embedding_model
+        if settings.provider_type == EmbeddingProviderType.QDRANT:
+            # Whole projects are embedded here in batches, with the model of the server
+            overrides["provider_type"] = EmbeddingProviderType.FASTEMBED
+        self.embedding_settings = settings.model_copy(update=overrides)
+        provider = create_embedding_provider(self.embedding_settings)
+
+        # The providers are asynchronous, so they run in an event loop of their own,
+        # shared by all the indexing threads
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(
+            target=self._loop.run_forever, name="synapstor-indexer-loop", daemon=True
+        ).start()
+        return provider
+
+    def _gerar_embeddings(self, textos: List[str]) -> List[List[float]]:
+        """Generates the embeddings of the texts, as lists of floats"""
+        future = asyncio.run_coroutine_threadsafe(
+            self.embedding_provider.embed_documents(textos), self._loop
+        )
+        return vectors_to_lists(future.result())
+
+    def _gerar_embedding_consulta(self, consulta: str):
+        """Generates the embedding of a search query"""
+        future = asyncio.run_coroutine_threadsafe(
+            self.embedding_provider.embed_query(consulta), self._loop
+        )
+        return future.result()
+
     def _garantir_colecao(self):
         """Ensures the collection exists in Qdrant, creating it if necessary"""
         try:
@@ -383,24 +797,38 @@ class IndexadorDireto:
             if not collection_exists:
                 print(f"🔍 Creating collection: {self.collection_name}")
 
-                # Get the embedding dimension from the model
-                vector_size = self.embedding_model.get_sentence_embedding_dimension()
+                # Get the embedding dimension from the provider
+                vector_size = self.embedding_provider.get_vector_size()
 
                 # Create the collection with the correctly named vector
                 vector_config = {
-                    self.vector_name: models.VectorParams(
-                        size=vector_size,
-                        distance=models.Distance.COSINE,
-                    )
+                    self.vector_name: self.armazenamento.vector_params(vector_size)
                 }
 
                 self.qdrant_client.create_collection(
                     collection_name=self.collection_name,
                     vectors_config=vector_config,
+                    quantization_config=create_quantization_config(self.quantizacao),
+                    **self.armazenamento.collection_kwargs(),
                 )
+                self.colecao_criada = True
+                self.colecao_quantizada = self.quantizacao != QuantizationType.NONE
                 print(
                     f"✅ Collection '{self.collection_name}' successfully created using vector name '{self.vector_name}'!"
                 )
+                if self.colecao_quantizada:
+                    print(f"🗜️ Vectors quantized as {self.quantizacao.value}")
+                no_disco = [
+                    nome
+                    for nome, ativo in (
+                        ("vectors", self.armazenamento.vectors_on_disk),
+                        ("payload", self.armazenamento.payload_on_disk),
+                        ("HNSW graph", self.armazenamento.hnsw_on_disk),
+                    )
+                    if ativo
+                ]
+                if no_disco:
+                    print(f"💾 Stored on disk: {', '.join(no_disco)}")
             else:
                 print(f"✅ Collection '{self.collection_name}' already exists.")
                 # Get the collection configuration to get the vector name
@@ -409,6 +837,26 @@ class IndexadorDireto:
             print(f"❌ Error checking or creating collection: {e}")
             raise ValueError(f"Could not check or create the collection: {e}")
 
+        self._criar_indices_trechos()
+
+    def _criar_indices_trechos(self):
+        """Indexes the fields used to find the chunks of a file, when deleting them"""
+        campos = {
+            "metadata.arquivo_pai": models.PayloadSchemaType.KEYWORD,
+            "metadata.trecho_indice": models.PayloadSchemaType.INTEGER,
+        }
+        for campo, tipo in campos.items():
+            try:
+                self.qdrant_client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=campo,
+                    field_schema=tipo,
+                )
+            except Exception as e:
+                # The deletes still work without the index, only slower
+                if self.verbose:
+                    print(f"⚠️ Could not index the field {campo}: {e}")
+
     def _obter_configuracao_colecao(self):
         """Gets the existing collection configuration to determine the vector name"""
         try:
@@ -425,23 +873,26 @@ class IndexadorDireto:
                 and hasattr(colecao_info.config, "params")
                 and hasattr(colecao_info.config.params, "vectors")
             ):
-                # If the configuration has multiple vectors, get the first one
                 vector_config = colecao_info.config.params.vectors
                 if isinstance(vector_config, dict) and vector_config:
-                    # Get the first vector name from the keys
-                    self.vector_name = next(iter(vector_config.keys()))
+                    # Prefer the vector name in use, otherwise get the first one
+                    if self.vector_name not in vector_config:
+                        self.vector_name = next(iter(vector_config.keys()))
                     print(f"✅ Using existing vector name: {self.vector_name}")
+                    self.colecao_quantizada = is_quantized(
+                        colecao_info, self.vector_name
+                    )
                     return
 
-            # If can't determine, use the default
-            self.vector_name = "fast-all-minilm-l6-v2"
+            # If can't determine, use the provider's vector name
+            self.vector_name = self.embedding_provider.get_vector_name()
             print(
                 f"⚠️ Could not determine the vector name. Using default: {self.vector_name}"
             )
 
         except Exception as e:
-            # In case of error, use the default
-            self.vector_name = "fast-all-minilm-l6-v2"
+            # In case of error, use the provider's vector name
+            self.vector_name = self.embedding_provider.get_vector_name()
             print(
                 f"⚠️ Error getting collection configuration: {e}. Using default vector name: {self.vector_name}"
             )
@@ -483,93 +934,57 @@ class IndexadorDireto:
         except Exception as e:
             print(f"  Error printing detailed information: {e}")
 
-    def _eh_arquivo_binario(self, caminho: Path) -> bool:
-        """Checks if a file is binary through multiple heuristics"""
-        # 1. Check by extension
-        extensao = caminho.suffix.lower()[1:] if caminho.suffix else ""
-        if extensao in BINARY_EXTENSIONS:
-            return True
-
-        # 2. Check by size (very large files are considered binary)
-        try:
-            if caminho.stat().st_size > self.tamanho_maximo_arquivo:
-                return True
-        except Exception:
-            return True  # In case of error checking size, assume binary
+    @staticmethod
+    def _eh_conteudo_binario(dados: bytes) -> bool:
+        """Checks if the beginning of a content looks binary"""
+        amostra = dados[:TAMANHO_AMOSTRA_BINARIO]
 
-        # 3. Check by content
-        try:
-            if caminho.is_file():
-                with open(caminho, "rb") as f:
-                    chunk = f.read(4096)
-
-                    # Empty file
-                    if not chunk:
-                        return False
-
-                    # Presence of null bytes indicates binary file
-                    if b"\x00" in chunk:
-                        return True
-
-                    # Another heuristic: high proportion of non-printable bytes
-                    # Count non-ASCII or control bytes
-                    non_text = sum(
-                        1 for b in chunk if b < 9 or (b > 126 and b != 10 and b != 13)
-                    )
-                    if (
-                        len(chunk) > 0
-                        and non_text / len(chunk) > 0.3
-                        and len(chunk) > 50
-                    ):
-                        return True
+        # Empty file
+        if not amostra:
             return False
-        except Exception:
-            return True  # In case of error, assume binary for safety
 
-    def deve_ignorar(self, caminho: Path) -> bool:
-        """Decides if a file should be ignored, combining various checks"""
-        # First check if it's a file
-        if not caminho.is_file():
+        # Presence of null bytes indicates binary file
+        if b"\x00" in amostra:
             return True
 
-        # Check if the file is hidden (starts with .)
-        if caminho.name.startswith("."):
-            return True
-
-        # Use the .gitignore filter
-        if self.gitignore_filter.deve_ignorar(caminho):
-            return True
-
-        # Check if it's binary
-        if self._eh_arquivo_binario(caminho):
-            return True
-
-        return False
+        # Another heuristic: high proportion of non-printable bytes
+        # Count non-ASCII or control bytes, deleting the text ones in C
+        non_text = len(amostra.translate(None, BYTES_DE_TEXTO))
+        return len(amostra) > 50 and non_text / len(amostra) > 0.3
+
+    def _ler_bytes(self, caminho: Path) -> Optional[Tuple[os.stat_result, bytes]]:
+        """
+        Reads the bytes of a file with a single open, stat and read.
+        Returns None if it isn't a regular file or is larger than the maximum size.
+        """
+        with open(caminho, "rb") as f:
+            stats = os.fstat(f.fileno())
+            if (
+                not stat.S_ISREG(stats.st_mode)
+                or stats.st_size > self.tamanho_maximo_arquivo
+            ):
+                return None
+            return stats, f.read()
 
-    def _ler_arquivo(self, caminho: Path) -> Optional[str]:
-        """Reads the content of a file with encoding handling"""
+    @staticmethod
+    def _decodificar(dados: bytes) -> Optional[str]:
+        """Decodes the bytes of a file, trying several encodings on the same buffer"""
         # List of encodings to try
         encodings = ["utf-8", "latin1", "cp1252", "iso-8859-1"]
 
         for encoding in encodings:
             try:
-                with open(caminho, "r", encoding=encoding) as f:
-                    conteudo = f.read()
-                    # Check if it's not too large for embedding
-                    if len(conteudo) > 100000:  # Limit to ~100KB of text
-                        conteudo = conteudo[:100000]
-                    return conteudo
+                return dados.decode(encoding)
             except UnicodeDecodeError:
                 continue
-            except IOError as e:
-                print(f"⚠️ Error reading {caminho}: {e}")
-                return None
 
         # If all encodings fail
         return None
 
-    def _obter_metadados(self, caminho: Path) -> Dict[str, Any]:
-        """Extracts factual metadata from a file"""
+    def _obter_metadados(
+        self, caminho: Path, stats: Optional[os.stat_result] = None
+    ) -> Dict[str, Any]:
+        """Extracts factual metadata from a file, reusing its stat if available"""
         # Path relative to the project
         try:
             caminho_relativo = str(caminho.relative_to(self.caminho_projeto))
@@ -584,7 +999,8 @@ class IndexadorDireto:
 
         # File information
         try:
-            stats = os.stat(caminho)
+            if stats is None:
+                stats = os.stat(caminho)
             tamanho_bytes = stats.st_size
             data_modificacao = time.strftime(
                 "%Y-%m-%dT%H:%M:%S", time.localtime(stats.st_mtime)
@@ -615,49 +1031,154 @@ class IndexadorDireto:
 
         return metadata
 
-    def _enviar_para_qdrant(self, conteudo: str, metadata: Dict[str, Any]) -> bool:
-        """Sends an entry directly to Qdrant"""
-        try:
-            # Local import to avoid type errors
-            from qdrant_client import models
+    def _estimar_tokens(self, conteudo: str) -> int:
+        """Estimates the tokens the model reads from a document, which it truncates"""
+        return min(
+            int(len(conteudo) / CARACTERES_POR_TOKEN) + 1, MAX_TOKENS_POR_DOCUMENTO
+        )
 
-            # Create the text embedding
-            embedding = self.embedding_model.encode(conteudo)
+    def _enviar_pontos(
+        self,
+        trechos: List[Tuple[DocumentoPreparado, int]],
+        embeddings: Optional[List[List[float]]],
+    ) -> int:
+        """
+        Sends a batch of embedded chunks to Qdrant in a single upsert. A file is
+        recorded as indexed once its last chunk is stored, if none of its chunks
+        failed, and its chunks beyond the last one are deleted. The files that
+        couldn't be stored are counted in `arquivos_com_erro`.
+        Returns the number of files completed.
+
+        :param trechos: The chunks, as pairs of a document and the index of a chunk.
+        :param embeddings: The vectors of the chunks, or None if they couldn't be created.
+        """
+        # Local import to avoid type errors
+        from qdrant_client import models
+
+        if embeddings is not None:
+            try:
+                # Use the vector name determined at initialization
+                vector_name = getattr(self, "vector_name", "vector")
 
-            # Prepare the payload
-            payload = {"document": conteudo, "metadata": metadata}
+                # Create the points in Qdrant using deterministic IDs
+                self.qdrant_client.upsert(
+                    collection_name=self.collection_name,
+                    points=[
+                        models.PointStruct.model_construct(
+                            id=gerar_id_trecho(documento.point_id, indice),
+                            vector={vector_name: embedding},  # Use the vector name
+                            payload={
+                                "document": documento.texto_trecho(indice),
+                                "metadata": self._obter_metadados_trecho(
+                                    documento, indice
+                                ),
+                            },
+                        )
+                        for (documento, indice), embedding in zip(trechos, embeddings)
+                    ],
+                )
+            except Exception as e:
+                print(f"❌ Error storing {len(trechos)} chunks in Qdrant: {str(e)}")
+                embeddings = None
 
-            # Use the vector name determined at initialization
-            vector_name = getattr(self, "vector_name", "vector")
+        if embeddings is None:
+            self._arquivos_com_falha.update(
+                documento.point_id for documento, _ in trechos
+            )
 
-            # Generate a deterministic ID based on metadata
-            # This ensures the same file will always have the same ID
-            try:
-                deterministic_id = gerar_id_determinista(metadata)
+        # The chunks of a file are sent in order, so its last one completes it
+        concluidos = []
+        falhas = 0
+        for documento, indice in trechos:
+            if indice != len(documento.trechos) - 1:
+                continue
+            if documento.point_id in self._arquivos_com_falha:
+                self._arquivos_com_falha.discard(documento.point_id)
+                falhas += 1
+            else:
+                concluidos.append(documento)
+
+        if not self._remover_trechos_excedentes(concluidos):
+            # Not recorded, so the next run sends them and tries the deletion again
+            falhas += len(concluidos)
+            concluidos = []
+
+        if falhas:
+            with self._lock_estatisticas:
+                self.arquivos_com_erro += falhas
+
+        for documento in concluidos:
+            if self.manifesto:
+                self.manifesto.registrar(
+                    documento.caminho_relativo,
+                    documento.tamanho,
+                    documento.mtime_ns,
+                    documento.hash_conteudo,
+                    documento.point_id,
+                    len(documento.trechos),
+                )
+            if documento.id_anterior and documento.id_anterior != documento.point_id:
+                with self._lock_estatisticas:
+                    self._ids_obsoletos.append(documento.id_anterior)
+        return len(concluidos)
+
+    def _obter_metadados_trecho(
+        self, documento: DocumentoPreparado, indice: int
+    ) -> Dict[str, Any]:
+        """Adds the position of a chunk and the reference to its file to the metadata"""
+        inicio, fim = documento.trechos[indice]
+        return {
+            **documento.metadados,
+            "arquivo_pai": documento.point_id,
+            "trecho_indice": indice,
+            "total_trechos": len(documento.trechos),
+            "trecho_inicio": inicio,
+            "trecho_fim": fim,
+        }
 
-                if self.verbose:
-                    caminho_rel = metadata.get("caminho_relativo", "unknown")
-                    print(f"🔑 ID generated for {caminho_rel}: {deterministic_id}")
-            except Exception as e:
-                print(f"❌ Error generating deterministic ID: {e}")
-                print(f"⚠️ Metadata used: {metadata}")
-                # Don't use UUID! Return failure
-                return False
+    def _remover_trechos_excedentes(self, documentos: List[DocumentoPreparado]) -> bool:
+        """
+        Deletes the chunks left over from longer previous versions of the files, with
+        a single request. Returns False if they couldn't be deleted.
+        """
+        from qdrant_client import models
+
+        filtros = []
+        for documento in documentos:
+            total = len(documento.trechos)
+            anteriores = documento.trechos_anteriores
+            # Without a record, the previous version may have had more chunks,
+            # unless the collection was just created
+            if (anteriores is None and not self.colecao_criada) or (
+                anteriores is not None and anteriores > total
+            ):
+                filtros.append(
+                    models.Filter(
+                        must=[
+                            models.FieldCondition(
+                                key="metadata.arquivo_pai",
+                                match=models.MatchValue(value=documento.point_id),
+                            ),
+                            models.FieldCondition(
+                                key="metadata.trecho_indice",
+                                range=models.Range(gte=total),
+                            ),
+                        ]
+                    )
+                )
+        if not filtros:
+            return True
 
-            # Create a point in Qdrant using deterministic ID
-            self.qdrant_client.upsert(
+        try:
+            self.qdrant_client.delete(
                 collection_name=self.collection_name,
-                points=[
-                    models.PointStruct(
-                        id=deterministic_id,  # Use deterministic ID
-                        vector={vector_name: embedding},  # Use the vector name
-                        payload=payload,
-                    )
-                ],
+                points_selector=models.FilterSelector(
+                    filter=models.Filter(should=filtros)
+                ),
             )
             return True
         except Exception as e:
-            print(f"❌ Error storing in Qdrant: {str(e)}")
+            print(f"⚠️ Error removing the old chunks of {len(filtros)} files: {e}")
             return False
 
     def _formatar_tamanho(self, tamanho_bytes: int) -> str:
@@ -669,157 +1190,201 @@ class IndexadorDireto:
             tamanho_formatado /= 1024.0
         return f"{tamanho_formatado:.2f} {unit}"
 
-    def _processar_arquivo(self, caminho: Path) -> bool:
-        """Processes a single file for indexing"""
+    def _preparar_documento(self, caminho: Path) -> Optional[DocumentoPreparado]:
+        """Reads a file and prepares its document, or returns None if it is skipped"""
         try:
             rel_path = caminho.relative_to(self.caminho_projeto)
 
-            # Skip if it should be ignored
-            if self.deve_ignorar(caminho):
+            # Skip hidden files and the ones ignored by name
+            extensao = caminho.suffix.lower()[1:] if caminho.suffix else ""
+            if (
+                caminho.name.startswith(".")
+                or extensao in BINARY_EXTENSIONS
+                or self.gitignore_filter.deve_ignorar(caminho)
+            ):
                 # Don't log each ignored file to keep console clean
-                return False
+                return None
+
+            # The file is opened, stat'ed and read only once; the same bytes are
+            # used to detect binaries and to decode the content
+            try:
+                leitura = self._ler_bytes(caminho)
+            except IOError as e:
+                print(f"⚠️ Error reading {rel_path}: {e}")
+                return None
+            if leitura is None:
+                # Not a regular file or too large
+                return None
+            stats, dados = leitura
+            if self._eh_conteudo_binario(dados):
+                return None
 
             # Read file content
-            conteudo = self._ler_arquivo(caminho)
+            conteudo = self._decodificar(dados)
             if conteudo is None:
                 # Only log errors, not files we can't read
                 print(f"⚠️ Could not read: {rel_path}")
-                return False
+                return None
 
             # Check if the content is empty
             if not conteudo.strip():
-                return False
+                return None
+
+            # A file touched without changing its content isn't embedded again
+            caminho_relativo = rel_path.as_posix()
+            hash_conteudo = hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+            anterior = (
+                self.manifesto.obter(caminho_relativo) if self.manifesto else None
+            )
+            if (
+                anterior
+                and not self.reindexar_tudo
+                and anterior["hash"] == hash_conteudo
+            ):
+                self.manifesto.registrar(
+                    caminho_relativo,
+                    stats.st_size,
+                    stats.st_mtime_ns,
+                    hash_conteudo,
+                    anterior["id"],
+                    anterior.get("trechos", 1),
+                )
+                with self._lock_estatisticas:
+                    self.arquivos_inalterados += 1
+                return None
 
             # Get metadata
-            metadados = self._obter_metadados(caminho)
+            metadados = self._obter_metadados(caminho, stats)
 
-            # Send to Qdrant
-            if self._enviar_para_qdrant(conteudo, metadados):
-                # We don't need to log each indexed file, the progress bar already shows it
-                return True
-            else:
-                print(f"❌ Failed to index: {rel_path}")
-                return False
+            # Generate a deterministic ID based on metadata
+            # This ensures the same file will always have the same ID
+            try:
+                point_id = gerar_id_determinista(metadados)
+
+                if self.verbose:
+                    print(f"🔑 ID generated for {caminho_relativo}: {point_id}")
+            except Exception as e:
+                print(f"❌ Error generating deterministic ID: {e}")
+                print(f"⚠️ Metadata used: {metadados}")
+                # Don't use UUID! Skip the file
+                return None
+
+            # Files indexed before chunking have a single point
+            trechos_anteriores = None
+            if anterior and anterior["id"] == point_id:
+                trechos_anteriores = anterior.get("trechos", 1)
+
+            return DocumentoPreparado(
+                caminho_relativo=caminho_relativo,
+                conteudo=conteudo,
+                metadados=metadados,
+                point_id=point_id,
+                tamanho=stats.st_size,
+                mtime_ns=stats.st_mtime_ns,
+                hash_conteudo=hash_conteudo,
+                id_anterior=anterior["id"] if anterior else None,
+                trechos=dividir_em_trechos(
+                    conteudo, self.tamanho_trecho, self.sobreposicao_trecho
+                ),
+                trechos_anteriores=trechos_anteriores,
+            )
 
         except Exception as e:
             print(f"❌ Error processing file {caminho}: {e}")
-            return False
-
-    def indexar(self) -> bool:
-        """Indexes all files in the project recursively"""
-        try:
-            # Statistics
-            total_arquivos = 0
-            arquivos_para_processar = []
-
-            # Progress bar for file discovery
-            print(f"🔍 Discovering files in: {self.caminho_projeto}")
-
-            # Traverse all files recursively
-            for root, _, files in os.walk(self.caminho_projeto):
-                root_path = Path(root)
-                for file in files:
-                    total_arquivos += 1
-                    caminho = root_path / file
-                    extensao = caminho.suffix.lower()[1:] if caminho.suffix else ""
-
-                    # Filter only text files that shouldn't be ignored by gitignore
-                    if (
-                        extensao not in BINARY_EXTENSIONS
-                        and not self.gitignore_filter.deve_ignorar(caminho)
-                    ):
-                        arquivos_para_processar.append(caminho)
+            return None
 
-            total_para_processar = len(arquivos_para_processar)
-            print(f"Found {total_para_processar} processable files")
+    def indexar(self, desde: Optional[str] = None) -> bool:
+        """
+        Indexes all files in the project recursively
 
+        :param desde: A git revision, optional. If provided, only the files added,
+                      modified, renamed or deleted between it and HEAD are synced.
+        """
+        try:
             # Reset counters
+            self.arquivos_encontrados = 0
+            self.arquivos_processaveis = 0
             self.arquivos_indexados = 0
             self.arquivos_ignorados = 0
+            self.arquivos_inalterados = 0
+            self.arquivos_removidos = 0
+            self.arquivos_com_erro = 0
 
-            # Main progress bar for indexing
-            with tqdm(
-                total=total_para_processar,
-                desc="Indexing",
-                unit="file",
-                bar_format="{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]",
-            ) as pbar:
-
-                # Parallel processing (if applicable)
-                if total_para_processar > 20 and self.max_workers > 1:
-                    with concurrent.futures.ThreadPoolExecutor(
-                        max_workers=self.max_workers
-                    ) as executor:
-                        # Define function for processing with progress
-                        def processar_com_progresso(caminho):
-                            rel_path = str(caminho.relative_to(self.caminho_projeto))
-                            pbar.set_description(
-                                f"Indexing: {rel_path[:40]}{'...' if len(rel_path) > 40 else ''}"
-                            )
-                            resultado = self._processar_arquivo(caminho)
-                            pbar.update(1)
-                            return resultado
-
-                        # Submit tasks
-                        futures = []
-                        for caminho in arquivos_para_processar:
-                            futures.append(
-                                executor.submit(processar_com_progresso, caminho)
-                            )
+            # The commit being indexed, recorded in the collection at the end
+            commit_atual = self._obter_commit_atual()
 
-                        # Collect results in real-time
-                        indexados = 0
-                        for i, future in enumerate(
-                            concurrent.futures.as_completed(futures)
-                        ):
-                            resultado = future.result()
-                            if resultado:
-                                indexados += 1
-                            # Update statistics in real-time
-                            pbar.set_postfix(
-                                indexed=f"{indexados}/{i+1}",
-                                rate=f"{(indexados/(i+1))*100:.1f}%",
-                            )
+            if desde is not None:
+                print(
+                    f"🔍 Looking for files changed since {desde} in: {self.caminho_projeto}"
+                )
+                self.arquivos_encontrados, arquivos = self._descobrir_alteracoes_git(
+                    desde
+                )
+                self.arquivos_processaveis = len(arquivos)
+            else:
+                # Files are indexed while the discovery goes on
+                print(f"🔍 Discovering and indexing files in: {self.caminho_projeto}")
+                arquivos = self._descobrir_arquivos()
+                # Only new or changed files are indexed again
+                if self.manifesto is not None:
+                    arquivos = self._filtrar_pelo_manifesto(arquivos)
+
+            # Main progress bar for indexing, its total grows with the discovery
+            with (
+                self._pausar_indexacao_hnsw(),
+                tqdm(
+                    total=0,
+                    desc="Indexing",
+                    unit="file",
+                    bar_format="{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}{postfix}]",
+                ) as pbar,
+            ):
+                self._executar_pipeline(arquivos, pbar)
 
-                        # Update final counters
-                        self.arquivos_indexados = indexados
-                        self.arquivos_ignorados = total_para_processar - indexados
+            if self.carga_em_massa:
+                from synapstor.bulk import wait_for_optimizer
 
-                # Sequential processing
-                else:
-                    indexados = 0
-                    for i, caminho in enumerate(arquivos_para_processar):
-                        rel_path = str(caminho.relative_to(self.caminho_projeto))
-                        pbar.set_description(
-                            f"Indexing: {rel_path[:40]}{'...' if len(rel_path) > 40 else ''}"
-                        )
+                print("⏳ Waiting for Qdrant to build the index of the collection...")
+                if wait_for_optimizer(self.qdrant_client, self.collection_name):
+                    print("✅ Collection index built")
 
-                        if self._processar_arquivo(caminho):
-                            indexados += 1
+            total_a_indexar = pbar.n
+            self.arquivos_ignorados = total_a_indexar - self.arquivos_indexados
 
-                        # Update statistics in real-time
-                        pbar.set_postfix(
-                            indexed=f"{indexados}/{i+1}",
-                            rate=f"{(indexados/(i+1))*100:.1f}%",
-                        )
-                        pbar.update(1)
+            # Points of files that were indexed under another ID
+            if self._ids_obsoletos:
+                self._remover_arquivos(self._ids_obsoletos)
+                self._ids_obsoletos = []
 
-                # Update final counters
-                self.arquivos_indexados = indexados
-                self.arquivos_ignorados = total_para_processar - indexados
+            # A failed file isn't in the manifest, and a CI checkout has no manifest,
+            # so only the commit keeps the next git run from skipping it
+            if commit_atual and not self.arquivos_com_erro:
+                self._registrar_commit_indexado(commit_atual)
+            elif commit_atual:
+                print(
+                    f"⚠️ {self.arquivos_com_erro} files could not be indexed, "
+                    "the indexed commit was not updated"
+                )
 
             # Clean and clear summary
+            total_arquivos = self.arquivos_encontrados
+            total_para_processar = self.arquivos_processaveis
             print("\n✅ Indexing completed!")
             print("📊 Statistics:")
             print(f"   Total files found: {total_arquivos}")
             print(
-                f"   Processable files: {total_para_processar} ({(total_para_processar/total_arquivos)*100:.1f}%)"
+                f"   Processable files: {total_para_processar} ({(total_para_processar/max(total_arquivos, 1))*100:.1f}%)"
             )
             print(
-                f"   Indexed files: {self.arquivos_indexados} ({(self.arquivos_indexados/total_para_processar)*100:.1f}%)"
+                f"   Indexed files: {self.arquivos_indexados} ({(self.arquivos_indexados/max(total_para_processar, 1))*100:.1f}%)"
             )
+            if self.manifesto is not None:
+                print(f"   Unchanged files: {self.arquivos_inalterados}")
+                print(f"   Removed files: {self.arquivos_removidos}")
+            if self.arquivos_com_erro:
+                print(f"   Failed files: {self.arquivos_com_erro}")
 
-            return True
+            return not self.arquivos_com_erro
 
         except KeyboardInterrupt:
             print("\n⚠️ Indexing interrupted by user.")
@@ -827,19 +1392,555 @@ class IndexadorDireto:
         except Exception as e:
             print(f"\n❌ Error during indexing: {str(e)}")
             return False
+        finally:
+            # Keep what was indexed, even if the run was interrupted
+            if self.manifesto is not None:
+                try:
+                    self.manifesto.salvar()
+                except OSError as e:
+                    print(f"⚠️ Error saving the manifest {self.manifesto.caminho}: {e}")
+
+    def indexar_alteracoes(self, caminhos: Iterable[Path]) -> bool:
+        """
+        Syncs only the given files: the existing ones are indexed, if their content
+        changed, and the points of the deleted ones are removed
+
+        :param caminhos: The changed files or directories, as reported by an observer.
+        """
+        self.arquivos_indexados = 0
+        self.arquivos_inalterados = 0
+        self.arquivos_removidos = 0
+        self.arquivos_com_erro = 0
+        try:
+            existentes = []
+            apagados = set()
+            for caminho in caminhos:
+                try:
+                    caminho_relativo = caminho.relative_to(
+                        self.caminho_projeto
+                    ).as_posix()
+                except ValueError:
+                    continue
+                if caminho.name == ".gitignore":
+                    # The ignore rules changed, read them again
+                    self.gitignore_filter = GitIgnoreFilter(self.caminho_projeto)
+                if caminho.is_dir():
+                    continue
+                if caminho.exists():
+                    existentes.append(caminho)
+                    continue
+                apagados.add(caminho_relativo)
+                # A removed directory takes all its indexed files with it
+                if self.manifesto is not None:
+                    prefixo = caminho_relativo + "/"
+                    apagados.update(
+                        c for c in self.manifesto.caminhos() if c.startswith(prefixo)
+                    )
+
+            if self.manifesto is not None:
+                # Files that were never indexed have no points to remove
+                apagados = {c for c in apagados if self.manifesto.obter(c)}
+            self._remover_caminhos(sorted(apagados))
+
+            arquivos = self._filtrar_processaveis(existentes)
+            with tqdm(total=0, unit="file", disable=not self.verbose) as pbar:
+                self._executar_pipeline(arquivos, pbar)
+
+            if self.arquivos_indexados or self.arquivos_removidos:
+                print(
+                    f"🔄 {time.strftime('%H:%M:%S')} {self.arquivos_indexados} indexed, "
+                    f"{self.arquivos_removidos} removed"
+                )
+            if self.arquivos_com_erro:
+                print(f"⚠️ {self.arquivos_com_erro} files could not be indexed")
+            return not self.arquivos_com_erro
+        except Exception as e:
+            print(f"❌ Error indexing changes: {e}")
+            return False
+        finally:
+            if self.manifesto is not None:
+                try:
+                    self.manifesto.salvar()
+                except OSError as e:
+                    print(f"⚠️ Error saving the manifest {self.manifesto.caminho}: {e}")
+
+    def observar(
+        self,
+        debounce: float = 1.0,
+        espera_maxima: float = 10.0,
+        polling: bool = False,
+        intervalo_polling: float = 2.0,
+        parar: Optional[threading.Event] = None,
+    ) -> bool:
+        """
+        Watch mode: indexes the project and then keeps it in sync, indexing only the
+        files touched, with the model kept loaded between changes
+
+        Changes are gathered until the files are quiet for `debounce` seconds, so a
+        burst such as a git checkout is indexed in one go, but never wait more than
+        `espera_maxima` seconds.
+
+        :param debounce: The seconds without changes before indexing them.
+        :param espera_maxima: The maximum seconds changes wait while files keep changing.
+        :param polling: Whether to scan for changes even if inotify is available.
+        :param intervalo_polling: The seconds between two scans, when polling.
+        :param parar: An event that stops watching when set, optional.
+        """
+        # The observer starts before the first run, so no change is missed
+        observador = criar_observador(
+            self.caminho_projeto,
+            lambda diretorio: self.gitignore_filter.deve_ignorar(
+                diretorio, eh_diretorio=True
+            ),
+            intervalo_polling=intervalo_polling,
+            polling=polling,
+        )
+        try:
+            if not self.indexar():
+                return False
+            print(
+                f"👀 Watching {self.caminho_projeto} for changes ({type(observador).__name__})"
+            )
+
+            pendentes: Set[Path] = set()
+            primeira_alteracao = 0.0
+            while parar is None or not parar.is_set():
+                # Wake up from time to time to check if it should stop
+                eventos = observador.ler_eventos(debounce if pendentes else 1.0)
+                if eventos:
+                    if not pendentes:
+                        primeira_alteracao = time.monotonic()
+                    pendentes.update(eventos)
+                    if time.monotonic() - primeira_alteracao < espera_maxima:
+                        continue
+
+                if observador.transbordou:
+                    # Events were lost, so the whole project is compared again
+                    print("⚠️ Too many changes at once, checking every file")
+                    observador.transbordou = False
+                    pendentes = set()
+                    self.indexar()
+                elif pendentes:
+                    alterados, pendentes = pendentes, set()
+                    self.indexar_alteracoes(alterados)
+            return True
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching.")
+            return True
+        finally:
+            observador.fechar()
+
+    def _pausar_indexacao_hnsw(self):
+        """
+        In bulk mode, pauses the HNSW indexing of the collection while the points are
+        uploaded and restores it afterwards, otherwise does nothing
+        """
+        if not self.carga_em_massa:
+            return contextlib.nullcontext()
+
+        from synapstor.bulk import bulk_load
+
+        print("🚚 Bulk mode: indexing of the collection paused during the upload")
+        return bulk_load(self.qdrant_client, self.collection_name, wait=False)
+
+    def _executar_pipeline(self, arquivos: Iterable[Path], pbar):
+        """
+        Indexes the files in a streaming pipeline: discovery -> parallel readers ->
+        embedding batcher -> uploader. The stages run concurrently and are connected
+        by bounded queues, so a slow stage holds the previous ones back and memory
+        stays flat whatever the number of files.
+
+        :param arquivos: The files to index, possibly a lazy generator.
+        :param pbar: The progress bar, updated with the depth of each queue.
+        """
+        leitores = max(1, self.max_workers)
+        fila_arquivos: queue.Queue = queue.Queue(maxsize=leitores * 4)
+        fila_documentos: queue.Queue = queue.Queue(maxsize=self.tamanho_lote * 2)
+        fila_envio: queue.Queue = queue.Queue(maxsize=TAMANHO_FILA_ENVIO)
+        parar = threading.Event()
+        descobertos = [0]
+
+        def descobrir():
+            try:
+                for caminho in arquivos:
+                    if not self._colocar_na_fila(fila_arquivos, caminho, parar):
+                        return
+                    descobertos[0] += 1
+            except Exception as e:
+                print(f"❌ Error discovering files: {e}")
+            finally:
+                for _ in range(leitores):
+                    self._colocar_na_fila(fila_arquivos, FIM_DA_FILA, parar)
+
+        def ler():
+            try:
+                while True:
+                    caminho = self._retirar_da_fila(fila_arquivos, parar)
+                    if caminho is FIM_DA_FILA:
+                        return
+                    documento = self._preparar_documento(caminho)
+                    if not self._colocar_na_fila(
+                        fila_documentos, (caminho, documento), parar
+                    ):
+                        return
+            finally:
+                self._colocar_na_fila(fila_documentos, FIM_DA_FILA, parar)
+
+        def enviar():
+            while True:
+                item = self._retirar_da_fila(fila_envio, parar)
+                if item is FIM_DA_FILA:
+                    return
+                trechos, embeddings = item
+                enviados = self._enviar_pontos(trechos, embeddings)
+                with self._lock_estatisticas:
+                    self.arquivos_indexados += enviados
+
+        threads = [
+            threading.Thread(target=descobrir, name="indexer-discovery", daemon=True),
+            threading.Thread(target=enviar, name="indexer-upload", daemon=True),
+        ] + [
+            threading.Thread(target=ler, name=f"indexer-reader-{i}", daemon=True)
+            for i in range(leitores)
+        ]
+        for thread in threads:
+            thread.start()
+
+        def embutir_e_enviar(lote: List[Tuple[DocumentoPreparado, int]]):
+            try:
+                embeddings = self._gerar_embeddings(
+                    [documento.texto_trecho(indice) for documento, indice in lote]
+                )
+            except Exception as e:
+                print(f"❌ Error creating embeddings of {len(lote)} chunks: {e}")
+                # The uploader still has to know the files of the batch failed
+                embeddings = None
+            self._colocar_na_fila(fila_envio, (lote, embeddings), parar)
+
+        try:
+            # The embedding batcher runs in this thread. The chunks of the documents
+            # are gathered in batches, limited by count and by tokens, and embedded
+            # with one call. The chunks of a file may span several batches
+            lote: List[Tuple[DocumentoPreparado, int]] = []
+            tokens_lote = 0
+            leitores_ativos = leitores
+            while leitores_ativos:
+                item = self._retirar_da_fila(fila_documentos, parar)
+                if item is FIM_DA_FILA:
+                    leitores_ativos -= 1
+                    continue
+                caminho, documento = item
+
+                if documento is not None:
+                    for indice in range(len(documento.trechos)):
+                        tokens = self._estimar_tokens(documento.texto_trecho(indice))
+                        if lote and (
+                            len(lote) >= self.tamanho_lote
+                            or tokens_lote + tokens > self.tokens_por_lote
+                        ):
+                            embutir_e_enviar(lote)
+                            lote = []
+                            tokens_lote = 0
+                        lote.append((documento, indice))
+                        tokens_lote += tokens
+
+                # Update statistics in real-time
+                rel_path = str(caminho.relative_to(self.caminho_projeto))
+                pbar.set_description(
+                    f"Indexing: {rel_path[:40]}{'...' if len(rel_path) > 40 else ''}",
+                    refresh=False,
+                )
+                pbar.total = max(descobertos[0], pbar.n + 1)
+                pbar.set_postfix(
+                    indexed=self.arquivos_indexados,
+                    files=fila_arquivos.qsize(),
+                    docs=fila_documentos.qsize(),
+                    upload=fila_envio.qsize(),
+                    refresh=False,
+                )
+                pbar.update(1)
+
+            if lote:
+                embutir_e_enviar(lote)
+            self._colocar_na_fila(fila_envio, FIM_DA_FILA, parar)
+            for thread in threads:
+                thread.join()
+            pbar.set_postfix(indexed=self.arquivos_indexados)
+        finally:
+            # Stops the other stages if this one was interrupted
+            parar.set()
+
+    @staticmethod
+    def _colocar_na_fila(fila: queue.Queue, item: Any, parar: threading.Event) -> bool:
+        """Puts an item in a bounded queue, waiting for room unless the pipeline stops"""
+        while not parar.is_set():
+            try:
+                fila.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _retirar_da_fila(fila: queue.Queue, parar: threading.Event) -> Any:
+        """Gets an item from a queue, or the end marker if the pipeline stops"""
+        while not parar.is_set():
+            try:
+                return fila.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return FIM_DA_FILA
+
+    def _descobrir_arquivos(self) -> Iterator[Path]:
+        """Yields the files to index, counting the ones found and the processable ones"""
+        # Traverse all files recursively, without descending into ignored
+        # directories such as .git/ or node_modules/
+        for root, dirs, files in os.walk(self.caminho_projeto):
+            root_path = Path(root)
+            dirs[:] = [
+                d
+                for d in dirs
+                if not self.gitignore_filter.deve_ignorar(
+                    root_path / d, eh_diretorio=True
+                )
+            ]
+            for file in files:
+                self.arquivos_encontrados += 1
+                caminho = root_path / file
+                extensao = caminho.suffix.lower()[1:] if caminho.suffix else ""
+
+                # Filter only text files that shouldn't be ignored by gitignore
+                if (
+                    extensao not in BINARY_EXTENSIONS
+                    and not self.gitignore_filter.deve_ignorar(caminho)
+                ):
+                    self.arquivos_processaveis += 1
+                    yield caminho
+
+    def _descobrir_alteracoes_git(self, desde: str):
+        """
+        Asks git for the files changed between a revision and HEAD. Deletes the
+        points of deleted or renamed files and returns the total of changed files
+        and the processable ones.
+        """
+        saida = self._executar_git(
+            "diff", "--name-status", "-z", "-M", "--relative", desde, "HEAD"
+        )
+
+        alterados = []
+        apagados = []
+        campos = saida.split("\0")
+        i = 0
+        while i < len(campos) and campos[i]:
+            status = campos[i]
+            if status[0] in ("R", "C"):
+                # Renames and copies are followed by the old and the new path
+                if status[0] == "R":
+                    apagados.append(campos[i + 1])
+                alterados.append(campos[i + 2])
+                i += 3
+            else:
+                if status[0] == "D":
+                    apagados.append(campos[i + 1])
+                else:
+                    alterados.append(campos[i + 1])
+                i += 2
+
+        self._remover_caminhos(apagados)
+        arquivos_para_processar = self._filtrar_processaveis(
+            self.caminho_projeto / caminho_relativo for caminho_relativo in alterados
+        )
+
+        print(f"   {len(alterados)} changed and {len(apagados)} deleted files in git")
+        return len(alterados), arquivos_para_processar
+
+    def _remover_caminhos(self, apagados: List[str]):
+        """Deletes the points of files given by their paths relative to the project"""
+        if not apagados:
+            return
+        ids = [self._obter_id_arquivo(caminho) for caminho in apagados]
+        if self._remover_arquivos(ids):
+            if self.manifesto is not None:
+                self.manifesto.remover(apagados)
+            self.arquivos_removidos += len(apagados)
+
+    def _filtrar_processaveis(self, caminhos: Iterable[Path]) -> List[Path]:
+        """Keeps the existing files that aren't binary or ignored, in any directory"""
+        arquivos_para_processar = []
+        for caminho in caminhos:
+            extensao = caminho.suffix.lower()[1:] if caminho.suffix else ""
+            if (
+                caminho.is_file()
+                and extensao not in BINARY_EXTENSIONS
+                and not self.gitignore_filter.deve_ignorar_com_diretorios(caminho)
+            ):
+                arquivos_para_processar.append(caminho)
+        return arquivos_para_processar
+
+    def _executar_git(self, *args: str) -> str:
+        """Runs a git command in the project directory and returns its output"""
+        import subprocess
+
+        try:
+            resultado = subprocess.run(
+                ["git", "-C", str(self.caminho_projeto), *args],
+                capture_output=True,
+                check=True,
+                encoding="utf-8",
+                errors="surrogateescape",
+            )
+        except FileNotFoundError:
+            raise ValueError("git was not found")
+        except subprocess.CalledProcessError as e:
+            raise ValueError(f"git {args[0]} failed: {e.stderr.strip()}")
+        return resultado.stdout
+
+    def _obter_commit_atual(self) -> Optional[str]:
+        """Gets the commit of HEAD, or None if the project isn't a git repository"""
+        try:
+            return self._executar_git("rev-parse", "HEAD").strip()
+        except ValueError:
+            return None
+
+    def _obter_id_arquivo(self, caminho_relativo: str) -> str:
+        """Gets the ID of a file, from the manifest or from its path"""
+        if self.manifesto is not None:
+            registro = self.manifesto.obter(caminho_relativo)
+            if registro:
+                return registro["id"]
+        caminho = self.caminho_projeto / caminho_relativo
+        return gerar_id_determinista(
+            {"projeto": self.nome_projeto, "caminho_absoluto": str(caminho.absolute())}
+        )
+
+    def _obter_id_marcador_git(self) -> str:
+        """Gets the ID of the point that records the last indexed commit"""
+        return gerar_id_determinista(
+            {"projeto": self.nome_projeto, "caminho_absoluto": MARCADOR_COMMIT_GIT}
+        )
+
+    def obter_ultimo_commit_indexado(self) -> Optional[str]:
+        """Gets the last commit indexed for the project in the collection, if any"""
+        try:
+            pontos = self.qdrant_client.retrieve(
+                collection_name=self.collection_name,
+                ids=[self._obter_id_marcador_git()],
+                with_payload=True,
+            )
+        except Exception as e:
+            print(f"⚠️ Error getting the last indexed commit: {e}")
+            return None
+        if not pontos or not pontos[0].payload:
+            return None
+        return pontos[0].payload.get("commit")
+
+    def _registrar_commit_indexado(self, commit: str):
+        """Records the indexed commit in a marker point without vectors"""
+        from qdrant_client import models
+
+        try:
+            self.qdrant_client.upsert(
+                collection_name=self.collection_name,
+                points=[
+                    models.PointStruct(
+                        id=self._obter_id_marcador_git(),
+                        vector={},
+                        payload={
+                            "metadata": {
+                                "projeto": self.nome_projeto,
+                                "tipo": "marcador_git",
+                            },
+                            "commit": commit,
+                        },
+                    )
+                ],
+            )
+        except Exception as e:
+            print(f"⚠️ Error recording the indexed commit: {e}")
+
+    def _filtrar_pelo_manifesto(self, arquivos: Iterable[Path]) -> Iterator[Path]:
+        """
+        Compares the discovered files with the manifest, yielding the ones that are
+        new or changed. Once all files are seen, deletes the points of the files
+        that no longer exist.
+        """
+        caminhos_atuais = set()
+        for caminho in arquivos:
+            caminho_relativo = caminho.relative_to(self.caminho_projeto).as_posix()
+            caminhos_atuais.add(caminho_relativo)
+            try:
+                stats = caminho.stat()
+            except OSError:
+                yield caminho
+                continue
+            if not self.reindexar_tudo and self.manifesto.esta_atualizado(
+                caminho_relativo, stats.st_size, stats.st_mtime_ns
+            ):
+                with self._lock_estatisticas:
+                    self.arquivos_inalterados += 1
+            else:
+                yield caminho
+
+        removidos = [
+            caminho_relativo
+            for caminho_relativo in self.manifesto.caminhos()
+            if caminho_relativo not in caminhos_atuais
+        ]
+        if removidos:
+            ids = [self.manifesto.obter(c)["id"] for c in removidos]
+            if self._remover_arquivos(ids):
+                self.manifesto.remover(removidos)
+                self.arquivos_removidos = len(removidos)
+
+    def _remover_arquivos(self, ids: List[str]) -> bool:
+        """Deletes all the chunks of files from the collection in batches"""
+        from qdrant_client import models
+
+        try:
+            for inicio in range(0, len(ids), TAMANHO_LOTE_REMOCAO):
+                lote = ids[inicio : inicio + TAMANHO_LOTE_REMOCAO]
+                # The first chunk has the ID of the file and the others refer to it
+                self.qdrant_client.delete(
+                    collection_name=self.collection_name,
+                    points_selector=models.FilterSelector(
+                        filter=models.Filter(
+                            should=[
+                                models.HasIdCondition(has_id=lote),
+                                models.FieldCondition(
+                                    key="metadata.arquivo_pai",
+                                    match=models.MatchAny(any=lote),
+                                ),
+                            ]
+                        )
+                    ),
+                )
+            return True
+        except Exception as e:
+            print(f"❌ Error removing the points of {len(ids)} files from Qdrant: {e}")
+            return False
 
     def buscar(self, consulta: str, limite: int = 10) -> List[Dict[str, Any]]:
         """Searches for documents in Qdrant using a natural language query"""
         try:
             # Create the query embedding
-            embedding = self.embedding_model.encode(consulta)
+            embedding = self._gerar_embedding_consulta(consulta)
+
+            # Quantized vectors only select the candidates, the original ones rank them
+            search_params = None
+            if self.colecao_quantizada:
+                search_params = create_search_params(
+                    self.qdrant_settings.search_oversampling,
+                    self.qdrant_settings.search_rescore,
+                )
 
             # Search in Qdrant
-            results = self.qdrant_client.search(
+            results = self.qdrant_client.query_points(
                 collection_name=self.collection_name,
-                query_vector=embedding,
+                query=embedding,
+                using=self.vector_name,
                 limit=limite,
-            )
+                search_params=search_params,
+            ).points
 
             # Format the results
             resultados_formatados = []
@@ -892,8 +1993,8 @@ def main():
     )
     parser.add_argument(
         "--embedding-model",
-        default="sentence-transformers/all-MiniLM-L6-v2",
-        help="Embedding model to be used (default: sentence-transformers/all-MiniLM-L6-v2)",
+        default=None,
+        help="Embedding model to be used (by default, uses the EMBEDDING_MODEL value from .env or sentence-transformers/all-MiniLM-L6-v2)",
     )
     parser.add_argument(
         "--vector-name",
@@ -910,6 +2011,30 @@ def main():
         default=4,
         help="Number of parallel workers for indexing (default: 4)",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=32,
+        help="Maximum number of chunks embedded and sent to Qdrant at once (default: 32)",
+    )
+    parser.add_argument(
+        "--batch-tokens",
+        type=int,
+        default=16384,
+        help="Maximum number of estimated tokens in an embedding batch (default: 16384)",
+    )
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=TOKENS_POR_TRECHO,
+        help=f"Size of the chunks the files are split in, in estimated tokens (default: {TOKENS_POR_TRECHO})",
+    )
+    parser.add_argument(
+        "--chunk-overlap",
+        type=int,
+        default=SOBREPOSICAO_TRECHO,
+        help=f"Estimated tokens repeated between consecutive chunks (default: {SOBREPOSICAO_TRECHO})",
+    )
     parser.add_argument(
         "--max-file-size",
         type=int,
@@ -922,6 +2047,68 @@ def main():
         action="store_true",
         help="Verbose mode (shows more messages)",
     )
+    parser.add_argument(
+        "--since",
+        default=None,
+        help="Only indexes the files changed in git between this revision and HEAD",
+    )
+    parser.add_argument(
+        "--git-incremental",
+        action="store_true",
+        help="Only indexes the files changed in git since the last indexed commit",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Indexes every file again, without skipping the unchanged ones",
+    )
+    parser.add_argument(
+        "--manifest-dir",
+        default=None,
+        help=f"Directory of the manifests of incremental indexing (default: {DEFAULT_MANIFEST_DIR})",
+    )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Pauses the HNSW indexing of the collection during the upload, for large loads",
+    )
+    parser.add_argument(
+        "--quantization",
+        choices=[tipo.value for tipo in QuantizationType],
+        default=None,
+        help="Quantization of the vectors of a new collection (by default, uses the QDRANT_QUANTIZATION value from .env or none)",
+    )
+    parser.add_argument(
+        "--vectors-on-disk",
+        action="store_true",
+        help="Stores the vectors of a new collection on disk (by default, uses the QDRANT_VECTORS_ON_DISK value from .env)",
+    )
+    parser.add_argument(
+        "--payload-on-disk",
+        action="store_true",
+        help="Stores the documents of a new collection on disk (by default, uses the QDRANT_PAYLOAD_ON_DISK value from .env)",
+    )
+    parser.add_argument(
+        "--hnsw-on-disk",
+        action="store_true",
+        help="Stores the HNSW graph of a new collection on disk (by default, uses the QDRANT_HNSW_ON_DISK value from .env)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keeps running after indexing and indexes the files as they change",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=1.0,
+        help="In watch mode, seconds without changes before indexing them (default: 1.0)",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="In watch mode, scans for changes instead of using inotify",
+    )
     parser.add_argument(
         "--recreate-collection",
         action="store_true",
@@ -939,6 +2126,17 @@ def main():
     verificar_dependencias()
     importar_bibliotecas()
 
+    # The flags only turn on the storage options, the others come from .env
+    opcoes_disco = {
+        "vectors_on_disk": args.vectors_on_disk,
+        "payload_on_disk": args.payload_on_disk,
+        "hnsw_on_disk": args.hnsw_on_disk,
+    }
+    armazenamento = QdrantSettings().get_collection_storage()
+    armazenamento = armazenamento.model_copy(
+        update={opcao: True for opcao, ativo in opcoes_disco.items() if ativo}
+    )
+
     try:
         # Create the indexer with minimalist interface
         indexador = IndexadorDireto(
@@ -949,14 +2147,37 @@ def main():
             qdrant_api_key=args.qdrant_api_key,
             embedding_model=args.embedding_model,
             max_workers=args.workers,
+            tamanho_lote=args.batch_size,
+            tokens_por_lote=args.batch_tokens,
+            tokens_por_trecho=args.chunk_tokens,
+            sobreposicao_trecho=args.chunk_overlap,
             tamanho_maximo_arquivo=args.max_file_size * 1024 * 1024,
-            vector_name=(
-                "fast-all-minilm-l6-v2" if not args.vector_name else args.vector_name
-            ),
+            vector_name=args.vector_name,
+            diretorio_manifesto=args.manifest_dir,
+            reindexar_tudo=args.full,
+            carga_em_massa=args.bulk,
+            quantizacao=args.quantization,
+            armazenamento=armazenamento,
         )
 
+        # In git mode, only the files changed since a revision are indexed
+        desde = args.since
+        if args.git_incremental and not desde:
+            desde = indexador.obter_ultimo_commit_indexado()
+            if desde:
+                print(f"🔀 Last indexed commit: {desde}")
+            else:
+                print("ℹ️ No indexed commit found, indexing every file.")
+
+        if args.watch:
+            return (
+                0
+                if indexador.observar(debounce=args.debounce, polling=args.poll)
+                else 1
+            )
+
         # Run the indexing
-        success = indexador.indexar()
+        success = indexador.indexar(desde=desde)
 
         # If a query was provided, perform the search
         if args.query and success:
@@ -0,0 +1,248 @@
+"""
+Observers of the files of a project, used by the watch mode of the indexer
+
+On Linux, changes are received from the kernel through inotify, without scanning
+the project. Elsewhere, or when inotify can't be used, the project is scanned at a
+fixed interval and the sizes and modification times are compared.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+
+# inotify flags, from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Events that may change the content of a file or remove it
+MASCARA_EVENTOS = (
+    IN_MODIFY
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+)
+
+# Header of an inotify event: watch descriptor, mask, cookie and name length
+CABECALHO_EVENTO = struct.Struct("iIII")
+
+
+class ObservadorPolling:
+    """
+    Detects changes by scanning the project at a fixed interval and comparing the
+    size and modification time of each file
+
+    :param raiz: The root directory of the project.
+    :param ignorar_diretorio: Tells if a directory isn't scanned, like .git/.
+    :param intervalo: The seconds between two scans.
+    """
+
+    def __init__(
+        self,
+        raiz: Path,
+        ignorar_diretorio: Callable[[Path], bool],
+        intervalo: float = 2.0,
+    ):
+        self.raiz = raiz
+        self.ignorar_diretorio = ignorar_diretorio
+        self.intervalo = intervalo
+        # Polling never loses events
+        self.transbordou = False
+        self._estado = self._varrer()
+        self._proxima_varredura = time.monotonic() + intervalo
+
+    def _varrer(self) -> Dict[Path, Tuple[int, int]]:
+        """Gets the size and modification time of every file"""
+        estado = {}
+        for root, dirs, files in os.walk(self.raiz):
+            root_path = Path(root)
+            dirs[:] = [d for d in dirs if not self.ignorar_diretorio(root_path / d)]
+            for file in files:
+                caminho = root_path / file
+                try:
+                    stats = caminho.stat()
+                except OSError:
+                    continue
+                estado[caminho] = (stats.st_size, stats.st_mtime_ns)
+        return estado
+
+    def ler_eventos(self, timeout: Optional[float]) -> Set[Path]:
+        """
+        Waits up to `timeout` seconds, forever if None, for the next scan and
+        returns the files created, changed or deleted since the previous one
+        """
+        while True:
+            espera = self._proxima_varredura - time.monotonic()
+            if timeout is not None and espera > timeout:
+                time.sleep(max(timeout, 0))
+                return set()
+            time.sleep(max(espera, 0))
+            self._proxima_varredura = time.monotonic() + self.intervalo
+
+            estado = self._varrer()
+            alterados = {
+                caminho
+                for caminho, assinatura in estado.items()
+                if self._estado.get(caminho) != assinatura
+            }
+            alterados.update(set(self._estado) - set(estado))
+            self._estado = estado
+            if alterados or timeout is not None:
+                return alterados
+
+    def fechar(self):
+        """Releases the resources of the observer"""
+        self._estado = {}
+
+
+class ObservadorInotify:
+    """
+    Receives the changes of the files of a project from the Linux kernel, with a
+    watch on each directory that isn't ignored
+
+    :param raiz: The root directory of the project.
+    :param ignorar_diretorio: Tells if a directory isn't watched, like .git/.
+    """
+
+    def __init__(self, raiz: Path, ignorar_diretorio: Callable[[Path], bool]):
+        self.raiz = raiz
+        self.ignorar_diretorio = ignorar_diretorio
+        # Set when the kernel queue overflowed and events were lost
+        self.transbordou = False
+        self._diretorios: Dict[int, Path] = {}
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            erro = ctypes.get_errno()
+            raise OSError(erro, f"inotify_init1 failed: {os.strerror(erro)}")
+        try:
+            self._observar_arvore(raiz)
+        except OSError:
+            self.fechar()
+            raise
+
+    def _observar_diretorio(self, diretorio: Path):
+        """Adds a watch to a directory"""
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(diretorio), MASCARA_EVENTOS
+        )
+        if wd < 0:
+            erro = ctypes.get_errno()
+            raise OSError(
+                erro, f"inotify_add_watch failed for {diretorio}: {os.strerror(erro)}"
+            )
+        self._diretorios[wd] = diretorio
+
+    def _observar_arvore(self, raiz: Path) -> Set[Path]:
+        """Adds watches to a directory and its subdirectories and returns their files"""
+        arquivos = set()
+        for root, dirs, files in os.walk(raiz):
+            root_path = Path(root)
+            dirs[:] = [d for d in dirs if not self.ignorar_diretorio(root_path / d)]
+            try:
+                self._observar_diretorio(root_path)
+            except FileNotFoundError:
+                # Removed while being walked
+                continue
+            arquivos.update(root_path / file for file in files)
+        return arquivos
+
+    def ler_eventos(self, timeout: Optional[float]) -> Set[Path]:
+        """
+        Waits up to `timeout` seconds, forever if None, for changes and returns the
+        files and directories created, changed or deleted
+        """
+        prontos, _, _ = select.select([self._fd], [], [], timeout)
+        if not prontos:
+            return set()
+
+        alterados: Set[Path] = set()
+        while True:
+            try:
+                dados = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            inicio = 0
+            while inicio < len(dados):
+                wd, mascara, _, tamanho = CABECALHO_EVENTO.unpack_from(dados, inicio)
+                inicio += CABECALHO_EVENTO.size
+                # The name is padded with null bytes
+                nome = dados[inicio : inicio + tamanho].rstrip(b"\0")
+                inicio += tamanho
+                self._tratar_evento(wd, mascara, nome, alterados)
+        return alterados
+
+    def _tratar_evento(self, wd: int, mascara: int, nome: bytes, alterados: Set[Path]):
+        """Adds the path of an event to the changed ones, watching new directories"""
+        if mascara & IN_Q_OVERFLOW:
+            self.transbordou = True
+            return
+        if mascara & IN_IGNORED:
+            # The directory was removed, the kernel dropped its watch
+            self._diretorios.pop(wd, None)
+            return
+        diretorio = self._diretorios.get(wd)
+        if diretorio is None or not nome:
+            return
+
+        caminho = diretorio / os.fsdecode(nome)
+        if mascara & IN_ISDIR:
+            if self.ignorar_diretorio(caminho):
+                return
+            if mascara & (IN_CREATE | IN_MOVED_TO):
+                # Files created before the watch was added are found by the walk
+                try:
+                    alterados.update(self._observar_arvore(caminho))
+                except OSError as e:
+                    print(f"⚠️ Could not watch {caminho}: {e}")
+                    self.transbordou = True
+        alterados.add(caminho)
+
+    def fechar(self):
+        """Closes the inotify instance, dropping all the watches"""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._diretorios = {}
+
+
+def criar_observador(
+    raiz: Path,
+    ignorar_diretorio: Callable[[Path], bool],
+    intervalo_polling: float = 2.0,
+    polling: bool = False,
+):
+    """
+    Creates the observer of a project: inotify on Linux, polling otherwise or if
+    inotify fails, for example when the limit of watches is reached
+
+    :param raiz: The root directory of the project.
+    :param ignorar_diretorio: Tells if a directory isn't observed.
+    :param intervalo_polling: The seconds between two scans, when polling.
+    :param polling: Whether to poll even if inotify is available.
+    """
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return ObservadorInotify(raiz, ignorar_diretorio)
+        except (OSError, AttributeError) as e:
+            print(f"⚠️ inotify unavailable ({e}), scanning for changes instead")
+    return ObservadorPolling(raiz, ignorar_diretorio, intervalo_polling)
@@ -0,0 +1,68 @@
+from typing import Any, Dict, Optional
+
+import httpx
+from pydantic import BaseModel
+
+# Default of httpx, used when only the other limits are set
+DEFAULT_KEEPALIVE_EXPIRY = 5.0
+
+
+class ClientTransport(BaseModel):
+    """
+    How the Qdrant clients of synapstor talk to a remote server.
+
+    With gRPC, vectors are sent as binary protobuf instead of JSON, over a single
+    multiplexed HTTP/2 connection. Over REST, the pool and keep-alive limits decide
+    how many connections are kept open between calls. Options that are not set keep
+    the defaults of the Qdrant client.
+    :param prefer_grpc: Whether to use gRPC for the calls that support it.
+    :param grpc_port: The port of the gRPC API of the server.
+    :param timeout: The timeout of each request, in seconds.
+    :param pool_size: The maximum number of connections, or of gRPC channels.
+    :param keepalive_connections: The maximum number of idle REST connections kept open.
+    :param keepalive_expiry: The seconds an idle REST connection is kept open.
+    """
+
+    prefer_grpc: bool = False
+    grpc_port: int = 6334
+    timeout: Optional[int] = None
+    pool_size: Optional[int] = None
+    keepalive_connections: Optional[int] = None
+    keepalive_expiry: Optional[float] = None
+
+    def client_kwargs(self) -> Dict[str, Any]:
+        """
+        Gets the arguments of `QdrantClient` and `AsyncQdrantClient` for the transport.
+        :return: The keyword arguments.
+        """
+        kwargs: Dict[str, Any] = {
+            "prefer_grpc": self.prefer_grpc,
+            "grpc_port": self.grpc_port,
+        }
+        if self.timeout is not None:
+            kwargs["timeout"] = self.timeout
+
+        if self.prefer_grpc:
+            # The client opens one channel per unit of pool size
+            if self.pool_size is not None:
+                kwargs["pool_size"] = self.pool_size
+        elif (
+            self.pool_size is not None
+            or self.keepalive_connections is not None
+            or self.keepalive_expiry is not None
+        ):
+            # Given limits also replace the client default of no keep-alive on localhost
+            kwargs["limits"] = httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=(
+                    self.keepalive_connections
+                    if self.keepalive_connections is not None
+                    else self.pool_size
+                ),
+                keepalive_expiry=(
+                    self.keepalive_expiry
+                    if self.keepalive_expiry is not None
+                    else DEFAULT_KEEPALIVE_EXPIRY
+                ),
+            )
+        return kwargs
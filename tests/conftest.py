@@ -1,8 +1,13 @@
+import asyncio
+import hashlib
 import uuid
+from typing import List
+
 import pytest
 import pytest_asyncio
 
 from synapstor.qdrant import QdrantConnector
+from synapstor.embeddings.base import EmbeddingProvider
 from synapstor.embeddings.fastembed import FastEmbedProvider
 
 
@@ -13,6 +18,49 @@ def pytest_configure(config):
     pytest.asyncio_default_fixture_loop_scope = "function"
 
 
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic embedding provider for tests that don't need a real model.
+    Each word is hashed into one dimension, so texts sharing words are similar.
+    It also records every call, so tests can check how often inference runs.
+    """
+
+    def __init__(self, size: int = 64):
+        self.size = size
+        self.document_calls: List[List[str]] = []
+        self.query_calls: List[str] = []
+        self.query_batches: List[List[str]] = []
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.size
+        for word in text.lower().split():
+            digest = hashlib.md5(word.encode("utf-8")).digest()
+            vector[digest[0] % self.size] += 1.0
+        if not any(vector):
+            vector[0] = 1.0
+        return vector
+
+    async def embed_documents(self, documents: List[str]) -> List[List[float]]:
+        self.document_calls.append(list(documents))
+        return [self._embed(document) for document in documents]
+
+    async def embed_query(self, query: str) -> List[float]:
+        self.query_calls.append(query)
+        return self._embed(query)
+
+    async def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        self.query_batches.append(list(queries))
+        # Give other tasks the chance to queue more queries, like a real inference
+        await asyncio.sleep(0.01)
+        return [self._embed(query) for query in queries]
+
+    def get_vector_name(self) -> str:
+        return "fast-hashing-test"
+
+    def get_vector_size(self) -> int:
+        return self.size
+
+
 @pytest_asyncio.fixture
 async def embedding_provider():
     """Fixture for the embedding provider."""
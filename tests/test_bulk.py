@@ -0,0 +1,68 @@
+from unittest.mock import MagicMock
+
+import pytest
+from qdrant_client import QdrantClient, models
+
+from synapstor.bulk import bulk_load, wait_for_optimizer
+
+
+@pytest.fixture
+def client():
+    """An in-memory Qdrant client that records its calls."""
+    client = MagicMock(wraps=QdrantClient(":memory:"))
+    client.create_collection(
+        "test_collection",
+        vectors_config=models.VectorParams(size=4, distance=models.Distance.COSINE),
+    )
+    return client
+
+
+def indexing_thresholds(client):
+    return [
+        call.kwargs["optimizers_config"].indexing_threshold
+        for call in client.update_collection.call_args_list
+    ]
+
+
+def test_bulk_load_pauses_indexing(client):
+    """Tests if indexing is paused during the load and the threshold restored."""
+    with bulk_load(client, "test_collection", poll_interval=0):
+        assert indexing_thresholds(client) == [0]
+        client.upsert(
+            "test_collection",
+            points=[models.PointStruct(id=1, vector=[0.1, 0.2, 0.3, 0.4])],
+        )
+
+    assert indexing_thresholds(client) == [0, 20000]
+    assert client.count("test_collection").count == 1
+
+
+def test_bulk_load_restores_on_error(client):
+    """Tests if the threshold is restored even if the load fails."""
+    with pytest.raises(ValueError):
+        with bulk_load(client, "test_collection", poll_interval=0):
+            raise ValueError("load failed")
+
+    assert indexing_thresholds(client) == [0, 20000]
+
+
+def test_wait_for_optimizer(client):
+    """Tests if pending optimizations are triggered and waited for."""
+    statuses = iter(
+        [
+            models.CollectionStatus.GREY,
+            models.CollectionStatus.YELLOW,
+            models.CollectionStatus.GREEN,
+        ]
+    )
+    client.get_collection = MagicMock(
+        side_effect=lambda _: MagicMock(status=next(statuses))
+    )
+
+    assert wait_for_optimizer(client, "test_collection", poll_interval=0)
+    assert client.update_collection.call_count == 1
+
+    client.get_collection = MagicMock(
+        return_value=MagicMock(status=models.CollectionStatus.YELLOW)
+    )
+    assert not wait_for_optimizer(client, "test_collection", timeout=0, poll_interval=0)
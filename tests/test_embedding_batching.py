@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from synapstor.embeddings.batching import MicroBatchingEmbeddingProvider
+from tests.conftest import HashingEmbeddingProvider
+
+
+@pytest.mark.asyncio
+class TestMicroBatchingEmbeddingProvider:
+    """Tests for the micro-batching of concurrent queries."""
+
+    async def test_concurrent_queries_share_one_inference(self):
+        """Tests if concurrent queries are embedded in a single batch."""
+        provider = HashingEmbeddingProvider()
+        batching = MicroBatchingEmbeddingProvider(provider, max_batch_size=32)
+        queries = [f"query {i}" for i in range(10)]
+
+        vectors = await asyncio.gather(*[batching.embed_query(q) for q in queries])
+
+        assert provider.query_batches == [queries]
+        assert vectors == [provider._embed(query) for query in queries]
+
+    async def test_queries_arriving_during_inference_are_batched(self):
+        """Tests if queries queued while an inference runs go in the next batch."""
+        provider = HashingEmbeddingProvider()
+        batching = MicroBatchingEmbeddingProvider(provider, max_batch_size=32)
+
+        first = asyncio.ensure_future(batching.embed_query("first"))
+        await asyncio.sleep(0.001)
+        others = [batching.embed_query(f"other {i}") for i in range(3)]
+        await asyncio.gather(first, *others)
+
+        assert provider.query_batches == [
+            ["first"],
+            ["other 0", "other 1", "other 2"],
+        ]
+
+    async def test_max_batch_size(self):
+        """Tests if batches never exceed the maximum size."""
+        provider = HashingEmbeddingProvider()
+        batching = MicroBatchingEmbeddingProvider(
+            provider, max_batch_size=4, window_ms=5
+        )
+
+        await asyncio.gather(*[batching.embed_query(f"q{i}") for i in range(10)])
+
+        assert [len(batch) for batch in provider.query_batches] == [4, 4, 2]
+
+    async def test_duplicate_queries_are_embedded_once(self):
+        """Tests if identical queries in the same batch share one vector."""
+        provider = HashingEmbeddingProvider()
+        batching = MicroBatchingEmbeddingProvider(provider)
+
+        first, second = await asyncio.gather(
+            batching.embed_query("same"), batching.embed_query("same")
+        )
+
+        assert first == second
+        assert provider.query_batches == [["same"]]
+
+    async def test_errors_reach_every_caller(self):
+        """Tests if an inference error is raised to every query in the batch."""
+        provider = HashingEmbeddingProvider()
+
+        async def failing(queries):
+            raise RuntimeError("inference failed")
+
+        provider.embed_queries = failing
+        batching = MicroBatchingEmbeddingProvider(provider)
+
+        results = await asyncio.gather(
+            batching.embed_query("a"),
+            batching.embed_query("b"),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from synapstor.embeddings.cache import CachedEmbeddingProvider
+from tests.conftest import HashingEmbeddingProvider
+
+
+@pytest.mark.asyncio
+class TestCachedEmbeddingProvider:
+    """Tests for the query embedding cache."""
+
+    async def test_repeated_query_skips_inference(self):
+        """Tests if a repeated query is served from the cache."""
+        provider = HashingEmbeddingProvider()
+        cached = CachedEmbeddingProvider(provider)
+
+        first = await cached.embed_query("where is the config?")
+        second = await cached.embed_query("  where is   the config?  ")
+
+        np.testing.assert_array_equal(first, second)
+        assert provider.query_calls == ["where is the config?"]
+        info = cached.cache_info()
+        assert (info.hits, info.misses, info.entries) == (1, 1, 1)
+        assert cached.get_metrics()["query_cache_hits"] == 1
+
+    async def test_lru_eviction_by_entries(self):
+        """Tests if the least recently used query is evicted first."""
+        provider = HashingEmbeddingProvider()
+        cached = CachedEmbeddingProvider(provider, max_entries=2)
+
+        await cached.embed_query("a")
+        await cached.embed_query("b")
+        await cached.embed_query("a")
+        await cached.embed_query("c")
+        await cached.embed_query("a")
+        await cached.embed_query("b")
+
+        assert provider.query_calls == ["a", "b", "c", "b"]
+        assert cached.cache_info().entries == 2
+
+    async def test_eviction_by_size(self):
+        """Tests if the cache never grows beyond its memory budget."""
+        provider = HashingEmbeddingProvider(size=64)
+        cached = CachedEmbeddingProvider(provider, max_entries=100, max_bytes=1000)
+
+        for i in range(10):
+            await cached.embed_query(f"query {i}")
+
+        info = cached.cache_info()
+        assert 0 < info.entries < 10
+        assert info.size_bytes <= 1000
+
+    async def test_documents_are_not_cached(self):
+        """Tests if documents always reach the wrapped provider."""
+        provider = HashingEmbeddingProvider()
+        cached = CachedEmbeddingProvider(provider)
+
+        await cached.embed_documents(["doc"])
+        await cached.embed_documents(["doc"])
+
+        assert provider.document_calls == [["doc"], ["doc"]]
+        assert cached.get_vector_name() == provider.get_vector_name()
+        assert cached.get_vector_size() == provider.get_vector_size()
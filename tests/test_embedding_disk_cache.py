@@ -0,0 +1,105 @@
+import threading
+
+import numpy as np
+import pytest
+
+from synapstor.embeddings.disk_cache import (
+    DiskCachedEmbeddingProvider,
+    DiskEmbeddingCache,
+)
+from tests.conftest import HashingEmbeddingProvider
+
+
+@pytest.mark.asyncio
+class TestDiskCachedEmbeddingProvider:
+    """Tests for the persistent document embedding cache."""
+
+    async def test_cached_documents_skip_inference(self, tmp_path):
+        """Tests if only the documents not cached are embedded."""
+        provider = HashingEmbeddingProvider()
+        cached = DiskCachedEmbeddingProvider(provider, str(tmp_path))
+
+        first = await cached.embed_documents(["alpha beta", "gamma"])
+        second = await cached.embed_documents(["gamma", "delta", "delta"])
+
+        assert provider.document_calls == [["alpha beta", "gamma"], ["delta"]]
+        assert second.dtype == np.float32
+        np.testing.assert_array_equal(first[1], second[0])
+        np.testing.assert_array_equal(second[1], second[2])
+        np.testing.assert_array_equal(second[1], provider._embed("delta"))
+        metrics = cached.get_metrics()
+        assert metrics["document_cache_hits"] == 2
+        assert metrics["document_cache_misses"] == 3
+
+    async def test_persists_across_instances(self, tmp_path):
+        """Tests if another process finds the vectors on disk, per model."""
+        cached = DiskCachedEmbeddingProvider(HashingEmbeddingProvider(), str(tmp_path))
+        expected = await cached.embed_documents(["alpha", "beta"])
+        cached.close()
+
+        provider = HashingEmbeddingProvider()
+        reopened = DiskCachedEmbeddingProvider(provider, str(tmp_path))
+        np.testing.assert_array_equal(
+            await reopened.embed_documents(["beta", "alpha"]), expected[::-1]
+        )
+        assert provider.document_calls == []
+
+        # Another model has a cache of its own
+        other = HashingEmbeddingProvider(size=32)
+        other.model_name = "other-model"
+        await DiskCachedEmbeddingProvider(other, str(tmp_path)).embed_documents(
+            ["alpha"]
+        )
+        assert other.document_calls == [["alpha"]]
+
+    async def test_queries_are_not_cached(self, tmp_path):
+        """Tests if queries always reach the wrapped provider."""
+        provider = HashingEmbeddingProvider()
+        cached = DiskCachedEmbeddingProvider(provider, str(tmp_path))
+
+        await cached.embed_query("query")
+        await cached.embed_query("query")
+
+        assert provider.query_calls == ["query", "query"]
+
+
+def test_lru_eviction(tmp_path):
+    """Tests if the least recently used vectors are evicted when the cache is full."""
+    cache = DiskEmbeddingCache(str(tmp_path), "model", 4, max_bytes=3 * 4 * 4)
+
+    vectors = {f"key{i}": np.full(4, i, dtype=np.float32) for i in range(3)}
+    cache.put_many(vectors)
+    # key0 is used again, so key1 becomes the least recently used
+    cache.get_many(["key0"])
+    cache.put_many({"key3": np.full(4, 3, dtype=np.float32)})
+
+    found = cache.get_many([f"key{i}" for i in range(4)])
+    assert sorted(found) == ["key0", "key2", "key3"]
+    np.testing.assert_array_equal(found["key3"], np.full(4, 3))
+    np.testing.assert_array_equal(found["key0"], np.full(4, 0))
+    assert len(cache) == 3
+    # The matrix never grows beyond its limit
+    assert (cache.path / "vectors.f32").stat().st_size == 3 * 4 * 4
+
+
+def test_concurrent_eviction(tmp_path):
+    """Tests if a reader never gets the vector of another text while a writer reuses rows."""
+    # Separate connections, like two processes sharing the directory
+    writer = DiskEmbeddingCache(str(tmp_path), "model", 4, max_bytes=8 * 4 * 4)
+    reader = DiskEmbeddingCache(str(tmp_path), "model", 4, max_bytes=8 * 4 * 4)
+    keys = [f"key{i}" for i in range(32)]
+
+    def write():
+        # Every batch evicts the least recently used rows and reuses them
+        for i in range(0, 800, 4):
+            batch = keys[i % 32 : i % 32 + 4]
+            writer.put_many(
+                {key: np.full(4, keys.index(key), dtype=np.float32) for key in batch}
+            )
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    while thread.is_alive():
+        for key, vector in reader.get_many(keys).items():
+            np.testing.assert_array_equal(vector, np.full(4, keys.index(key)))
+    thread.join()
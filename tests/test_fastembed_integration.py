@@ -1,3 +1,5 @@
+import asyncio
+
 import numpy as np
 import pytest
 from fastembed import TextEmbedding
@@ -15,6 +17,17 @@ class TestFastEmbedProviderIntegration:
         assert provider.model_name == "sentence-transformers/all-MiniLM-L6-v2"
         assert isinstance(provider.embedding_model, TextEmbedding)
 
+    async def test_lazy_load(self):
+        """Tests if the model is only loaded on first use or by the warm-up."""
+        provider = FastEmbedProvider("sentence-transformers/all-MiniLM-L6-v2")
+        assert not provider.is_loaded
+        assert provider.get_vector_name() == "fast-all-minilm-l6-v2"
+        assert provider.get_vector_size() == 384
+        assert not provider.is_loaded
+
+        provider.warm_up()
+        assert provider.is_loaded
+
     async def test_embed_documents(self):
         """Tests if documents can be converted into embeddings."""
         provider = FastEmbedProvider("sentence-transformers/all-MiniLM-L6-v2")
@@ -53,6 +66,21 @@ class TestFastEmbedProviderIntegration:
         # Embeddings should be identical for the same input
         np.testing.assert_array_almost_equal(np.array(embedding), np.array(embedding2))
 
+    async def test_dedicated_executor(self):
+        """Tests if inference runs in the provider's own bounded executor."""
+        provider = FastEmbedProvider(
+            "sentence-transformers/all-MiniLM-L6-v2", threads=2, intra_op_threads=1
+        )
+
+        embeddings = await asyncio.gather(
+            *[provider.embed_query(f"query {i}") for i in range(4)]
+        )
+
+        assert len(embeddings) == 4
+        assert provider.queue_depth == 0
+        assert provider.get_metrics()["embedding_threads"] == 2
+        provider.close()
+
     async def test_get_vector_name(self):
         """Tests if the vector name is generated correctly."""
         provider = FastEmbedProvider("sentence-transformers/all-MiniLM-L6-v2")
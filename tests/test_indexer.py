@@ -0,0 +1,605 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from qdrant_client import QdrantClient
+
+from synapstor.tools import indexer
+from tests.conftest import HashingEmbeddingProvider
+
+
+@pytest.fixture
+def embedding_provider(monkeypatch):
+    """Replaces the FastEmbed model with a fast deterministic provider."""
+    provider = HashingEmbeddingProvider()
+    monkeypatch.setattr(indexer, "create_embedding_provider", lambda _: provider)
+    return provider
+
+
+@pytest.fixture
+def qdrant_client(monkeypatch):
+    """Makes the indexer use an in-memory Qdrant instance."""
+    client = QdrantClient(":memory:")
+    monkeypatch.setattr("qdrant_client.QdrantClient", lambda **_: client)
+    indexer.importar_bibliotecas()
+    return client
+
+
+@pytest.fixture
+def projeto(tmp_path):
+    """Creates a small project to index."""
+    projeto = tmp_path / "projeto"
+    (projeto / "src").mkdir(parents=True)
+    (projeto / "src" / "soma.py").write_text("def soma(a, b):\n    return a + b\n")
+    (projeto / "README.md").write_text("Projeto de exemplo para a busca\n")
+    return projeto
+
+
+def criar_indexador(projeto, **kwargs) -> indexer.IndexadorDireto:
+    # Keep the manifests out of the project and of the user's directory
+    kwargs.setdefault("diretorio_manifesto", str(projeto.parent / "manifestos"))
+    return indexer.IndexadorDireto(
+        nome_projeto="exemplo",
+        caminho_projeto=str(projeto),
+        collection_name="test_collection",
+        qdrant_url="http://localhost:6333",
+        **kwargs,
+    )
+
+
+def documentos_embutidos(provider: HashingEmbeddingProvider) -> int:
+    return sum(len(chamada) for chamada in provider.document_calls)
+
+
+def test_uses_embedding_provider(embedding_provider, qdrant_client, projeto):
+    """Tests if the indexer embeds with the shared provider and its vector name."""
+    indexador = criar_indexador(projeto)
+    assert indexador.vector_name == embedding_provider.get_vector_name()
+
+    assert indexador.indexar()
+    assert indexador.arquivos_indexados == 2
+    assert documentos_embutidos(embedding_provider) == 2
+
+    collection = qdrant_client.get_collection("test_collection")
+    vectors = collection.config.params.vectors
+    assert vectors[embedding_provider.get_vector_name()].size == 64
+
+    resultados = indexador.buscar("def soma(a, b):\n    return a + b\n", limite=1)
+    assert resultados[0]["metadata"]["caminho_relativo"] == "src/soma.py"
+
+
+def test_existing_vector_name(embedding_provider, qdrant_client, projeto):
+    """Tests if the vector name of an existing collection is kept."""
+    from qdrant_client import models
+
+    qdrant_client.create_collection(
+        "test_collection",
+        vectors_config={"text": models.VectorParams(size=64, distance="Cosine")},
+    )
+
+    indexador = criar_indexador(projeto)
+    assert indexador.vector_name == "text"
+    assert indexador.indexar()
+    assert qdrant_client.count("test_collection").count == 2
+
+
+def test_gitignore_filter(tmp_path):
+    """Tests nested .gitignore files and the precedence of their patterns."""
+    (tmp_path / ".gitignore").write_text("*.log\nbuild/\n")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / ".gitignore").write_text("*.tmp\n!keep.tmp\n!debug.log\n")
+
+    filtro = indexer.GitIgnoreFilter(tmp_path)
+
+    assert filtro.deve_ignorar(tmp_path / "app.log")
+    assert filtro.deve_ignorar(tmp_path / "build", eh_diretorio=True)
+    assert filtro.deve_ignorar(tmp_path / "node_modules", eh_diretorio=True)
+    assert not filtro.deve_ignorar(tmp_path / "build.py")
+    assert not filtro.deve_ignorar(tmp_path / "notes.tmp")
+
+    assert filtro.deve_ignorar(tmp_path / "docs" / "draft.tmp")
+    assert filtro.deve_ignorar(tmp_path / "docs" / "other.log")
+    assert not filtro.deve_ignorar(tmp_path / "docs" / "keep.tmp")
+    assert not filtro.deve_ignorar(tmp_path / "docs" / "debug.log")
+
+
+def test_ignored_directories_are_pruned(
+    embedding_provider, qdrant_client, projeto, monkeypatch
+):
+    """Tests if the discovery never descends into ignored directories."""
+    (projeto / "node_modules" / "lib").mkdir(parents=True)
+    (projeto / "node_modules" / "lib" / "index.js").write_text("module.exports = 1")
+    (projeto / "src" / ".gitignore").write_text("gerado.py\n")
+    (projeto / "src" / "gerado.py").write_text("x = 1\n")
+
+    visitados = []
+    walk = indexer.os.walk
+
+    def walk_registrando(*args, **kwargs):
+        for root, dirs, files in walk(*args, **kwargs):
+            visitados.append(Path(root).name)
+            yield root, dirs, files
+
+    monkeypatch.setattr(indexer.os, "walk", walk_registrando)
+
+    indexador = criar_indexador(projeto)
+    assert indexador.indexar()
+
+    assert "node_modules" not in visitados
+    assert "lib" not in visitados
+    assert indexador.arquivos_indexados == 2
+
+
+def test_incremental_indexing(embedding_provider, qdrant_client, projeto):
+    """Tests if a rerun only embeds new or changed files and syncs deletions."""
+    assert criar_indexador(projeto).indexar()
+    assert documentos_embutidos(embedding_provider) == 2
+
+    # Nothing changed
+    indexador = criar_indexador(projeto)
+    assert indexador.indexar()
+    assert indexador.arquivos_indexados == 0
+    assert indexador.arquivos_inalterados == 2
+    assert documentos_embutidos(embedding_provider) == 2
+
+    # One file changed, one was touched without changes, one is new
+    (projeto / "src" / "soma.py").write_text(
+        "def soma(a, b, c):\n    return a + b + c\n"
+    )
+    stats = (projeto / "README.md").stat()
+    os.utime(projeto / "README.md", ns=(stats.st_atime_ns, stats.st_mtime_ns + 10**9))
+    (projeto / "src" / "novo.py").write_text("print('novo')\n")
+
+    indexador = criar_indexador(projeto)
+    assert indexador.indexar()
+    assert indexador.arquivos_indexados == 2
+    assert indexador.arquivos_inalterados == 1
+    assert documentos_embutidos(embedding_provider) == 4
+    assert qdrant_client.count("test_collection").count == 3
+
+    # Deleted files have their points removed
+    (projeto / "src" / "novo.py").unlink()
+    (projeto / "README.md").unlink()
+
+    indexador = criar_indexador(projeto)
+    assert indexador.indexar()
+    assert indexador.arquivos_removidos == 2
+    assert qdrant_client.count("test_collection").count == 1
+
+    # A full run indexes everything again
+    indexador = criar_indexador(projeto, reindexar_tudo=True)
+    assert indexador.indexar()
+    assert indexador.arquivos_indexados == 1
+    assert documentos_embutidos(embedding_provider) == 5
+
+
+def git(projeto, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=Teste", "-c", "user.email=teste@example.com", *args],
+        cwd=projeto,
+        check=True,
+        capture_output=True,
+    )
+
+
+def test_git_incremental_indexing(embedding_provider, qdrant_client, projeto):
+    """Tests if only the files changed in git since the last indexed commit are synced."""
+    git(projeto, "init", "-q")
+    git(projeto, "add", ".")
+    git(projeto, "commit", "-q", "-m", "inicial")
+
+    indexador = criar_indexador(projeto, incremental=False)
+    assert indexador.obter_ultimo_commit_indexado() is None
+    assert indexador.indexar()
+    primeiro_commit = indexador.obter_ultimo_commit_indexado()
+    assert primeiro_commit == indexador._obter_commit_atual()
+    assert documentos_embutidos(embedding_provider) == 2
+
+    # One file is modified and the other one renamed
+    (projeto / "src" / "soma.py").write_text("def soma(*n):\n    return sum(n)\n")
+    git(projeto, "mv", "README.md", "LEIAME.md")
+    git(projeto, "commit", "-q", "-am", "alteracoes")
+
+    indexador = criar_indexador(projeto, incremental=False)
+    assert indexador.indexar(desde=primeiro_commit)
+    assert indexador.arquivos_indexados == 2
+    assert indexador.arquivos_removidos == 1
+    assert documentos_embutidos(embedding_provider) == 4
+    assert indexador.obter_ultimo_commit_indexado() != primeiro_commit
+
+    pontos, _ = qdrant_client.scroll("test_collection", with_payload=True)
+    caminhos = {
+        ponto.payload["metadata"].get("caminho_relativo")
+        for ponto in pontos
+        if "document" in ponto.payload
+    }
+    assert caminhos == {"src/soma.py", "LEIAME.md"}
+
+
+def test_failed_files_keep_indexed_commit(
+    embedding_provider, qdrant_client, projeto, monkeypatch
+):
+    """Tests if the indexed commit is not updated when a file fails to be embedded."""
+    git(projeto, "init", "-q")
+    git(projeto, "add", ".")
+    git(projeto, "commit", "-q", "-m", "inicial")
+
+    embed_documents = embedding_provider.embed_documents
+
+    async def falhar_soma(documents):
+        if any("soma" in documento for documento in documents):
+            raise RuntimeError("embedding failed")
+        return await embed_documents(documents)
+
+    monkeypatch.setattr(embedding_provider, "embed_documents", falhar_soma)
+
+    # One file per batch, so only the batch of the failed file is lost
+    indexador = criar_indexador(projeto, incremental=False, tamanho_lote=1)
+    assert not indexador.indexar()
+    assert indexador.arquivos_com_erro == 1
+    assert indexador.arquivos_indexados == 1
+    assert indexador.obter_ultimo_commit_indexado() is None
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_batches(embedding_provider, qdrant_client, projeto, monkeypatch, workers):
+    """Tests if documents are embedded and upserted in batches."""
+    for i in range(23):
+        (projeto / "src" / f"modulo_{i}.py").write_text(f"valor = {i}\n")
+
+    upserts = []
+    upsert = qdrant_client.upsert
+
+    def upsert_registrando(*args, **kwargs):
+        upserts.append(len(kwargs["points"]))
+        return upsert(*args, **kwargs)
+
+    monkeypatch.setattr(qdrant_client, "upsert", upsert_registrando)
+
+    indexador = criar_indexador(
+        projeto, tamanho_lote=10, max_workers=workers, incremental=False
+    )
+    assert indexador.indexar()
+
+    assert indexador.arquivos_indexados == 25
+    assert [len(chamada) for chamada in embedding_provider.document_calls] == [
+        10,
+        10,
+        5,
+    ]
+    assert upserts == [10, 10, 5]
+    assert qdrant_client.count("test_collection").count == 25
+
+
+def test_batches_limited_by_tokens(embedding_provider, qdrant_client, projeto):
+    """Tests if a batch is closed when it reaches the token budget."""
+    for i in range(4):
+        (projeto / "src" / f"grande_{i}.py").write_text("x = 1\n" * 1000)
+
+    # Chunks large enough to keep each file whole
+    indexador = criar_indexador(
+        projeto,
+        tamanho_lote=100,
+        tokens_por_lote=1024,
+        tokens_por_trecho=3000,
+        incremental=False,
+    )
+    assert indexador.indexar()
+
+    assert indexador.arquivos_indexados == 6
+    assert all(
+        sum(indexador._estimar_tokens(documento) for documento in chamada) <= 1024
+        for chamada in embedding_provider.document_calls
+    )
+    assert len(embedding_provider.document_calls) == 3
+
+
+def test_split_in_chunks():
+    """Tests if a text is split in overlapping windows aligned to words."""
+    texto = " ".join(f"palavra{i}" for i in range(200))
+    trechos = indexer.dividir_em_trechos(texto, 100, 20)
+
+    assert trechos[0][0] == 0
+    assert trechos[-1][1] == len(texto)
+    for (inicio, fim), (proximo, _) in zip(trechos, trechos[1:]):
+        assert fim - inicio <= 100
+        # Consecutive windows overlap and start at the beginning of a word
+        assert inicio < proximo < fim
+        assert texto[proximo - 1] == " "
+        assert fim - proximo <= 20
+
+    assert indexer.dividir_em_trechos("curto", 100, 20) == [(0, 5)]
+
+
+def test_chunked_indexing(embedding_provider, qdrant_client, projeto):
+    """Tests if large files are stored as chunks with deterministic IDs."""
+    (projeto / "src" / "grande.py").write_text(
+        "".join(f"valor_{i} = {i}\n" for i in range(100))
+    )
+
+    indexador = criar_indexador(projeto, tokens_por_trecho=32, sobreposicao_trecho=4)
+    assert indexador.indexar()
+    assert indexador.arquivos_indexados == 3
+
+    pontos, _ = qdrant_client.scroll("test_collection", limit=100, with_payload=True)
+    trechos = sorted(
+        (
+            ponto
+            for ponto in pontos
+            if ponto.payload["metadata"]["caminho_relativo"] == "src/grande.py"
+        ),
+        key=lambda ponto: ponto.payload["metadata"]["trecho_indice"],
+    )
+    assert len(trechos) > 1
+    id_arquivo = trechos[0].payload["metadata"]["arquivo_pai"]
+    for indice, ponto in enumerate(trechos):
+        metadados = ponto.payload["metadata"]
+        assert metadados["trecho_indice"] == indice
+        assert metadados["total_trechos"] == len(trechos)
+        assert metadados["arquivo_pai"] == id_arquivo
+        assert str(ponto.id).replace("-", "") == indexer.gerar_id_trecho(
+            id_arquivo, indice
+        )
+    # The first chunk keeps the ID of the file
+    assert str(trechos[0].id).replace("-", "") == id_arquivo
+
+    # A new run replaces the same points
+    total = qdrant_client.count("test_collection").count
+    assert criar_indexador(
+        projeto, tokens_por_trecho=32, sobreposicao_trecho=4, reindexar_tudo=True
+    ).indexar()
+    assert qdrant_client.count("test_collection").count == total
+
+
+@pytest.mark.parametrize("incremental", [True, False])
+def test_stale_chunks_removed(embedding_provider, qdrant_client, projeto, incremental):
+    """Tests if the chunks of a file are removed when it shrinks or is deleted."""
+    grande = projeto / "src" / "grande.py"
+    grande.write_text("".join(f"valor_{i} = {i}\n" for i in range(100)))
+
+    def indexar():
+        indexador = criar_indexador(
+            projeto,
+            tokens_por_trecho=32,
+            sobreposicao_trecho=4,
+            incremental=incremental,
+        )
+        assert indexador.indexar()
+
+    indexar()
+    assert qdrant_client.count("test_collection").count > 3
+
+    grande.write_text("".join(f"valor_{i} = {i}\n" for i in range(5)))
+    indexar()
+    assert qdrant_client.count("test_collection").count == 3
+
+    if incremental:
+        # All the chunks of a deleted file are removed
+        grande.write_text("".join(f"valor_{i} = {i}\n" for i in range(100)))
+        indexar()
+        grande.unlink()
+        indexar()
+        assert qdrant_client.count("test_collection").count == 2
+
+
+def test_pipeline_backpressure(embedding_provider, qdrant_client, projeto, monkeypatch):
+    """Tests if the discovery is held back by the slower stages of the pipeline."""
+    for i in range(200):
+        (projeto / "src" / f"modulo_{i}.py").write_text(f"valor = {i}\n")
+
+    descobertos = []
+    adiantamentos = []
+    enviados = [0]
+    descobrir = indexer.IndexadorDireto._descobrir_arquivos
+
+    def descobrir_registrando(self):
+        for caminho in descobrir(self):
+            descobertos.append(caminho)
+            yield caminho
+
+    upsert = qdrant_client.upsert
+
+    def upsert_lento(*args, **kwargs):
+        adiantamentos.append(len(descobertos) - enviados[0])
+        time.sleep(0.01)
+        enviados[0] += len(kwargs["points"])
+        return upsert(*args, **kwargs)
+
+    monkeypatch.setattr(
+        indexer.IndexadorDireto, "_descobrir_arquivos", descobrir_registrando
+    )
+    monkeypatch.setattr(qdrant_client, "upsert", upsert_lento)
+
+    indexador = criar_indexador(
+        projeto, tamanho_lote=5, max_workers=2, incremental=False
+    )
+    assert indexador.indexar()
+
+    assert indexador.arquivos_indexados == 202
+    # The queues hold a few batches at most, not the whole project
+    assert max(adiantamentos) < 60
+
+
+def test_single_read_per_file(embedding_provider, qdrant_client, projeto, monkeypatch):
+    """Tests if each file is opened once and binaries are detected from the same bytes."""
+    (projeto / "dados.txt").write_bytes(bytes(range(256)) * 4)
+    (projeto / "acentos.txt").write_text("ação e reação\n", encoding="latin1")
+
+    aberturas = []
+
+    def open_registrando(caminho, *args, **kwargs):
+        aberturas.append(Path(caminho).name)
+        return open(caminho, *args, **kwargs)
+
+    monkeypatch.setattr(indexer, "open", open_registrando, raising=False)
+
+    indexador = criar_indexador(projeto, incremental=False)
+    aberturas.clear()
+    assert indexador.indexar()
+
+    assert indexador.arquivos_indexados == 3
+    assert sorted(aberturas) == ["README.md", "acentos.txt", "dados.txt", "soma.py"]
+
+    pontos, _ = qdrant_client.scroll("test_collection", with_payload=True)
+    documentos = {
+        ponto.payload["metadata"]["nome_arquivo"]: ponto.payload["document"]
+        for ponto in pontos
+    }
+    assert documentos["acentos.txt"] == "ação e reação\n"
+    assert "dados.txt" not in documentos
+
+
+def aguardar(condicao, timeout=10.0):
+    """Waits until a condition holds, for the tests of the watch mode."""
+    limite = time.monotonic() + timeout
+    while not condicao():
+        assert time.monotonic() < limite, "timed out"
+        time.sleep(0.05)
+
+
+@pytest.mark.parametrize(
+    "polling",
+    [
+        True,
+        pytest.param(
+            False,
+            marks=pytest.mark.skipif(
+                not sys.platform.startswith("linux"), reason="inotify is Linux only"
+            ),
+        ),
+    ],
+)
+def test_watch_mode(embedding_provider, qdrant_client, projeto, polling):
+    """Tests if the watch mode indexes bursts of changes once, after they settle."""
+    indexador = criar_indexador(projeto)
+    parar = threading.Event()
+    observacao = threading.Thread(
+        target=indexador.observar,
+        kwargs={
+            "debounce": 0.3,
+            "polling": polling,
+            "intervalo_polling": 0.1,
+            "parar": parar,
+        },
+    )
+    observacao.start()
+    try:
+        aguardar(lambda: qdrant_client.count("test_collection").count == 2)
+        embutidos = documentos_embutidos(embedding_provider)
+
+        # A burst of writes to the same file is embedded once
+        soma = projeto / "src" / "soma.py"
+        for i in range(20):
+            soma.write_text(f"def soma(a, b):\n    return a + b + {i}\n")
+            time.sleep(0.01)
+        (projeto / "src" / "novo").mkdir()
+        (projeto / "src" / "novo" / "modulo.py").write_text("print('novo')\n")
+
+        aguardar(lambda: qdrant_client.count("test_collection").count == 3)
+        aguardar(lambda: documentos_embutidos(embedding_provider) == embutidos + 2)
+        time.sleep(0.5)
+        assert documentos_embutidos(embedding_provider) == embutidos + 2
+
+        # Deleted files have their points removed
+        (projeto / "README.md").unlink()
+        aguardar(lambda: qdrant_client.count("test_collection").count == 2)
+    finally:
+        parar.set()
+        observacao.join(timeout=10)
+    assert not observacao.is_alive()
+
+
+def test_bulk_mode(embedding_provider, qdrant_client, projeto, monkeypatch):
+    """Tests if bulk mode pauses the indexing of the collection during the upload."""
+    chamadas = []
+    atualizar = qdrant_client.update_collection
+
+    def atualizar_registrando(collection_name, optimizers_config=None, **kwargs):
+        chamadas.append(
+            (
+                optimizers_config.indexing_threshold,
+                qdrant_client.count(collection_name).count,
+            )
+        )
+        return atualizar(collection_name, optimizers_config=optimizers_config, **kwargs)
+
+    monkeypatch.setattr(qdrant_client, "update_collection", atualizar_registrando)
+
+    assert criar_indexador(projeto, carga_em_massa=True).indexar()
+    # Paused before the first point and restored after the last one
+    assert chamadas == [(0, 0), (20000, 2)]
+
+
+def test_quantized_collection(embedding_provider, qdrant_client, projeto, monkeypatch):
+    """Tests if a new collection is quantized and searched with rescoring."""
+    from qdrant_client import models
+
+    criacoes = []
+    buscas = []
+    criar = qdrant_client.create_collection
+    consultar = qdrant_client.query_points
+
+    def criar_registrando(*args, **kwargs):
+        criacoes.append(kwargs)
+        return criar(*args, **kwargs)
+
+    def consultar_registrando(*args, **kwargs):
+        buscas.append(kwargs)
+        return consultar(*args, **kwargs)
+
+    monkeypatch.setattr(qdrant_client, "create_collection", criar_registrando)
+    monkeypatch.setattr(qdrant_client, "query_points", consultar_registrando)
+    monkeypatch.setenv("QDRANT_SEARCH_OVERSAMPLING", "3")
+
+    indexador = criar_indexador(projeto, quantizacao="int8")
+    assert indexador.indexar()
+    assert indexador.buscar("soma", limite=1)
+
+    configuracao = criacoes[0]["quantization_config"]
+    assert configuracao.scalar.type == models.ScalarType.INT8
+    assert buscas[0]["search_params"].quantization == models.QuantizationSearchParams(
+        oversampling=3.0, rescore=True
+    )
+
+
+def test_collection_on_disk(embedding_provider, qdrant_client, projeto, monkeypatch):
+    """Tests if a new collection keeps its vectors, documents and graph on disk."""
+    from synapstor.storage import CollectionStorage
+
+    criacoes = []
+    criar = qdrant_client.create_collection
+
+    def criar_registrando(*args, **kwargs):
+        criacoes.append(kwargs)
+        return criar(*args, **kwargs)
+
+    monkeypatch.setattr(qdrant_client, "create_collection", criar_registrando)
+
+    armazenamento = CollectionStorage(
+        vectors_on_disk=True, payload_on_disk=True, hnsw_on_disk=True
+    )
+    assert criar_indexador(projeto, armazenamento=armazenamento).indexar()
+
+    vetor = criacoes[0]["vectors_config"][embedding_provider.get_vector_name()]
+    assert vetor.on_disk is True
+    assert criacoes[0]["on_disk_payload"] is True
+    assert criacoes[0]["hnsw_config"].on_disk is True
+    assert qdrant_client.count("test_collection").count == 2
+
+
+def test_server_inference_embeds_locally(
+    embedding_provider, qdrant_client, projeto, monkeypatch
+):
+    """Tests if the indexer embeds with FastEmbed when the server embeds the queries."""
+    from synapstor.embeddings.types import EmbeddingProviderType
+
+    monkeypatch.setenv("EMBEDDING_PROVIDER", "qdrant")
+
+    indexador = criar_indexador(projeto)
+
+    tipo = indexador.embedding_settings.provider_type
+    assert tipo == EmbeddingProviderType.FASTEMBED
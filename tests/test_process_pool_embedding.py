@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from synapstor.embeddings.fastembed import FastEmbedProvider
+from synapstor.embeddings.process_pool import ProcessPoolEmbeddingProvider
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+@pytest.fixture(scope="module")
+def process_pool_provider():
+    """Fixture to provide a process pool provider, shared by the module's tests."""
+    provider = ProcessPoolEmbeddingProvider(MODEL_NAME, processes=2, max_batch_size=4)
+    yield provider
+    provider.close()
+
+
+@pytest.mark.asyncio
+class TestProcessPoolEmbeddingProviderIntegration:
+    """Integration tests for the ProcessPoolEmbeddingProvider."""
+
+    async def test_matches_fastembed_provider(self, process_pool_provider):
+        """Tests if the workers produce the same vectors as the in-process provider."""
+        provider = FastEmbedProvider(MODEL_NAME)
+        documents = [f"This is test document number {i}." for i in range(10)]
+
+        expected = await provider.embed_documents(documents)
+        embeddings = await process_pool_provider.embed_documents(documents)
+
+        assert len(embeddings) == len(documents)
+        np.testing.assert_array_almost_equal(
+            np.array(embeddings), np.array(expected), decimal=5
+        )
+
+        query = "Which document is the third one?"
+        np.testing.assert_array_almost_equal(
+            np.array(await process_pool_provider.embed_query(query)),
+            np.array(await provider.embed_query(query)),
+            decimal=5,
+        )
+
+    async def test_vector_configuration(self, process_pool_provider):
+        """Tests if the vector name and size match the in-process provider."""
+        provider = FastEmbedProvider(MODEL_NAME)
+
+        assert process_pool_provider.get_vector_name() == provider.get_vector_name()
+        assert process_pool_provider.get_vector_size() == provider.get_vector_size()
+        assert process_pool_provider.get_metrics()["embedding_processes"] == 2
+
+    async def test_dead_worker_is_replaced(self, process_pool_provider):
+        """Tests if a worker whose process died is replaced by a new one."""
+        dead = process_pool_provider._workers[0]
+        dead.process.kill()
+        dead.process.join()
+
+        # Each worker gets a batch, so the dead one is picked and fails
+        documents = [f"This is test document number {i}." for i in range(8)]
+        with pytest.raises(RuntimeError, match="exited"):
+            await process_pool_provider.embed_documents(documents)
+
+        assert dead not in process_pool_provider._workers
+        assert all(
+            worker.process.is_alive() for worker in process_pool_provider._workers
+        )
+        embeddings = await process_pool_provider.embed_documents(documents)
+        assert len(embeddings) == len(documents)
@@ -0,0 +1,509 @@
+import asyncio
+import uuid
+from typing import List
+
+import numpy as np
+import pytest
+from qdrant_client import models
+
+from synapstor.embeddings.factory import create_embedding_provider
+from synapstor.embeddings.server import ServerInferenceError, ServerInferenceProvider
+from synapstor.qdrant import Entry, QdrantConnector, generate_deterministic_id
+from synapstor.quantization import QuantizationType
+from synapstor.search_profiles import SearchProfile
+from synapstor.settings import EmbeddingProviderSettings
+from synapstor.storage import CollectionStorage
+from synapstor.transport import ClientTransport
+from tests.conftest import HashingEmbeddingProvider
+
+
+@pytest.fixture
+async def embedding_provider():
+    """Fixture to provide a deterministic embedding provider."""
+    return HashingEmbeddingProvider()
+
+
+@pytest.fixture
+async def qdrant_connector(embedding_provider):
+    """Fixture to provide a QdrantConnector with in-memory Qdrant client."""
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name=f"test_collection_{uuid.uuid4().hex}",
+        embedding_provider=embedding_provider,
+    )
+
+    yield connector
+
+
+@pytest.mark.asyncio
+async def test_store_many_batches_embeddings(qdrant_connector, embedding_provider):
+    """Tests that store_many embeds each batch with a single call."""
+    entries = [
+        Entry(
+            content=f"document number {i}",
+            metadata={"projeto": "test", "caminho_absoluto": f"/tmp/file_{i}.txt"},
+        )
+        for i in range(10)
+    ]
+
+    await qdrant_connector.store_many(entries, batch_size=4)
+
+    assert [len(call) for call in embedding_provider.document_calls] == [4, 4, 2]
+    count = await qdrant_connector._client.count(
+        qdrant_connector._default_collection_name
+    )
+    assert count.count == 10
+
+
+@pytest.mark.asyncio
+async def test_store_many_uses_deterministic_ids(qdrant_connector):
+    """Tests that storing the same entries twice doesn't duplicate points."""
+    entries = [
+        Entry(
+            content=f"document number {i}",
+            metadata={"projeto": "test", "caminho_absoluto": f"/tmp/file_{i}.txt"},
+        )
+        for i in range(5)
+    ]
+
+    await qdrant_connector.store_many(entries, batch_size=2)
+    await qdrant_connector.store_many(entries, batch_size=3)
+
+    count = await qdrant_connector._client.count(
+        qdrant_connector._default_collection_name
+    )
+    assert count.count == 5
+
+    results = await qdrant_connector.search("document number 3")
+    assert results[0].content == "document number 3"
+
+
+@pytest.mark.asyncio
+async def test_store_many_empty(qdrant_connector, embedding_provider):
+    """Tests that storing no entries doesn't call the embedding provider."""
+    await qdrant_connector.store_many([])
+
+    assert embedding_provider.document_calls == []
+
+
+def count_calls(monkeypatch, client, *method_names: str) -> List[str]:
+    """Wraps client methods so the tests can see which of them are called."""
+    calls: List[str] = []
+
+    def wrap(method_name):
+        original = getattr(client, method_name)
+
+        async def wrapper(*args, **kwargs):
+            calls.append(method_name)
+            return await original(*args, **kwargs)
+
+        monkeypatch.setattr(client, method_name, wrapper)
+
+    for method_name in method_names:
+        wrap(method_name)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_collection_schema_is_cached(qdrant_connector, monkeypatch):
+    """Tests that steady-state store and search don't look up the collection again."""
+    await qdrant_connector.store(Entry(content="cached collection"))
+
+    lookups = count_calls(
+        monkeypatch, qdrant_connector._client, "get_collection", "collection_exists"
+    )
+
+    await qdrant_connector.store(Entry(content="another entry"))
+    results = await qdrant_connector.search("cached collection")
+
+    assert lookups == []
+    assert results[0].content == "cached collection"
+
+    schema = await qdrant_connector.refresh_collection_cache()
+    assert lookups == ["get_collection"]
+    assert schema.vector_name == "fast-hashing-test"
+    assert schema.vector_size == 64
+
+
+@pytest.mark.asyncio
+async def test_collection_cache_invalidated_when_not_found(qdrant_connector):
+    """Tests that a collection deleted outside the connector is detected."""
+    collection_name = qdrant_connector._default_collection_name
+    await qdrant_connector.store(Entry(content="soon to be deleted"))
+    await qdrant_connector._client.delete_collection(collection_name)
+
+    # The cached schema is stale, but the search must not fail
+    assert await qdrant_connector.search("deleted") == []
+    assert collection_name not in qdrant_connector._collection_schemas
+
+    await qdrant_connector.store(Entry(content="stored again"))
+    await qdrant_connector._client.delete_collection(collection_name)
+
+    # Storing recreates the collection
+    await qdrant_connector.store(Entry(content="recreated"))
+    results = await qdrant_connector.search("recreated")
+    assert [result.content for result in results] == ["recreated"]
+
+
+@pytest.fixture
+async def cached_connector(embedding_provider):
+    """Fixture to provide a QdrantConnector with the search result cache enabled."""
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name=f"test_collection_{uuid.uuid4().hex}",
+        embedding_provider=embedding_provider,
+        search_cache_size=16,
+        search_cache_ttl=60,
+    )
+
+    yield connector
+
+
+@pytest.mark.asyncio
+async def test_search_results_are_cached(cached_connector, monkeypatch):
+    """Tests that repeated searches are served without querying Qdrant."""
+    await cached_connector.store(Entry(content="hot query result"))
+    queries = count_calls(monkeypatch, cached_connector._client, "query_points")
+
+    first = await cached_connector.search("hot query")
+    second = await cached_connector.search("hot query")
+
+    assert first == second
+    assert queries == ["query_points"]
+
+    # A different limit is a different search
+    await cached_connector.search("hot query", limit=1)
+    assert len(queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_search_results(cached_connector):
+    """Tests that no stale result survives a write through the connector."""
+    metadata = {"projeto": "test", "caminho_absoluto": "/tmp/fresh.txt"}
+    assert await cached_connector.search("fresh content") == []
+
+    await cached_connector.store(Entry(content="fresh content", metadata=metadata))
+    results = await cached_connector.search("fresh content")
+    assert [result.content for result in results] == ["fresh content"]
+
+    await cached_connector.store_many(
+        [Entry(content="more fresh content", metadata={"source": "test"})]
+    )
+    results = await cached_connector.search("fresh content")
+    assert len(results) == 2
+
+    await cached_connector.delete([generate_deterministic_id(metadata)])
+    results = await cached_connector.search("fresh content")
+    assert [result.content for result in results] == ["more fresh content"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_share_one_request(cached_connector, monkeypatch):
+    """Tests that identical concurrent searches are collapsed into one Qdrant call."""
+    await cached_connector.store(Entry(content="shared result"))
+    queries = count_calls(monkeypatch, cached_connector._client, "query_points")
+
+    results = await asyncio.gather(
+        *[cached_connector.search("shared result") for _ in range(5)]
+    )
+
+    assert queries == ["query_points"]
+    assert all(result == results[0] for result in results)
+    assert cached_connector._search_cache.cache_info().shared == 4
+
+
+class ArrayEmbeddingProvider(HashingEmbeddingProvider):
+    """Variant of the hashing provider that returns float32 NumPy arrays."""
+
+    async def embed_documents(self, documents: List[str]) -> np.ndarray:
+        return np.array(await super().embed_documents(documents), dtype=np.float32)
+
+    async def embed_query(self, query: str) -> np.ndarray:
+        return np.array(await super().embed_query(query), dtype=np.float32)
+
+
+@pytest.mark.asyncio
+async def test_numpy_vectors():
+    """Tests storing and searching with a provider that returns NumPy arrays."""
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name=f"test_collection_{uuid.uuid4().hex}",
+        embedding_provider=ArrayEmbeddingProvider(),
+    )
+
+    await connector.store(Entry(content="single numpy entry"))
+    await connector.store_many(
+        [Entry(content=f"batched numpy entry {i}") for i in range(3)], batch_size=2
+    )
+
+    results = await connector.search("single numpy entry")
+    assert len(results) == 4
+    assert results[0].content == "single numpy entry"
+
+
+def record_kwargs(monkeypatch, client, method_name: str) -> List[dict]:
+    """Wraps a client method so the tests can see the arguments of each call."""
+    calls: List[dict] = []
+    original = getattr(client, method_name)
+
+    async def wrapper(*args, **kwargs):
+        calls.append(kwargs)
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(client, method_name, wrapper)
+    return calls
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "quantization, config_type",
+    [
+        (QuantizationType.NONE, type(None)),
+        (QuantizationType.INT8, models.ScalarQuantization),
+        (QuantizationType.BINARY, models.BinaryQuantization),
+    ],
+)
+async def test_collection_created_with_quantization(
+    embedding_provider, monkeypatch, quantization, config_type
+):
+    """Tests that new collections use the quantization of the connector."""
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name=f"test_collection_{uuid.uuid4().hex}",
+        embedding_provider=embedding_provider,
+        quantization=quantization,
+    )
+    creations = record_kwargs(monkeypatch, connector._client, "create_collection")
+
+    await connector.store(Entry(content="quantized entry"))
+
+    assert isinstance(creations[0]["quantization_config"], config_type)
+    schema = await connector._get_collection_schema(connector._default_collection_name)
+    assert schema.quantized is (quantization != QuantizationType.NONE)
+
+
+@pytest.mark.asyncio
+async def test_quantized_search_params(embedding_provider, monkeypatch):
+    """Tests that searches on quantized collections oversample and rescore."""
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name=f"test_collection_{uuid.uuid4().hex}",
+        embedding_provider=embedding_provider,
+        search_cache_size=16,
+        quantization=QuantizationType.INT8,
+        search_oversampling=3.0,
+        search_rescore=True,
+    )
+    await connector.store(Entry(content="quantized entry"))
+    queries = record_kwargs(monkeypatch, connector._client, "query_points")
+
+    results = await connector.search("quantized entry")
+    await connector.search("quantized entry", oversampling=1.5, rescore=False)
+
+    assert results[0].content == "quantized entry"
+    # Per-request values aren't answered from the cache of the defaults
+    assert [call["search_params"].quantization for call in queries] == [
+        models.QuantizationSearchParams(oversampling=3.0, rescore=True),
+        models.QuantizationSearchParams(oversampling=1.5, rescore=False),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_params_skipped_without_quantization(
+    qdrant_connector, monkeypatch
+):
+    """Tests that collections without quantization are searched as before."""
+    await qdrant_connector.store(Entry(content="plain entry"))
+    queries = record_kwargs(monkeypatch, qdrant_connector._client, "query_points")
+
+    await qdrant_connector.search("plain entry", oversampling=2.0)
+
+    assert queries[0]["search_params"] is None
+
+
+@pytest.mark.asyncio
+async def test_collection_created_with_storage(embedding_provider, monkeypatch):
+    """Tests that new collections keep on disk what the connector asks for."""
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name=f"test_collection_{uuid.uuid4().hex}",
+        embedding_provider=embedding_provider,
+        storage=CollectionStorage(vectors_on_disk=True, payload_on_disk=True),
+    )
+    creations = record_kwargs(monkeypatch, connector._client, "create_collection")
+
+    await connector.store(Entry(content="entry on disk"))
+
+    vector_params = creations[0]["vectors_config"]["fast-hashing-test"]
+    assert vector_params.on_disk is True
+    assert creations[0]["on_disk_payload"] is True
+    # The options not set keep the defaults of the server
+    assert creations[0]["hnsw_config"] is None
+    results = await connector.search("entry on disk")
+    assert results[0].content == "entry on disk"
+
+
+@pytest.mark.asyncio
+async def test_search_profiles(embedding_provider, monkeypatch):
+    """Tests that the profile of the connector can be replaced on each search."""
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name=f"test_collection_{uuid.uuid4().hex}",
+        embedding_provider=embedding_provider,
+        search_profile=SearchProfile.FAST,
+    )
+    await connector.store(Entry(content="profiled entry"))
+    queries = record_kwargs(monkeypatch, connector._client, "query_points")
+
+    await connector.search("profiled entry")
+    await connector.search("profiled entry", profile=SearchProfile.EXACT)
+
+    assert queries[0]["search_params"] == models.SearchParams(hnsw_ef=32)
+    assert queries[1]["search_params"] == models.SearchParams(exact=True)
+
+
+@pytest.mark.asyncio
+async def test_exact_profile_ignores_quantization(embedding_provider, monkeypatch):
+    """Tests that exact searches on quantized collections use the original vectors."""
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name=f"test_collection_{uuid.uuid4().hex}",
+        embedding_provider=embedding_provider,
+        quantization=QuantizationType.INT8,
+    )
+    await connector.store(Entry(content="quantized entry"))
+    queries = record_kwargs(monkeypatch, connector._client, "query_points")
+
+    await connector.search("quantized entry", profile=SearchProfile.EXACT)
+    await connector.search(
+        "quantized entry", profile=SearchProfile.BALANCED, oversampling=4.0
+    )
+
+    assert queries[0]["search_params"].quantization.ignore is True
+    assert queries[1]["search_params"] == models.SearchParams(
+        hnsw_ef=128,
+        quantization=models.QuantizationSearchParams(oversampling=4.0, rescore=True),
+    )
+
+
+@pytest.mark.asyncio
+async def test_score_threshold(qdrant_connector):
+    """Tests that entries below the score threshold are not returned."""
+    await qdrant_connector.store_many(
+        [Entry(content="alpha beta gamma"), Entry(content="unrelated words here")]
+    )
+
+    everything = await qdrant_connector.search("alpha beta gamma")
+    close = await qdrant_connector.search("alpha beta gamma", score_threshold=0.99)
+
+    assert len(everything) == 2
+    assert [entry.content for entry in close] == ["alpha beta gamma"]
+
+
+@pytest.mark.asyncio
+async def test_client_transport(embedding_provider):
+    """Tests that the transport options reach the client of a remote server."""
+    # Nothing listens on the port, the client is only created
+    connector = QdrantConnector(
+        qdrant_url="http://localhost:1",
+        qdrant_api_key=None,
+        collection_name="test_collection",
+        embedding_provider=embedding_provider,
+        transport=ClientTransport(
+            timeout=5, pool_size=8, keepalive_connections=2, keepalive_expiry=30.0
+        ),
+    )
+
+    rest_args = connector._client._client._rest_args
+    assert rest_args["timeout"] == 5
+    assert rest_args["limits"].max_connections == 8
+    assert rest_args["limits"].max_keepalive_connections == 2
+    assert rest_args["limits"].keepalive_expiry == 30.0
+    # Only server-side inference asks the server to embed documents
+    assert connector._client.cloud_inference is False
+    await connector._client.close()
+
+
+@pytest.mark.asyncio
+async def test_server_inference_stand_in(monkeypatch):
+    """Tests that texts are sent as documents and embedded by the stand-in in local mode."""
+    stand_in = HashingEmbeddingProvider()
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name=f"test_collection_{uuid.uuid4().hex}",
+        embedding_provider=ServerInferenceProvider(
+            "sentence-transformers/all-MiniLM-L6-v2", vector_size=64
+        ),
+        inference_stand_in=stand_in,
+    )
+    upserts = record_kwargs(monkeypatch, connector._client, "upsert")
+    queries = record_kwargs(monkeypatch, connector._client, "query_points")
+
+    await connector.store(Entry(content="single document"))
+    await connector.store_many(
+        [Entry(content=f"batched document {i}") for i in range(3)]
+    )
+    results = await connector.search("single document")
+
+    vector = upserts[0]["points"][0].vector["fast-all-minilm-l6-v2"]
+    assert vector == models.Document(
+        text="single document", model="sentence-transformers/all-MiniLM-L6-v2"
+    )
+    assert isinstance(queries[0]["query"], models.Document)
+    # One inference per upsert request, like the server would do
+    assert stand_in.document_calls == [
+        ["single document"],
+        [f"batched document {i}" for i in range(3)],
+    ]
+    assert stand_in.query_calls == ["single document"]
+    assert results[0].content == "single document"
+
+
+@pytest.mark.asyncio
+async def test_server_inference_remote():
+    """Tests that a remote server is asked to embed the documents."""
+    # Nothing listens on the port, the client is only created
+    connector = QdrantConnector(
+        qdrant_url="http://localhost:1",
+        qdrant_api_key=None,
+        collection_name="test_collection",
+        embedding_provider=ServerInferenceProvider("model", vector_size=64),
+    )
+
+    assert connector._client.cloud_inference is True
+    await connector._client.close()
+
+
+def test_server_inference_provider_factory():
+    """Tests that no model is loaded and nothing is cached with server-side inference."""
+    settings = EmbeddingProviderSettings(
+        EMBEDDING_PROVIDER="qdrant",
+        EMBEDDING_MODEL="BAAI/bge-small-en-v1.5",
+        EMBEDDING_VECTOR_SIZE=384,
+    )
+
+    provider = create_embedding_provider(settings)
+
+    assert isinstance(provider, ServerInferenceProvider)
+    assert provider.get_vector_name() == "fast-bge-small-en-v1.5"
+    assert provider.get_vector_size() == 384
+
+
+@pytest.mark.asyncio
+async def test_server_inference_provider_has_no_local_vectors():
+    """Tests that asking the server provider for vectors fails with a clear error."""
+    provider = ServerInferenceProvider("model", vector_size=64)
+
+    with pytest.raises(ServerInferenceError, match="runs on the Qdrant server"):
+        await provider.embed_documents(["document"])
+    with pytest.raises(ServerInferenceError, match="runs on the Qdrant server"):
+        await provider.embed_query("query")
@@ -1,6 +1,9 @@
 import os
 from unittest.mock import patch
 
+from synapstor.embeddings.types import EmbeddingProviderType
+from synapstor.quantization import QuantizationType
+from synapstor.search_profiles import SearchProfile
 from synapstor.settings import (
     EmbeddingProviderSettings,
     QdrantSettings,
@@ -21,6 +24,11 @@ class TestQdrantSettings:
             assert settings.local_path is None
             assert settings.search_limit is None
             assert settings.read_only is False
+            assert settings.quantization == QuantizationType.NONE
+            assert settings.search_oversampling == 2.0
+            assert settings.search_rescore is True
+            assert settings.search_profile is None
+            assert settings.score_threshold is None
 
     @patch.dict(
         os.environ,
@@ -65,6 +73,86 @@ class TestQdrantSettings:
         assert settings.location is None
         assert settings.local_path == "/path/to/local/qdrant"
 
+    @patch.dict(
+        os.environ,
+        {
+            "QDRANT_QUANTIZATION": "binary",
+            "QDRANT_SEARCH_OVERSAMPLING": "4",
+            "QDRANT_SEARCH_RESCORE": "false",
+        },
+        clear=True,
+    )
+    def test_quantization(self):
+        """Tests loading the quantization of new collections and of searches."""
+        settings = QdrantSettings()
+        assert settings.quantization == QuantizationType.BINARY
+        assert settings.search_oversampling == 4.0
+        assert settings.search_rescore is False
+
+    @patch.dict(
+        os.environ,
+        {"QDRANT_SEARCH_PROFILE": "fast", "QDRANT_SEARCH_SCORE_THRESHOLD": "0.5"},
+        clear=True,
+    )
+    def test_search_profile(self):
+        """Tests loading the default profile and score threshold of searches."""
+        settings = QdrantSettings()
+        assert settings.search_profile == SearchProfile.FAST
+        assert settings.score_threshold == 0.5
+
+    @patch.dict(
+        os.environ,
+        {"QDRANT_VECTORS_ON_DISK": "true", "QDRANT_HNSW_ON_DISK": "1"},
+        clear=True,
+    )
+    def test_collection_storage(self):
+        """Tests loading where the data of new collections is stored."""
+        storage = QdrantSettings().get_collection_storage()
+        assert storage.vectors_on_disk is True
+        assert storage.payload_on_disk is False
+        assert storage.hnsw_on_disk is True
+
+    @patch.dict(
+        os.environ,
+        {
+            "QDRANT_PREFER_GRPC": "true",
+            "QDRANT_GRPC_PORT": "7334",
+            "QDRANT_TIMEOUT": "15",
+            "QDRANT_POOL_SIZE": "4",
+        },
+        clear=True,
+    )
+    def test_grpc_transport(self):
+        """Tests loading a gRPC transport, with one channel per unit of pool size."""
+        kwargs = QdrantSettings().get_client_transport().client_kwargs()
+        assert kwargs == {
+            "prefer_grpc": True,
+            "grpc_port": 7334,
+            "timeout": 15,
+            "pool_size": 4,
+        }
+
+    @patch.dict(
+        os.environ,
+        {"QDRANT_POOL_SIZE": "16", "QDRANT_KEEPALIVE_EXPIRY": "60"},
+        clear=True,
+    )
+    def test_http_transport(self):
+        """Tests loading the connection pool and keep-alive of the REST transport."""
+        kwargs = QdrantSettings().get_client_transport().client_kwargs()
+        assert kwargs["prefer_grpc"] is False
+        assert "timeout" not in kwargs
+        limits = kwargs["limits"]
+        assert limits.max_connections == 16
+        assert limits.max_keepalive_connections == 16
+        assert limits.keepalive_expiry == 60.0
+
+    def test_default_transport(self):
+        """Tests if the client keeps its own limits when none is set."""
+        with patch.dict(os.environ, {}, clear=True):
+            kwargs = QdrantSettings().get_client_transport().client_kwargs()
+        assert kwargs == {"prefer_grpc": False, "grpc_port": 6334}
+
 
 class TestEmbeddingProviderSettings:
     """Tests for the EmbeddingProviderSettings class."""
@@ -74,6 +162,15 @@ class TestEmbeddingProviderSettings:
         with patch.dict(os.environ, {}, clear=True):
             settings = EmbeddingProviderSettings()
             assert settings.model_name == "sentence-transformers/all-MiniLM-L6-v2"
+            assert settings.query_cache_enabled is True
+            assert settings.query_cache_size == 1024
+            assert settings.query_batch_size == 32
+            assert settings.threads == 1
+            assert settings.intra_op_threads is None
+            assert settings.query_batch_window_ms == 0.0
+            assert settings.document_cache_enabled is True
+            assert settings.document_cache_dir == "~/.synapstor/embeddings"
+            assert settings.vector_size is None
 
     @patch.dict(
         os.environ,
@@ -85,6 +182,55 @@ class TestEmbeddingProviderSettings:
         settings = EmbeddingProviderSettings()
         assert settings.model_name == "openai/text-embedding-ada-002"
 
+    @patch.dict(
+        os.environ,
+        {"EMBEDDING_THREADS": "2", "EMBEDDING_INTRA_OP_THREADS": "4"},
+        clear=True,
+    )
+    def test_threads(self):
+        """Tests loading the inference thread configuration from environment variables."""
+        settings = EmbeddingProviderSettings()
+        assert settings.threads == 2
+        assert settings.intra_op_threads == 4
+
+    @patch.dict(
+        os.environ,
+        {"EMBEDDING_PROVIDER": "fastembed-process", "EMBEDDING_PROCESSES": "4"},
+        clear=True,
+    )
+    def test_process_pool_provider(self):
+        """Tests selecting the process pool provider from environment variables."""
+        settings = EmbeddingProviderSettings()
+        assert settings.provider_type == EmbeddingProviderType.FASTEMBED_PROCESS
+        assert settings.processes == 4
+
+    @patch.dict(
+        os.environ,
+        {"EMBEDDING_QUERY_CACHE": "false", "EMBEDDING_QUERY_CACHE_SIZE": "10"},
+        clear=True,
+    )
+    def test_query_cache(self):
+        """Tests loading the query cache configuration from environment variables."""
+        settings = EmbeddingProviderSettings()
+        assert settings.query_cache_enabled is False
+        assert settings.query_cache_size == 10
+
+    @patch.dict(
+        os.environ,
+        {
+            "EMBEDDING_DOCUMENT_CACHE": "false",
+            "EMBEDDING_DOCUMENT_CACHE_DIR": "/tmp/embeddings",
+            "EMBEDDING_DOCUMENT_CACHE_MAX_MB": "64",
+        },
+        clear=True,
+    )
+    def test_document_cache(self):
+        """Tests loading the document cache configuration from environment variables."""
+        settings = EmbeddingProviderSettings()
+        assert settings.document_cache_enabled is False
+        assert settings.document_cache_dir == "/tmp/embeddings"
+        assert settings.document_cache_max_mb == 64.0
+
 
 class TestToolSettings:
     """Tests for the ToolSettings class."""